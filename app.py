@@ -1,5 +1,8 @@
 import streamlit as st
-from modules import accueil, clustering, filter_axes, detail_isin, spreads_curve
+from modules import accueil, clustering, filter_axes, detail_isin, spreads_curve, screener, perf_panel
+from utils.best_execution import DEFAULT_POLICY
+from utils.session import current_snapshot, update_banner
+from utils.perf import perf_run
 
 # Configuration initiale
 st.set_page_config(layout="wide", page_title="Credit Dashboard")
@@ -14,16 +17,32 @@ pages = {
     "clustering": clustering,
     "filter_axes": filter_axes,
     "detail_isin": detail_isin,
-    "spreads_curve": spreads_curve
+    "spreads_curve": spreads_curve,
+    "screener": screener
 }
 
-if st.session_state.page == "accueil":
-    accueil.show()
-elif st.session_state.page == "clustering":
-    clustering.show(st.session_state.df)
-elif st.session_state.page == "filter_axes":
-    filter_axes.show(st.session_state.df)
-elif st.session_state.page == "detail_isin":
-    detail_isin.show(st.session_state.df)
-elif st.session_state.page == "spreads_curve":
-    spreads_curve.show(st.session_state.df)
\ No newline at end of file
+with perf_run(st.session_state.page, profile=perf_panel.profile_request()) as run:
+    # Signale les données arrivées depuis l'ouverture (surveillance de data/)
+    update_banner()
+
+    snapshot = current_snapshot() if st.session_state.page != "accueil" else None
+    if snapshot is None:
+        st.session_state.page = "accueil"
+        accueil.show()
+    else:
+        # Meilleur dealer selon la politique choisie sur l'accueil (frame partagé, lecture seule)
+        df = snapshot.best(st.session_state.get("best_policy", DEFAULT_POLICY))
+
+        if st.session_state.page == "clustering":
+            clustering.show(df)
+        elif st.session_state.page == "filter_axes":
+            filter_axes.show(df)
+        elif st.session_state.page == "detail_isin":
+            detail_isin.show(df)
+        elif st.session_state.page == "spreads_curve":
+            spreads_curve.show(df)
+        elif st.session_state.page == "screener":
+            screener.show(df)
+
+# Temps par étape du rendu (?perf=1)
+perf_panel.show(run)
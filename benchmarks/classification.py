@@ -0,0 +1,98 @@
+import os
+import sys
+import time
+import pandas as pd
+
+# Compare les apply() ligne à ligne historiques d'accueil.show() et utils.classification,
+# vérifie que les sorties sont identiques puis affiche le gain.
+# Usage : python benchmarks/classification.py [fichier.xlsx] [facteur de réplication]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.classification import classify_sector, classify_rating_category, rating_score
+from utils.data_loader import latest_axes_file, read_axes_workbook
+
+
+def legacy_classify_rating_cat(fitch, moodys):
+    rating = fitch if pd.notna(fitch) and str(fitch).strip().lower() != "nan" else moodys
+    if pd.isna(rating) or str(rating).strip() == "":
+        return "Not Rated"
+
+    rating = str(rating).upper().strip()
+
+    ig_ratings = {
+        "AAA", "AA+", "AA", "AA-", "A+", "A", "A-", "Aaa", "Aa1", "Aa2", "Aa3",
+        "A1", "A2", "A3"
+    }
+
+    crossover_ratings = {
+        "BBB+", "BBB", "BBB-", "Baa1", "Baa2", "Baa3", "BB+", "BB", "BB-"
+    }
+
+    hy_ratings = {
+        "B+", "B", "B-", "B1", "B2", "B3"
+    }
+
+    junk_ratings = {
+        "CCC+", "CCC", "CCC-", "CC", "C", "Ca", "Caa1", "Caa2", "Caa3"
+    }
+
+    if rating in ig_ratings:
+        return "Investment Grade"
+    elif rating in crossover_ratings:
+        return "Crossover"
+    elif rating in hy_ratings:
+        return "High Yield"
+    elif rating in junk_ratings:
+        return "Junk"
+    else:
+        return "Not Rated"
+
+
+def legacy_sector(df):
+    df = df.copy()
+    df["Sub_Sector"] = df["Sector"]
+    df["Sector"] = df["Sub_Sector"].str.extract(r'^([^ -]+)')
+    return df.apply(lambda row: "IG FIN" if (
+        row["Sub_Sector"].startswith("IG") and
+        any(x in str(row["Sub_Sector"]) for x in ["CoCo", "Lower Tier 2", "Lower T2", "SnBnk/Fin", "Upper T2/T1"])
+    ) else ("IG CORPO" if str(row["Sub_Sector"]).startswith("IG") else row["Sector"]), axis=1)
+
+
+def legacy_rating(df):
+    return df.apply(lambda row: legacy_classify_rating_cat(row.get("FitchRating"), row.get("Moody's_rating")), axis=1)
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    out = func(*args)
+    return out, time.perf_counter() - start
+
+
+def main(path, factor=1):
+    df = read_axes_workbook(path)
+    df = df[["Sector", "FitchRating", "Moody's_rating"]]
+    if factor > 1:
+        df = pd.concat([df] * factor, ignore_index=True)
+
+    old_sector, t_old_sector = _timed(legacy_sector, df)
+    new_sector, t_new_sector = _timed(classify_sector, df["Sector"])
+    old_rating, t_old_rating = _timed(legacy_rating, df)
+    new_rating, t_new_rating = _timed(classify_rating_category, df["FitchRating"], df["Moody's_rating"])
+    _, t_score = _timed(rating_score, df["FitchRating"], df["Moody's_rating"])
+
+    # Sorties strictement identiques (valeurs et NaN)
+    pd.testing.assert_series_equal(old_sector, new_sector, check_names=False)
+    pd.testing.assert_series_equal(old_rating, new_rating, check_names=False)
+
+    print(f"{os.path.basename(path)} x{factor} : {len(df)} lignes, sorties identiques")
+    print(f"  Sector           apply {t_old_sector:7.3f} s   vectorisé {t_new_sector:7.4f} s   x{t_old_sector / t_new_sector:.0f}")
+    print(f"  Rating_Category  apply {t_old_rating:7.3f} s   vectorisé {t_new_rating:7.4f} s   x{t_old_rating / t_new_rating:.0f}")
+    print(f"  Rating_Score     vectorisé {t_score:7.4f} s")
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else latest_axes_file(os.path.join(ROOT, "data"))
+    factor = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    main(path, factor)
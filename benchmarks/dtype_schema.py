@@ -0,0 +1,46 @@
+import os
+import sys
+import time
+
+# Mémoire par colonne des frames d'axes avant / après le schéma compact, et temps
+# des opérations courantes des pages (groupby, isin) sur les deux versions.
+# Usage : python benchmarks/dtype_schema.py [fichier.xlsx]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.data_loader import latest_axes_file, read_axes_workbook, axes_file_date
+from utils.pipeline import clean_axes, select_best_axes
+from utils.schema import compact_axes, memory_report
+
+
+def timed(func, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else latest_axes_file(os.path.join(ROOT, "data"))
+    df_full = clean_axes(read_axes_workbook(path), as_of=axes_file_date(path))
+    frames = {"df_full": df_full, "df": select_best_axes(df_full)}
+
+    for name, before in frames.items():
+        after = compact_axes(before)
+        report = memory_report(before, after)
+        print(f"\n== {name} ({len(before)} lignes)")
+        print(report.sort_values("Mo avant", ascending=False).to_string())
+        total = report.loc["Total"]
+        print(f"Empreinte : {total['Mo avant']:.2f} Mo -> {total['Mo après']:.2f} Mo "
+              f"(x{total['Mo avant'] / total['Mo après']:.1f})")
+
+        sectors = list(before["Sector"].dropna().unique()[:3])
+        for label, frame in [("avant", before), ("après", after)]:
+            t_group = timed(lambda: frame.groupby(["Sector", "Rating_Category"])["AXE_Offer_QTY"].sum())
+            t_isin = timed(lambda: frame[frame["Sector"].isin(sectors)])
+            print(f"  {label:5s} groupby {t_group:7.2f} ms   isin {t_isin:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
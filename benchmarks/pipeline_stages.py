@@ -0,0 +1,229 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import statistics
+import subprocess
+import warnings
+from datetime import datetime
+
+# Temps de chaque étape du dashboard sur des classeurs synthétiques x1 / x10 / x100 :
+# lecture Excel, nettoyage, classification, schéma compact, meilleur dealer, filtres
+# (filter_axes), agrégations (Flux), courbes de spread, valeur relative et figures. Résultats en JSON
+# (un fichier par exécution) pour comparer les versions entre elles.
+# Usage : python benchmarks/pipeline_stages.py [--scales 1 10 100] [--compare ancien.json]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+from benchmarks.synthetic_axes import generate_axes_workbook
+from utils.data_loader import read_axes_workbook, axes_file_date, INGEST_WORKERS
+from utils.pipeline import clean_axes, select_best_axes, classify_sector, classify_ratings
+from utils.schema import compact_axes
+from utils.filter_engine import FilterEngine
+from utils.plotting import scatter
+from utils.flux_cube import FluxCube
+from utils.spread_curves import SpreadCurves
+from utils.relative_value import relative_value
+from utils.snapshot_store import validate_frame
+from modules.spreads_curve import HEATMAP_AXES, FLUX_AXES, FLUX_MODES, quantity_pivot, flux_table, quantity_heatmap, flux_bar
+
+RESULTS_VERSION = 1
+WORK_DIR = os.path.join(ROOT, "benchmarks", ".work")
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+
+def measure(func, max_repeat=5, budget=2.0):
+    # Médiane de quelques exécutions (une seule si l'étape dépasse le budget) -> (stats, dernier résultat)
+    times = []
+    while True:
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+        if len(times) >= max_repeat or sum(times) >= budget:
+            break
+    stats = {"median_s": round(statistics.median(times), 6), "min_s": round(min(times), 6), "repeats": len(times)}
+    return stats, result
+
+
+def filter_specs(df):
+    # Filtres représentatifs de la page filter_axes (état par défaut, puis restrictions usuelles)
+    full = {
+        "in": {col: sorted(df[col].dropna().unique()) for col in ["Sector", "Currency", "CouponType", "Rating_Category"]},
+        "range": {
+            col: (float(df[col].min()), float(df[col].max()))
+            for col in ["AXE_Offer_YLD", "AXE_Offer_QTY", "Nb_Dealers_AXE", "Axe_Mid_Spread", "AXE_Offer_BMK_SPD"]
+        },
+        "date_range": {"Maturity": (df["Maturity"].min().date(), None)},
+        "flags": {},
+    }
+    sectors = full["in"]["Sector"][:3]
+    issuer = df["IssuerName"].value_counts().index[0]
+    return {
+        "default": full,
+        "sectors": {**full, "in": {**full["in"], "Sector": sectors}},
+        "yield_band": {**full, "range": {**full["range"], "AXE_Offer_YLD": (3.0, 6.0)}},
+        "composite_tol": {**full, "composite_tol": 0.05},
+        "flags": {**full, "flags": {"Is_144A": False, "Is_Scrap": True}},
+        "issuer": {**full, "in": {**full["in"], "IssuerName": [issuer]}},
+    }
+
+
+def run_scale(scale, seed=0, force=False):
+    work_dir = os.path.join(WORK_DIR, f"x{scale:g}")
+    start = time.perf_counter()
+    path, workbook = generate_axes_workbook(work_dir, scale=scale, seed=seed, force=force)
+    print(f"x{scale:g} : {path} ({workbook['file_mb']} Mo, généré/relu en {time.perf_counter() - start:.1f} s)")
+    as_of = axes_file_date(path)
+    stages = {}
+
+    def stage(name, func, **kwargs):
+        stats, result = measure(func, **kwargs)
+        stages[name] = stats
+        print(f"  {name:<22} {stats['median_s'] * 1000:>10.1f} ms  (x{stats['repeats']})")
+        return result
+
+    # Ingestion
+    raw = stage("excel_parse", lambda: read_axes_workbook(path, use_cache=False), max_repeat=1)
+    stage("quality_validation", lambda: validate_frame(raw, as_of))
+    cleaned = stage("clean_axes", lambda: clean_axes(raw, as_of=as_of))
+    stage("classification", lambda: (classify_sector(cleaned["Sub_Sector"]), classify_ratings(cleaned)))
+    df_full = stage("compact_schema", lambda: compact_axes(cleaned))
+    df = stage("best_dealer", lambda: compact_axes(select_best_axes(df_full)))
+
+    # filter_axes : index du moteur, puis filtres à froid (masques à calculer) et à chaud (mémorisés)
+    engine = stage("filter_engine_build", lambda: FilterEngine(df))
+    specs = filter_specs(df)
+
+    def apply_all(cold):
+        if cold:
+            engine.clear()
+        return [len(engine.apply(df, spec)) for spec in specs.values()]
+
+    stage("filter_apply_cold", lambda: apply_all(cold=True))
+    stage("filter_apply_warm", lambda: apply_all(cold=False))
+
+    # Flux : cube (une fois par snapshot), puis toutes les combinaisons de la page sur un cube neuf
+    cube = stage("flux_cube_build", lambda: FluxCube(df))
+
+    def flux_aggregations():
+        cube = FluxCube(df)
+        pivots = {y: quantity_pivot(cube, y) for y in HEATMAP_AXES}
+        tables = {(x, mode): flux_table(cube, x, mode) for x in FLUX_AXES for mode in FLUX_MODES}
+        return pivots, tables
+
+    def flux_rollups_cold():
+        cube._rollups.clear()
+        return [quantity_pivot(cube, y) for y in HEATMAP_AXES] + [flux_table(cube, x, mode) for x in FLUX_AXES for mode in FLUX_MODES]
+
+    pivots, tables = stage("flux_aggregation", flux_aggregations)
+    stage("flux_rollups_cold", flux_rollups_cold)
+
+    # Courbes spread / maturité de tous les groupes (Sector, Sub_Sector, Rating_Category)
+    stage("curve_fit", lambda: SpreadCurves(df))
+    stage("relative_value", lambda: relative_value(df))
+
+    # Figures, sérialisation comprise (ce que fait st.plotly_chart)
+    def scatter_figure():
+        plot_df = df.dropna(subset=["Années avant maturité", "AXE_Offer_BMK_SPD"])
+        fig, _ = scatter(plot_df, x="Années avant maturité", y="AXE_Offer_BMK_SPD", color="Sector",
+                         hover_data=["ISIN", "IssuerName", "AXE_Offer_YLD", "AXE_Offer_Price"], height=600)
+        return len(fig.to_json())
+
+    def flux_figures():
+        figs = [quantity_heatmap(pivot, y) for y, pivot in pivots.items()]
+        figs += [flux_bar(table, x, y_col) for (x, _), (table, y_col) in tables.items()]
+        return sum(len(fig.to_json()) for fig in figs)
+
+    stage("figure_scatter", scatter_figure)
+    stage("figure_flux", flux_figures)
+
+    return {
+        "scale": scale,
+        "workbook": workbook,
+        "rows": {"raw": len(raw), "full": len(df_full), "best": len(df)},
+        "stages": stages,
+    }
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    import plotly
+    import pyarrow
+    import openpyxl
+    return {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "pyarrow": pyarrow.__version__,
+        "openpyxl": openpyxl.__version__,
+        "plotly": plotly.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "ingest_workers": INGEST_WORKERS,
+    }
+
+
+def compare(results, baseline):
+    # Rapport nouveau / ancien par échelle et par étape (> 1 : plus lent)
+    previous = {run["scale"]: run["stages"] for run in baseline["runs"]}
+    print(f"\nComparaison avec {baseline.get('git_commit')} du {baseline.get('started_at')}")
+    for run in results["runs"]:
+        if run["scale"] not in previous:
+            continue
+        print(f"x{run['scale']:g}")
+        for name, stats in run["stages"].items():
+            old = previous[run["scale"]].get(name)
+            if old and old["median_s"] > 0:
+                ratio = stats["median_s"] / old["median_s"]
+                flag = "  <-- régression" if ratio > 1.2 else ""
+                print(f"  {name:<22} {old['median_s'] * 1000:>10.1f} -> {stats['median_s'] * 1000:>10.1f} ms  x{ratio:.2f}{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Temps par étape sur des classeurs Axes synthétiques.")
+    parser.add_argument("--scales", type=float, nargs="+", default=[1, 10, 100], help="tailles (1 = fichier réel)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="fichier JSON (défaut : benchmarks/results/pipeline_<horodatage>.json)")
+    parser.add_argument("--compare", default=None, help="JSON d'une exécution précédente à comparer")
+    parser.add_argument("--regenerate", action="store_true", help="régénère les classeurs synthétiques")
+    args = parser.parse_args(argv)
+
+    # Avertissements pandas / openpyxl sans intérêt ici
+    warnings.simplefilter("ignore")
+    started = datetime.now()
+    results = {
+        "benchmark": "pipeline_stages",
+        "version": RESULTS_VERSION,
+        "started_at": started.isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "environment": environment(),
+        "seed": args.seed,
+        "runs": [run_scale(scale, args.seed, args.regenerate) for scale in args.scales],
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"pipeline_{started.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nRésultats : {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(results, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
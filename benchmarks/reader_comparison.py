@@ -0,0 +1,68 @@
+import os
+import sys
+import json
+import time
+import resource
+import subprocess
+
+# Compare la lecture pd.read_excel complète et la lecture en flux projetée
+# (temps et pic RSS, chaque mesure dans un processus neuf).
+# Usage : python benchmarks/reader_comparison.py [data_dir]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def _measure(mode, path):
+    import pandas as pd
+    from utils.data_loader import AXES_SHEETS, stream_axes_sheet
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if mode == "read_excel":
+        df = pd.concat([pd.read_excel(path, sheet_name=s) for s in AXES_SHEETS], ignore_index=True)
+        df = df[df["IA_Offer_Price"].notna()]
+    else:
+        df = pd.concat([stream_axes_sheet(path, s) for s in AXES_SHEETS], ignore_index=True)
+    elapsed = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return {
+        "mode": mode,
+        "file": os.path.basename(path),
+        "seconds": round(elapsed, 3),
+        # ru_maxrss est en Ko sous Linux
+        "peak_rss_mb": round(rss_after / 1024, 1),
+        "peak_rss_delta_mb": round((rss_after - rss_before) / 1024, 1),
+        "rows": len(df),
+        "columns": df.shape[1],
+        "frame_mb": round(df.memory_usage(deep=True).sum() / 1e6, 1),
+    }
+
+
+def main(data_dir):
+    from utils.data_loader import list_axes_files
+
+    results = []
+    for name in list_axes_files(data_dir):
+        path = os.path.join(data_dir, name)
+        for mode in ["read_excel", "stream"]:
+            out = subprocess.run(
+                [sys.executable, __file__, "--measure", mode, path],
+                capture_output=True, text=True, check=True
+            )
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+            results.append(result)
+            print(
+                f"{result['file']:<22} {mode:<11} {result['seconds']:>7.2f} s"
+                f"  peak RSS {result['peak_rss_mb']:>7.1f} MB (+{result['peak_rss_delta_mb']:.1f})"
+                f"  {result['rows']} x {result['columns']}  {result['frame_mb']} MB"
+            )
+    return results
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--measure":
+        print(json.dumps(_measure(sys.argv[2], sys.argv[3])))
+    else:
+        main(sys.argv[1] if len(sys.argv) > 1 else os.path.join(ROOT, "data"))
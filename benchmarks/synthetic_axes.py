@@ -0,0 +1,471 @@
+import os
+import sys
+import json
+import argparse
+import zipfile
+from datetime import date
+import numpy as np
+import pandas as pd
+
+# Générateur de classeurs Axes_*.xlsx synthétiques : mêmes feuilles et colonnes IA_/TW_ que
+# les fichiers réels, cardinalités (ISINs, émetteurs, dealers par ISIN, secteurs, notations)
+# et distributions relevées sur le fichier du 19/06/2025, à l'échelle x1, x10, x100...
+# Usage : python benchmarks/synthetic_axes.py [--scale 10] [--seed 0] [--out-dir benchmarks/.work]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# À incrémenter quand la génération change : invalide les classeurs déjà générés
+GENERATOR_VERSION = 1
+
+# Lignes de données d'une feuille Excel au maximum (1 048 576 avec l'en-tête)
+MAX_SHEET_ROWS = 1_048_575
+
+COLUMNS = [
+    "Bond ID", "Sector", "ISIN", "IssuerName", "Ticker", "Coupon", "Maturity", "CouponType", "Currency",
+    "IA_Offer_Price", "IA_Offer_YLD", "IA_Offer_QTY", "Dealer", "Stream_Offer_Price",
+    "TW_Offer_Price", "TW_Offer_YLD", "TW_Bid_Price", "TW_Bid_YLD", "LIQScore",
+    "Moody's_rating", "FitchRating", "IA_Offer_BMK_SPD", "IA_Offer_I-SPD", "IA_Offer_Z-SPD", "IA_Offer_ASW",
+    "IssueDate", "Product", "AI_Offer_Price", "AI_Offer_Yield"
+]
+
+MOODYS = {
+    "Baa1": 2717, "Baa2": 2083, "A3": 2042, "Aaa": 1996, "NR": 1829, "A1": 1492, "A2": 1144,
+    "Aa3": 1022, "Baa3": 990, "Aa1": 457, "Ba1": 437, "Aa2": 403, "Ba2": 350, "B2": 241,
+    "B1": 210, "Ba3": 161, "WR": 155, "B3": 91, "Caa1": 68, "Caa2": 42, "Ca": 11, "Caa3": 7, "C": 2
+}
+FITCH = {
+    "NR": 5573, "BBB": 3019, "A": 2576, "A-": 1657, "AAA": 1045, "BBB-": 972, "AA-": 869,
+    "WD": 765, "BB": 718, "AA": 403, "BB-": 256, "B": 222, "B-": 48, "CCC": 32, "C": 5, "CC": 3,
+    "CCC-": 2, "D": 1
+}
+
+# Une entrée par feuille, dans l'ordre du classeur réel
+SHEETS = {
+    "Axes Offers EUR": {
+        "currency": "EUR",
+        "isins": 6707,
+        "issuers_per_isin": 0.235,
+        "dealers": {
+            "JANE": 2640, "JPM": 1830, "BNPP": 1813, "FLOW": 1375, "MSAX": 1238, "DB": 1092,
+            "BARX": 1084, "CITI": 933, "UBSW": 930, "C": 716, "HSBC": 709, "MSDW": 693, "JEF": 586,
+            "RBC": 501, "BAML": 475, "SANT": 442, "ING": 363, "SG": 300, "CALY": 106, "UMIB": 104,
+            "MZHO": 93, "DBAL": 64, "IMI": 52, "BBVA": 42, "RBS": 41, "ODDO": 32, "GS": 1
+        },
+        "dealers_per_isin": {
+            1: 2423, 2: 1551, 3: 946, 4: 639, 5: 437, 6: 301, 7: 171, 8: 106, 9: 75, 10: 34,
+            11: 14, 12: 5, 13: 3, 14: 1, 18: 1
+        },
+        "sectors": [
+            "Asia - Agency", "Asia - Corp", "Asia - Fin", "Asia - Sovereign", "CEEMEA - Agency",
+            "CEEMEA - Corp", "CEEMEA - Fin", "CEEMEA - Sovereign", "COVRD - AT", "COVRD - Benelux",
+            "COVRD - DE", "COVRD - ES", "COVRD - FR", "COVRD - Nordic", "COVRD - North Am.",
+            "COVRD - Other Covrd", "COVRD - PT", "COVRD - UK", "HY - HY", "IG - Auto", "IG - CoCo",
+            "IG - Cons", "IG - Ind", "IG - Lower T2", "IG - SnBnk/Fin", "IG - Tel/Med",
+            "IG - Upper T2/T1", "IG - Util", "LatAm - Agency", "LatAm - Corp", "LatAm - Sovereign",
+            "LatAm - Supra", "SAS - Agency", "SAS - Govt Gtd - Bank", "SAS - Lander",
+            "SAS - Other SAS", "SAS - Sov Gtd", "SAS - Sovereign", "SAS - Supra"
+        ],
+        "isin_prefixes": {"XS": 12456, "FR": 2809, "DE": 1477, "BE": 453, "IT": 249, "ES": 219, "AT": 160, "CH": 128},
+        "suffixes": {"{RegS}": 11081, "{RegS  SUB}": 735, "{144A}": 70, "": 6369},
+        "float_share": 0.010,
+        # Quantités en milliers, ~11 % de scraps (ne finissant pas par 0)
+        "qty_unit": 1, "qty_median": 2000, "scrap_share": 0.11,
+        "product": ("EU", 0.022),
+        "bmk_median": 89.0,
+        "moodys_na": 0.146, "fitch_na": 0.13, "liq_na": 0.183,
+    },
+    "Axes Offers USD": {
+        "currency": "USD",
+        "isins": 2151,
+        "issuers_per_isin": 0.435,
+        "dealers": {
+            "FLOW": 669, "JANE": 439, "JPM": 308, "HSBC": 169, "RBC": 159, "ING": 147, "DB": 119,
+            "JEF": 108, "BNPP": 104, "MSDW": 97, "BARX": 96, "C": 90, "RBS": 14, "ODDO": 6, "IMI": 5,
+            "UBSW": 2, "CALY": 2, "UMIB": 1, "GS": 1
+        },
+        "dealers_per_isin": {1: 1855, 2: 228, 3: 52, 4: 11, 5: 5},
+        "sectors": [
+            "Asia - Agency", "Asia - Corp", "Asia - Fin", "Asia - None", "Asia - Other",
+            "Asia - Sovereign", "CEEMEA - Agency", "CEEMEA - Corp", "CEEMEA - Fin",
+            "CEEMEA - Sovereign", "CEEMEA - Supra", "DSUP - Other SAS", "DSUP - Supra", "HY - HY",
+            "IG - Auto", "IG - Cons", "IG - Ind", "IG - SnBnk/Fin", "IG - Tel/Med", "IG - Util",
+            "LatAm - Agency", "LatAm - Corp", "LatAm - Fin"
+        ],
+        "isin_prefixes": {"US": 1824, "XS": 697, "NO": 8, "IL": 5},
+        "suffixes": {"{RegS}": 1059, "{144A}": 392, "{RegS  SUB}": 80, "{144A  SUB}": 22, "": 983},
+        "float_share": 0.075,
+        # Nominaux en dollars, multiples de 1000
+        "qty_unit": 1000, "qty_median": 1500, "scrap_share": 0.0,
+        "product": (None, 0.0),
+        "bmk_median": 87.8,
+        "moodys_na": 0.067, "fitch_na": 0.096, "liq_na": 0.012,
+    },
+}
+
+LIQ_SCORES = {1: 1518, 2: 6088, 3: 1321, 4: 1668, 5: 1823, 6: 1995, 7: 1493, 8: 993, 9: 429, 10: 89}
+
+SYLLABLES = [
+    "AL", "BA", "CO", "DE", "EN", "FI", "GA", "HO", "IN", "KA", "LU", "MA", "NO", "OR", "PA",
+    "RE", "SA", "TE", "UN", "VE", "WI", "ZE", "TRO", "NIK", "BER", "MON", "STA", "GEN", "VOL"
+]
+NAME_SUFFIXES = ["SA", "AG", "PLC", "INC", "NV", "SPA", "AB", "BV", "LTD", "CORP", "GMBH", "ASA"]
+ISIN_CHARS = np.array(list("0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"))
+
+
+def _choice(rng, weights, size):
+    keys = list(weights)
+    p = np.array([weights[k] for k in keys], dtype=float)
+    return np.array(keys, dtype=object)[rng.choice(len(keys), size=size, p=p / p.sum())]
+
+
+def _with_na(rng, values, share):
+    values = values.astype(object)
+    values[rng.random(len(values)) < share] = None
+    return values
+
+
+def _issuer_names(rng, n):
+    # Noms de 2-3 « mots » de syllabes + forme juridique, uniques par numéro
+    words = [
+        "".join(parts)
+        for parts in zip(*(rng.choice(SYLLABLES, size=n) for _ in range(3)))
+    ]
+    others = rng.choice(SYLLABLES, size=n)
+    suffixes = rng.choice(NAME_SUFFIXES, size=n)
+    names = [f"{w} {o}{i % 97:02d} {s}" for i, (w, o, s) in enumerate(zip(words, others, suffixes))]
+    tickers = [w[:6] + f"{i % 97:02d}" for i, w in enumerate(words)]
+    return np.array(names, dtype=object), np.array(tickers, dtype=object)
+
+
+def _isins(rng, prefixes, n, salt):
+    # Préfixe pays + 9 caractères (numéro unique mélangé) + chiffre de contrôle factice
+    numbers = rng.permutation(n) + salt * 10 ** 8
+    digits = np.stack([(numbers // 36 ** k) % 36 for k in range(8, -1, -1)], axis=1)
+    bodies = ["".join(row) for row in ISIN_CHARS[digits]]
+    checks = rng.integers(0, 10, size=n)
+    return np.array([f"{p}{b}{c}" for p, b, c in zip(prefixes, bodies, checks)], dtype=object)
+
+
+def synthetic_sheet(sheet, scale=1.0, seed=0, as_of=date(2025, 6, 19), max_rows=MAX_SHEET_ROWS):
+    # -> DataFrame d'une feuille (colonnes COLUMNS), une ligne par (ISIN, dealer)
+    profile = SHEETS[sheet]
+    rng = np.random.default_rng([seed, list(SHEETS).index(sheet)])
+
+    # Dealers par ISIN selon la distribution observée ; au-delà de la limite Excel, on coupe
+    n_isins = max(1, int(round(profile["isins"] * scale)))
+    per_isin = _choice(rng, profile["dealers_per_isin"], n_isins).astype(np.int64)
+    per_isin = np.minimum(per_isin, len(profile["dealers"]))
+    n_isins = int(np.searchsorted(np.cumsum(per_isin), max_rows, side="right"))
+    per_isin = per_isin[:n_isins]
+
+    # Attributs par émetteur
+    n_issuers = max(1, int(round(n_isins * profile["issuers_per_isin"])))
+    names, tickers = _issuer_names(rng, n_issuers)
+    issuer_sector = rng.choice(profile["sectors"], size=n_issuers)
+    issuer_moodys = _with_na(rng, _choice(rng, MOODYS, n_issuers), profile["moodys_na"])
+    issuer_fitch = _with_na(rng, _choice(rng, FITCH, n_issuers), profile["fitch_na"])
+
+    # Attributs par ISIN
+    issuer = rng.integers(0, n_issuers, size=n_isins)
+    isin = _isins(rng, _choice(rng, profile["isin_prefixes"], n_isins), n_isins, list(SHEETS).index(sheet))
+    floating = rng.random(n_isins) < profile["float_share"]
+    coupon_value = np.round(rng.uniform(0, 8, size=n_isins) * 8) / 8
+    coupon = np.where(floating, "FRN", np.char.mod("%.3f", coupon_value)).astype(object)
+    years = np.exp(rng.normal(1.5, 0.75, size=n_isins))
+    tail = rng.random(n_isins)
+    years = np.where(tail < 0.035, rng.uniform(45, 95, size=n_isins), years)
+    years = np.where(tail < 0.005, 999.0, years)  # perpétuelles codées à ~+1000 ans
+    as_of_day = np.datetime64(as_of, "D")
+    maturity = as_of_day + (years * 365.25).astype("timedelta64[D]")
+    mat_text = pd.to_datetime(maturity.astype("datetime64[s]")).strftime("%m/%d/%Y")
+    suffix = _choice(rng, profile["suffixes"], n_isins)
+    bond_id = np.array([
+        f"{tickers[i]} {c} {m} {profile['currency']} {s}".strip()
+        for i, c, m, s in zip(issuer, coupon, mat_text, suffix)
+    ], dtype=object)
+    bond_price = np.where(rng.random(n_isins) < 0.85, rng.normal(99.5, 3, n_isins), rng.normal(85, 15, n_isins))
+    bond_price = np.clip(bond_price, 0.5, 160)
+    bond_yld = np.clip(coupon_value / 100 + (100 - bond_price) / 100 / np.maximum(years, 0.25), -0.05, 0.6)
+    bond_bmk = rng.lognormal(np.log(profile["bmk_median"]), 0.6, size=n_isins) - 15
+    bid_offer = rng.lognormal(np.log(0.35), 0.6, size=n_isins)
+    liq = _choice(rng, LIQ_SCORES, n_isins).astype(float)
+    liq[rng.random(n_isins) < profile["liq_na"]] = np.nan
+    issue_date = as_of_day - (rng.uniform(0.1, 10, size=n_isins) * 365.25).astype("timedelta64[D]")
+    issue_date = np.where(rng.random(n_isins) < 0.58, np.datetime64("NaT"), issue_date)
+
+    # Une ligne par (ISIN, dealer) : dealers tirés sans remise selon leur poids (clés de Gumbel)
+    dealers = np.array(list(profile["dealers"]), dtype=object)
+    log_w = np.log(np.array(list(profile["dealers"].values()), dtype=np.float32))
+    rows = np.repeat(np.arange(n_isins), per_isin)
+    rank = np.arange(len(rows)) - np.repeat(np.cumsum(per_isin) - per_isin, per_isin)
+    chosen = np.empty(len(rows), dtype=np.int64)
+    for start in range(0, n_isins, 200_000):
+        stop = min(start + 200_000, n_isins)
+        keys = log_w - np.log(-np.log(rng.random((stop - start, len(dealers)), dtype=np.float32)))
+        order = np.argsort(-keys, axis=1)
+        block = (rows >= start) & (rows < stop)
+        chosen[block] = order[rows[block] - start, rank[block]]
+    n = len(rows)
+
+    price = np.round(bond_price[rows] + np.abs(rng.normal(0, 0.15, size=n)), 3)
+    yld = bond_yld[rows] - (price - bond_price[rows]) / 100 / np.maximum(years[rows], 0.25)
+    yld = np.where(rng.random(n) < 0.003, np.nan, np.round(yld, 5))
+    stream = np.round(price + rng.normal(0, 0.05, size=n), 3)
+    stream[rng.random(n) < 0.08] = np.nan
+    # Inversions prix / rendement (corrigées par le nettoyage)
+    swapped = (rng.random(n) < 0.01) & ~np.isnan(yld)
+    price, yld = np.where(swapped, np.round(yld * 100, 3), price), np.where(swapped, price / 100, yld)
+
+    tw_bid = np.round(bond_price[rows] - bid_offer[rows] / 2, 3)
+    tw_offer = np.round(tw_bid + bid_offer[rows], 3)
+    tw_missing = rng.random(n) < 0.006
+    tw_bid[tw_missing] = np.nan
+    tw_offer[tw_missing] = np.nan
+    tw_offer_yld = np.round(bond_yld[rows] + bid_offer[rows] / 400, 5)
+    tw_bid_yld = np.round(bond_yld[rows] + bid_offer[rows] / 200, 5)
+
+    qty = rng.lognormal(np.log(profile["qty_median"]), 1.0, size=n)
+    qty = np.where(rng.random(n) < profile["scrap_share"], np.round(qty), np.round(qty, -1 if profile["qty_unit"] == 1 else 0))
+    qty = (np.maximum(qty, 1) * profile["qty_unit"]).astype(np.int64)
+
+    bmk = np.round(bond_bmk[rows] + rng.normal(0, 5, size=n), 1)
+    bmk[rng.random(n) < 0.022] = np.nan
+    spreads = {}
+    for col, shift, na in [("IA_Offer_I-SPD", -25, 0.06), ("IA_Offer_Z-SPD", -30, 0.14), ("IA_Offer_ASW", -20, 0.13)]:
+        values = np.round(bmk + shift + rng.normal(0, 15, size=n), 3)
+        values[rng.random(n) < na] = np.nan
+        spreads[col] = values
+
+    product_value, product_share = profile["product"]
+    product = np.full(n, None, dtype=object)
+    if product_value is not None:
+        product[rng.random(n) < product_share] = product_value
+
+    df = pd.DataFrame({
+        "Bond ID": bond_id[rows],
+        "Sector": issuer_sector[issuer][rows],
+        "ISIN": isin[rows],
+        "IssuerName": names[issuer][rows],
+        "Ticker": tickers[issuer][rows],
+        "Coupon": coupon[rows],
+        "Maturity": maturity[rows],
+        "CouponType": np.where(floating, "Float", "Fixed")[rows],
+        "Currency": profile["currency"],
+        "IA_Offer_Price": price,
+        "IA_Offer_YLD": yld,
+        "IA_Offer_QTY": qty,
+        "Dealer": dealers[chosen],
+        "Stream_Offer_Price": stream,
+        "TW_Offer_Price": tw_offer,
+        "TW_Offer_YLD": tw_offer_yld,
+        "TW_Bid_Price": tw_bid,
+        "TW_Bid_YLD": tw_bid_yld,
+        "LIQScore": liq[rows],
+        "Moody's_rating": issuer_moodys[issuer][rows],
+        "FitchRating": issuer_fitch[issuer][rows],
+        "IA_Offer_BMK_SPD": bmk,
+        **spreads,
+        "IssueDate": issue_date[rows],
+        "Product": product,
+        "AI_Offer_Price": np.nan,
+        "AI_Offer_Yield": np.nan,
+    }, columns=COLUMNS)
+
+    # Comme le fichier réel : trié par maturité
+    return df.sort_values(["Maturity", "ISIN"], kind="stable", ignore_index=True)
+
+
+XLSX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '<Override PartName="/xl/sharedStrings.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+        '{sheets}</Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rIdStyles" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+        '<Relationship Id="rIdStrings" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" Target="sharedStrings.xml"/>'
+        '{sheets}</Relationships>'
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets>{sheets}</sheets></workbook>'
+    ),
+    # Style 1 : date courte (numFmt 14), comme les colonnes Maturity / IssueDate du fichier réel
+    "xl/styles.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="1"><fill><patternFill patternType="none"/></fill></fills>'
+        '<borders count="1"><border/></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        '</styleSheet>'
+    ),
+}
+SHEET_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    # Sans <dimension>, openpyxl parcourt toute la feuille pour la calculer
+    '<dimension ref="A1:{last}"/><sheetData>'
+)
+EXCEL_EPOCH = np.datetime64("1899-12-30", "D")
+WRITE_CHUNK = 100_000
+
+
+def _column_letter(i):
+    letters = ""
+    i += 1
+    while i:
+        i, rem = divmod(i - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _escape(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _cells(series, ref, strings):
+    # Colonne -> fragments XML <c> (vide si manquant) ; chaînes dans la table partagée
+    if pd.api.types.is_datetime64_any_dtype(series):
+        serial = (series.to_numpy().astype("datetime64[D]") - EXCEL_EPOCH).astype(np.int64)
+        values, style = pd.Series(serial, index=series.index).astype(str), ' s="1"'
+        missing = series.isna()
+    elif pd.api.types.is_numeric_dtype(series):
+        values, style = series.astype(object).map(repr).astype(str), ""
+        missing = series.isna()
+    else:
+        codes, uniques = pd.factorize(series)
+        ids = np.array([strings.setdefault(value, len(strings)) for value in uniques] + [-1], dtype=np.int64)
+        values, style = pd.Series(ids[codes], index=series.index).astype(str), ' t="s"'
+        missing = pd.Series(codes < 0, index=series.index)
+    cells = ("<c r=\"" + ref + "\"" + style + "><v>") + values + "</v></c>"
+    return cells.where(~missing, "")
+
+
+def _sheet_rows(df, strings):
+    # Lignes <row> de la feuille, par paquets (en-tête inclus)
+    header = "".join(
+        f'<c r="{_column_letter(i)}1" t="s"><v>{strings.setdefault(col, len(strings))}</v></c>'
+        for i, col in enumerate(df.columns)
+    )
+    yield f'<row r="1">{header}</row>'
+    letters = [_column_letter(i) for i in range(len(df.columns))]
+    for start in range(0, len(df), WRITE_CHUNK):
+        chunk = df.iloc[start:start + WRITE_CHUNK]
+        numbers = pd.Series(np.arange(start + 2, start + 2 + len(chunk)), index=chunk.index).astype(str)
+        row = '<row r="' + numbers + '">'
+        for letter, col in zip(letters, df.columns):
+            row = row + _cells(chunk[col], letter + numbers, strings)
+        yield "".join((row + "</row>").tolist())
+
+
+def write_workbook(path, sheets):
+    # Écriture en flux (zip) au format d'Excel : chaînes dans sharedStrings.xml, dates en
+    # numéros de série stylés — même chemin de lecture que les fichiers reçus
+    names = list(sheets)
+    strings = {}
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for i, name in enumerate(names, start=1):
+            with zf.open(f"xl/worksheets/sheet{i}.xml", "w") as f:
+                df = sheets[name]
+                last = f"{_column_letter(len(df.columns) - 1)}{len(df) + 1}"
+                f.write(SHEET_XML.replace("{last}", last).encode())
+                for block in _sheet_rows(df, strings):
+                    f.write(block.encode())
+                f.write(b"</sheetData></worksheet>")
+
+        with zf.open("xl/sharedStrings.xml", "w") as f:
+            f.write((
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                f'<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" uniqueCount="{len(strings)}">'
+            ).encode())
+            for start in range(0, len(strings), WRITE_CHUNK):
+                block = list(strings)[start:start + WRITE_CHUNK]
+                f.write("".join(f"<si><t>{_escape(str(text))}</t></si>" for text in block).encode())
+            f.write(b"</sst>")
+
+        parts = {
+            "[Content_Types].xml": "".join(
+                f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+                'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                for i in range(1, len(names) + 1)
+            ),
+            "xl/_rels/workbook.xml.rels": "".join(
+                f'<Relationship Id="rId{i}" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+                f'relationships/worksheet" Target="worksheets/sheet{i}.xml"/>'
+                for i in range(1, len(names) + 1)
+            ),
+            "xl/workbook.xml": "".join(
+                f'<sheet name="{_escape(name)}" sheetId="{i}" r:id="rId{i}"/>'
+                for i, name in enumerate(names, start=1)
+            ),
+        }
+        for part, template in XLSX_PARTS.items():
+            zf.writestr(part, template.replace("{sheets}", parts.get(part, "")))
+    return path
+
+
+def generate_axes_workbook(out_dir, scale=1.0, seed=0, as_of=date(2025, 6, 19), force=False):
+    # -> (chemin du classeur, métadonnées) ; réutilise un classeur déjà généré avec les mêmes paramètres
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"Axes_{as_of.strftime('%Y%m%d')}.xlsx")
+    meta_path = os.path.join(out_dir, "generator.json")
+    params = {"scale": scale, "seed": seed, "as_of": as_of.isoformat(), "version": GENERATOR_VERSION}
+    if not force and os.path.exists(path) and os.path.exists(meta_path):
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("params") == params:
+            return path, meta
+
+    sheets = {sheet: synthetic_sheet(sheet, scale, seed, as_of) for sheet in SHEETS}
+    write_workbook(path, sheets)
+    meta = {
+        "params": params,
+        "rows": {sheet: len(df) for sheet, df in sheets.items()},
+        "isins": {sheet: int(df["ISIN"].nunique()) for sheet, df in sheets.items()},
+        # Feuille coupée à la limite Excel : moins d'ISINs que demandé
+        "capped": any(
+            df["ISIN"].nunique() < round(SHEETS[sheet]["isins"] * scale) for sheet, df in sheets.items()
+        ),
+        "file_mb": round(os.path.getsize(path) / 2 ** 20, 1),
+    }
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return path, meta
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Génère un classeur Axes_*.xlsx synthétique.")
+    parser.add_argument("--scale", type=float, default=1.0, help="facteur de taille (1 = fichier réel)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out-dir", default=os.path.join(ROOT, "benchmarks", ".work", "x1"))
+    parser.add_argument("--force", action="store_true", help="régénère même si le classeur existe")
+    args = parser.parse_args(argv)
+
+    path, meta = generate_axes_workbook(args.out_dir, args.scale, args.seed, force=args.force)
+    print(f"{path} : {meta['rows']} ({meta['file_mb']} Mo)")
+    if meta["capped"]:
+        print(f"Attention : feuille(s) limitée(s) à {MAX_SHEET_ROWS} lignes (limite Excel)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+import argparse
+import os
+import sys
+import time
+from utils.snapshot_store import prebuild_snapshots, default_snapshots_dir, read_quality
+from utils.history_store import ingest_history
+from utils.data_loader import CLI_INGEST_WORKERS
+
+# Ingestion sans interface : à lancer (cron, planificateur) dès que le fichier du matin arrive.
+# Écrit les snapshots nettoyés (par dealer + meilleurs axes) lus directement par le dashboard.
+# Usage : python ingest.py [--data-dir data] [--all] [--force] [--history] [--workers N]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prépare les snapshots Axes_*.xlsx pour le dashboard.")
+    parser.add_argument("--data-dir", default="data", help="dossier des classeurs Axes_*.xlsx")
+    parser.add_argument("--snapshots-dir", default=None, help="dossier des snapshots (défaut : <data-dir>/snapshots)")
+    parser.add_argument("--all", action="store_true", help="tous les classeurs, pas seulement le plus récent")
+    parser.add_argument("--force", action="store_true", help="reconstruit même les snapshots à jour")
+    parser.add_argument("--history", action="store_true", help="met aussi à jour l'historique parquet")
+    parser.add_argument("--workers", type=int, default=CLI_INGEST_WORKERS,
+                        help="processus pour le parsing Excel (1 = lecture série)")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.data_dir):
+        print(f"Dossier introuvable : {args.data_dir}", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    snapshots_dir = args.snapshots_dir or default_snapshots_dir(args.data_dir)
+    built = prebuild_snapshots(args.data_dir, snapshots_dir, latest_only=not args.all, force=args.force,
+                               max_workers=args.workers)
+    for path in built:
+        print(f"Snapshot écrit : {os.path.basename(path)}")
+        quality = read_quality(path, snapshots_dir)
+        if quality is not None:
+            for _, rule in quality[0][quality[0]["Lignes"] > 0].iterrows():
+                print(f"  {rule['Lignes']:>7} lignes ({rule['% des lignes']}%) - {rule['Règle']} [{rule['Action']}]")
+    if not built:
+        print("Snapshots déjà à jour.")
+
+    if args.history:
+        days = ingest_history(args.data_dir, max_workers=args.workers)
+        print(f"Historique : {len(days)} jour(s) ajouté(s).")
+
+    print(f"Terminé en {time.perf_counter() - start:.1f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from utils.row_index import take_rows
+from utils.session import current_snapshot
+from utils.perf import span
+
+# Bloc "détail d'un titre" commun aux pages : infos, dealers axés, fourchette composite.
+# Tables et graphique mémorisés par (snapshot, ISIN).
+
+DEALER_COLUMNS = [
+    "Dealer", "AXE_Offer_Price", "AXE_Offer_YLD", "AXE_Offer_QTY",
+    "Composite_Bid_Price", "Composite_Offer_Price", "Axe_Mid_Spread",
+    "AXE_Offer_BMK_SPD", "AXE_Offer_Z-SPD", "AXE_Offer_I-SPD", "AXE_Offer_ASW"
+]
+
+
+def _bond_infos(bond):
+    maturity = pd.to_datetime(bond.get("Maturity"), errors="coerce")
+    infos = {
+        "Bond ID": bond.get("Bond ID"),
+        "Émetteur": bond.get("IssuerName"),
+        "ISIN": bond.get("ISIN"),
+        "Maturité": maturity.strftime("%d/%m/%Y") if pd.notna(maturity) else None,
+        "Devise": bond.get("Currency"),
+        "Coupon": bond.get("Coupon"),
+        "CouponType": bond.get("CouponType"),
+        "Secteur": bond.get("Sector"),
+        "Notation Moody's": bond.get("Moody's_rating")
+    }
+    # Colonne texte homogène (sinon conversion Arrow impossible pour st.table)
+    infos = {k: (str(v) if pd.notna(v) else "") for k, v in infos.items()}
+    return pd.DataFrame.from_dict(infos, orient="index", columns=["Valeur"])
+
+
+def _dealers_table(rows):
+    # Lignes par dealer (df_full) ou ligne du meilleur axe (Best_Dealer) : colonne "Dealer" dans les deux cas
+    rows = rows.rename(columns={"Best_Dealer": "Dealer"}) if "Dealer" not in rows.columns else rows
+    return rows[[col for col in DEALER_COLUMNS if col in rows.columns]].reset_index(drop=True)
+
+
+def _composite_figure(bond, dealers):
+    bid = bond.get("Composite_Bid_Price")
+    offer = bond.get("Composite_Offer_Price")
+    mid = bond.get("Mid_Price")
+    if pd.isna(mid) and pd.notna(bid) and pd.notna(offer):
+        mid = (bid + offer) / 2
+
+    fig = go.Figure()
+
+    # Barre principale (bid → offer), repères Bid / Mid / Offer
+    fig.add_shape(type="line", x0=bid, x1=offer, y0=0, y1=0, line=dict(color="orange", width=3))
+    for val, label in zip([bid, mid, offer], ["Bid", "Mid", "Offer"]):
+        fig.add_shape(type="line", x0=val, x1=val, y0=-0.2, y1=0.2, line=dict(color="orange", width=2))
+        fig.add_annotation(x=val, y=-0.3, text=label, showarrow=False, font=dict(color="orange"), yanchor="top")
+
+    # Tous les dealers dans une seule trace
+    palette = px.colors.qualitative.Safe
+    names = dealers["Dealer"].astype(str).tolist()
+    fig.add_trace(go.Scatter(
+        x=dealers["AXE_Offer_Price"],
+        y=[0] * len(dealers),
+        mode="markers+text",
+        text=names,
+        textposition="top center",
+        marker=dict(size=15, color=[palette[i % len(palette)] for i in range(len(dealers))]),
+        hovertemplate="%{text} : %{x}<extra></extra>"
+    ))
+
+    fig.update_layout(
+        height=250,
+        template="plotly_dark",
+        showlegend=False,
+        xaxis_title="Prix",
+        xaxis=dict(showgrid=False),
+        yaxis=dict(visible=False)
+    )
+    return fig
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def _bond_detail(snapshot_key, isin, _rows):
+    bond = _rows.iloc[0]
+    dealers = _dealers_table(_rows)
+    return _bond_infos(bond), dealers, _composite_figure(bond, dealers)
+
+
+def show(isin, df=None):
+    # Dealers de l'ISIN pris dans df_full du snapshot partagé (df : repli sans snapshot)
+    snapshot = current_snapshot()
+    if snapshot is not None:
+        rows = take_rows(snapshot.df_full, snapshot.df_full_index, "ISIN", isin)
+    else:
+        rows = df[df["ISIN"] == isin] if df is not None else pd.DataFrame()
+
+    if rows.empty:
+        st.info("Aucun axe pour ce titre dans le snapshot.")
+        return
+
+    with span("bond_detail.build", rows=len(rows)):
+        infos, dealers, fig = _bond_detail(snapshot.key if snapshot is not None else None, isin, rows)
+
+    st.markdown("#### Infos du titre")
+    st.table(infos)
+
+    st.markdown("#### Dealers axés sur ce titre")
+    st.dataframe(dealers, use_container_width=True)
+
+    st.markdown("#### Fourchette composite et position des dealers")
+    st.plotly_chart(fig, use_container_width=True)
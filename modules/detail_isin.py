@@ -1,23 +1,39 @@
+import os
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
+from utils.row_index import take_rows
+from utils.session import current_snapshot
+from utils.plotting import downsample_points, scatter_trace, sampling_note, POINTS_COLUMN
+from utils.history_store import issuer_history, default_history_dir, HISTORY_METRICS
+from utils.perf import span
+from utils.best_execution import DEFAULT_POLICY
+from utils.spread_curves import SpreadCurves, CURVE_METRICS, TENOR_COLUMN
+from modules import bond_detail
+
+def _spread_curves(df):
+    # Courbes ajustées partagées par le snapshot (une fois par politique de best dealer)
+    snapshot = current_snapshot()
+    if snapshot is None:
+        return SpreadCurves(df)
+    return snapshot.spread_curves(st.session_state.get("best_policy", DEFAULT_POLICY))
 
 def show(df):
     st.button("⬅️ Retour à l'accueil", on_click=lambda: st.session_state.update(page="accueil"))
     st.markdown("<h2 style='text-align:center; color:orange;'>Chercher un Émetteur</h2>", unsafe_allow_html=True)
 
-    df_full = st.session_state.get("df_full_axes", df)
-    emetteurs = sorted(df["IssuerName"].dropna().unique())
-    emetteurs = [""] + emetteurs 
+    # Émetteurs triés une fois par snapshot (index de recherche partagé)
+    snapshot = current_snapshot()
+    emetteurs = snapshot.search_index.issuers if snapshot is not None else sorted(df["IssuerName"].dropna().unique())
+    emetteurs = [""] + emetteurs
 
     selected_issuer = st.selectbox("Rechercher un émetteur", emetteurs, index=0)
 
     if selected_issuer != "":
-        df_issuer = df[df["IssuerName"] == selected_issuer].copy()
-        df_issuer["Maturity"] = pd.to_datetime(df_issuer["Maturity"], errors="coerce")
-        df_issuer["Années avant maturité"] = (df_issuer["Maturity"] - pd.Timestamp.now()).dt.days / 365
+        df_index = snapshot.df_index if snapshot is not None else None
+        df_issuer = take_rows(df, df_index, "IssuerName", selected_issuer)
 
         st.markdown("### Courbe des meilleurs axes de l’émetteur")
         x_axis = st.selectbox("Axe X", ["Années avant maturité", "AXE_Offer_YLD", "AXE_Offer_Price"], key="x1")
@@ -35,24 +51,44 @@ def show(df):
             template="plotly_dark"
         )
         fig1.update_traces(mode='lines+markers+text', marker=dict(size=10), textposition="top center")
-        st.plotly_chart(fig1, use_container_width=True)
+        with span("detail_isin.issuer_chart", rows=len(df_issuer_sorted)):
+            st.plotly_chart(fig1, use_container_width=True)
 
         st.markdown("<p style='text-align:center; font-size:0.9em; color:gray;'>Vous pouvez zoomer sur le graphique et double-cliquer pour réinitialiser la vue.</p>", unsafe_allow_html=True)
 
+        # Historique multi-jours (<data>/history, alimenté par ingest.py --history)
+        if st.checkbox("Afficher l’historique des axes de l’émetteur"):
+            with span("detail_isin.history") as s:
+                history_dir = default_history_dir(os.path.dirname(snapshot.path)) if snapshot is not None else None
+                df_hist = issuer_history(selected_issuer, history_dir)
+                s.rows = len(df_hist)
+            if df_hist.empty:
+                st.info("Aucun historique disponible pour cet émetteur (alimenté par `python ingest.py --history`).")
+            else:
+                hist_metric = st.selectbox("Indicateur", HISTORY_METRICS, key="hist_metric")
+                fig_hist = px.line(
+                    df_hist,
+                    x="Date",
+                    y=hist_metric,
+                    color="ISIN",
+                    markers=True,
+                    hover_data=["Dealer", "Maturity"],
+                    title=f"Historique – {hist_metric}",
+                    template="plotly_dark"
+                )
+                st.plotly_chart(fig_hist, use_container_width=True)
+
         st.markdown("### Comparaison avec le secteur ou sous-secteur")
         compare_by = st.radio("Comparer à :", ["Sub_Sector", "Sector", "Rating_Category"], horizontal=True)
 
         if compare_by == "Rating_Category":
             if "Rating_Category" in df.columns and "Rating_Category" in df_issuer.columns:
-                peer_group = df[df["Rating_Category"] == df_issuer["Rating_Category"].iloc[0]].copy()
+                peer_group = take_rows(df, df_index, "Rating_Category", df_issuer["Rating_Category"].iloc[0])
             else:
                 st.error("La colonne 'Rating_Category' est manquante dans le DataFrame")
                 peer_group = pd.DataFrame()
         else:
-            peer_group = df[df[compare_by] == df_issuer[compare_by].iloc[0]].copy()
-
-        peer_group["Maturity"] = pd.to_datetime(peer_group["Maturity"], errors="coerce")
-        peer_group["Années avant maturité"] = (peer_group["Maturity"] - pd.Timestamp.now()).dt.days / 365
+            peer_group = take_rows(df, df_index, compare_by, df_issuer[compare_by].iloc[0])
 
         last_maturity_issuer = df_issuer["Maturity"].max()
         peer_group = peer_group[peer_group["Maturity"] <= last_maturity_issuer]
@@ -62,7 +98,11 @@ def show(df):
 
         fig2 = go.Figure()
         color_col = "Rating_Category" if compare_by == "Rating_Category" else "Sub_Sector"
-        peer_group_plot = peer_group.dropna(subset=[x_axis2, y_axis2, color_col])
+        peer_group_all = peer_group.dropna(subset=[x_axis2, y_axis2, color_col])
+        # WebGL / un point représentatif par zone pour les grands groupes de pairs
+        peer_group_plot = downsample_points(peer_group_all, x_axis2, y_axis2, color_col)
+        sampled = POINTS_COLUMN in peer_group_plot.columns
+        Trace = scatter_trace(len(peer_group_plot))
 
         for cat in sorted(peer_group_plot[color_col].dropna().unique()):
             data_cat = peer_group_plot[peer_group_plot[color_col] == cat]
@@ -70,10 +110,11 @@ def show(df):
                 data_cat["IssuerName"],
                 data_cat["ISIN"],
                 data_cat["AXE_Offer_YLD"],
-                data_cat["AXE_Offer_Price"]
+                data_cat["AXE_Offer_Price"],
+                data_cat[POINTS_COLUMN] if sampled else np.ones(len(data_cat), dtype=int)
             ], axis=-1)
 
-            fig2.add_trace(go.Scatter(
+            fig2.add_trace(Trace(
                 x=data_cat[x_axis2],
                 y=data_cat[y_axis2],
                 mode='markers',
@@ -84,7 +125,9 @@ def show(df):
                     "Émetteur : %{customdata[0]}<br>" +
                     "ISIN : %{customdata[1]}<br>" +
                     "YLD : %{customdata[2]:.2f}%<br>" +
-                    "Prix : %{customdata[3]:.2f}<extra></extra>"
+                    "Prix : %{customdata[3]:.2f}" +
+                    ("<br>Points représentés : %{customdata[4]}" if sampled else "") +
+                    "<extra></extra>"
                 )
             ))
 
@@ -99,13 +142,40 @@ def show(df):
             name='ISINs de l’émetteur'
         ))
 
+        # Courbe Nelson-Siegel du groupe de pairs (maturité en abscisse, spread ou rendement en ordonnée)
+        fit_note = None
+        if x_axis2 == TENOR_COLUMN and y_axis2 in CURVE_METRICS and st.checkbox("Afficher la courbe ajustée du groupe", value=True):
+            with span("detail_isin.peer_curve"):
+                group_value = df_issuer[compare_by].iloc[0]
+                curves = _spread_curves(df)
+                curve = curves.curve(compare_by, y_axis2, group_value,
+                                     peer_group_all[x_axis2].min(), peer_group_all[x_axis2].max())
+            if curve is not None:
+                fit = curves.fit(compare_by, y_axis2)
+                g = fit.position(group_value)
+                fig2.add_trace(go.Scatter(
+                    x=curve[TENOR_COLUMN],
+                    y=curve[y_axis2],
+                    mode='lines',
+                    line=dict(color='orange', width=3),
+                    name=f"Courbe {group_value}"
+                ))
+                fit_note = f"Courbe Nelson-Siegel de {group_value} : {fit.n[g]} axes, écart type résiduel {fit.rmse[g]:.1f}."
+            else:
+                fit_note = f"Pas assez d'axes pour ajuster une courbe sur {group_value}."
+
         fig2.update_layout(
             title=f"Comparaison avec le {compare_by.lower()}",
             template="plotly_dark",
             showlegend=True
         )
 
-        st.plotly_chart(fig2, use_container_width=True)
+        with span("detail_isin.peer_chart", rows=len(peer_group_plot)):
+            st.plotly_chart(fig2, use_container_width=True)
+        if sampling_note(len(peer_group_plot), len(peer_group_all)):
+            st.caption(sampling_note(len(peer_group_plot), len(peer_group_all)))
+        if fit_note:
+            st.caption(fit_note)
 
         st.markdown(
             "<p style='text-align:center; font-size:0.9em; color:gray;'>Vous pouvez zoomer sur le graphique et double-cliquer pour réinitialiser la vue.</p>",
@@ -114,7 +184,7 @@ def show(df):
 
         st.markdown("### Détail d’un ISIN")
         isin_df = df_issuer[["ISIN", "Maturity"]].dropna().drop_duplicates()
-        isin_df["Maturity"] = pd.to_datetime(isin_df["Maturity"], errors="coerce").dt.date
+        isin_df["Maturity"] = isin_df["Maturity"].dt.date
         isin_df["Label"] = isin_df["ISIN"] + " – " + isin_df["Maturity"].astype(str)
 
         isin_options = [""] + isin_df["Label"].sort_values().tolist()
@@ -125,70 +195,4 @@ def show(df):
             selected_isin = selected_label.split(" – ")[0]
 
         if selected_isin:
-            df_full_all = st.session_state.get("df_full", df)
-            subset = df_full_all[df_full_all["ISIN"] == selected_isin]
-            if not subset.empty:
-                bond = subset.iloc[0]
-                st.markdown("#### Infos du titre")
-                infos = {
-                    "Bond ID": bond.get("Bond ID"),
-                    "Émetteur": bond.get("IssuerName"),
-                    "ISIN": bond.get("ISIN"),
-                    "Maturité": bond.get("Maturity"),
-                    "Devise": bond.get("Currency"),
-                    "Coupon": bond.get("Coupon"),
-                    "CouponType": bond.get("CouponType"),
-                    "Secteur": bond.get("Sector"),
-                    "Notation Moody's": bond.get("Moody's_rating")
-                }
-                st.table(pd.DataFrame.from_dict(infos, orient='index', columns=["Valeur"]))
-
-                st.markdown("#### Dealers axés sur ce titre")
-                dealer_col = "Dealer" if "Dealer" in subset.columns else "Best_Dealer"
-                dealers_data = subset[[
-                    dealer_col, "AXE_Offer_Price", "AXE_Offer_YLD", "AXE_Offer_QTY",
-                    "Composite_Bid_Price", "Composite_Offer_Price", "Axe_Mid_Spread",
-                    "AXE_Offer_BMK_SPD", "AXE_Offer_Z-SPD", "AXE_Offer_I-SPD", "AXE_Offer_ASW"
-                ]].copy()
-                dealers_data.rename(columns={dealer_col: "Dealer"}, inplace=True)
-                st.dataframe(dealers_data, use_container_width=True)
-
-                st.markdown("#### Visualisation fourchette composite")
-                bid = bond.get("Composite_Bid_Price")
-                offer = bond.get("Composite_Offer_Price")
-                mid = bond.get("Mid_Price")
-
-                fig = go.Figure()
-                fig.add_shape(type="line", x0=bid, x1=offer, y0=0, y1=0,
-                              line=dict(color="orange", width=3))
-
-                for val, label in zip([bid, mid, offer], ["Bid", "Mid", "Offer"]):
-                    fig.add_shape(type="line", x0=val, x1=val, y0=-0.2, y1=0.2,
-                                  line=dict(color="orange", width=2))
-                    fig.add_annotation(x=val, y=-0.3, text=label, showarrow=False,
-                                       font=dict(color="orange"), yanchor="top")
-
-                for _, row in subset.iterrows():
-                    fig.add_trace(go.Scatter(
-                        x=[row["AXE_Offer_Price"]],
-                        y=[0],
-                        mode="markers+text",
-                        text=row["Dealer"],
-                        textposition="top center",
-                        marker=dict(size=15)
-                    ))
-
-                fig.update_layout(
-                    height=250,
-                    template="plotly_dark",
-                    showlegend=False,
-                    xaxis_title="Prix",
-                    xaxis=dict(showgrid=False),
-                    yaxis=dict(visible=False)
-                )
-
-                st.plotly_chart(fig, use_container_width=True)
-
-
-
-
+            bond_detail.show(selected_isin, df)
@@ -1,17 +1,32 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from io import BytesIO
 import datetime
-
-def show(df):
-    st.button("⬅️ Retour à l'accueil", on_click=lambda: st.session_state.update(page="accueil"))
-    st.markdown("<h2 style='text-align:center; color:orange;'>Filtrer les Axes Crédit</h2>", unsafe_allow_html=True)
-
-    df = df.copy()
-    df["Maturity"] = pd.to_datetime(df["Maturity"], errors="coerce")
-
+from utils.filter_engine import FilterEngine, spec_key
+from utils.export import EXPORT_FORMATS, export_bytes
+from utils.plotting import scatter, sampling_note
+from utils.best_execution import DEFAULT_POLICY
+from utils.session import current_snapshot
+from modules import bond_detail
+from modules.search_box import select_isin
+from utils.search_index import SearchIndex
+from utils.perf import span
+
+
+def _filter_engine(df):
+    # Moteur partagé par le snapshot (un par politique de best dealer)
+    snapshot = current_snapshot()
+    if snapshot is None:
+        return FilterEngine(df)
+    return snapshot.filter_engine(st.session_state.get("best_policy", DEFAULT_POLICY))
+
+
+@st.cache_data(max_entries=8, show_spinner="Préparation de l'export…")
+def _export_filtered(snapshot_key, policy, filters_key, fmt, _df):
+    # Généré seulement sur demande, une fois par (snapshot, politique, filtres, format)
+    return export_bytes(_df, fmt)
+
+def filter_spec(df):
+    # Widgets de filtrage -> spec du FilterEngine (aussi utilisés par le screener)
     st.markdown("### Filtres")
     col1, col2, col3 = st.columns(3)
 
@@ -96,45 +111,49 @@ def show(df):
     with col5:
         maturity_max = st.date_input("Maturité max", value=safe_max_date, min_value=safe_min_date, max_value=streamlit_max)
 
-    filtered_df = df.copy()
-    filtered_df = filtered_df[filtered_df["Sector"].isin(selected_sectors)]
-    filtered_df = filtered_df[filtered_df["Currency"].isin(selected_currencies)]
-    filtered_df = filtered_df[filtered_df["CouponType"].isin(selected_coupons)]
-    filtered_df = filtered_df[filtered_df["Rating_Category"].isin(selected_ratings)]
-
+    # Tous les filtres dans une spec : un seul masque, résultat mémorisé par spec
+    spec = {
+        "in": {
+            "Sector": selected_sectors,
+            "Currency": selected_currencies,
+            "CouponType": selected_coupons,
+            "Rating_Category": selected_ratings,
+        },
+        "range": {
+            "AXE_Offer_YLD": yld_range,
+            "AXE_Offer_QTY": (qty_min, qty_max),
+            "Nb_Dealers_AXE": nb_dealer_range,
+            "Axe_Mid_Spread": axe_spread_range,
+            "AXE_Offer_BMK_SPD": bmk_spd_range,
+        },
+        # Maturité max au plafond du widget : pas de borne haute
+        "date_range": {
+            "Maturity": (maturity_min, maturity_max if maturity_max < datetime.date(2100, 12, 31) else None)
+        },
+        "flags": {},
+    }
     if issuer_selected:
-        filtered_df = filtered_df[filtered_df["IssuerName"] == issuer_selected]
-
-    filtered_df = filtered_df[
-        (filtered_df["AXE_Offer_YLD"] >= yld_range[0]) & (filtered_df["AXE_Offer_YLD"] <= yld_range[1]) &
-        (filtered_df["AXE_Offer_QTY"] >= qty_min) & (filtered_df["AXE_Offer_QTY"] <= qty_max) &
-        (filtered_df["Nb_Dealers_AXE"] >= nb_dealer_range[0]) & (filtered_df["Nb_Dealers_AXE"] <= nb_dealer_range[1]) &
-        (filtered_df["Axe_Mid_Spread"] >= axe_spread_range[0]) & (filtered_df["Axe_Mid_Spread"] <= axe_spread_range[1]) &
-        (filtered_df["AXE_Offer_BMK_SPD"] >= bmk_spd_range[0]) & (filtered_df["AXE_Offer_BMK_SPD"] <= bmk_spd_range[1])
-    ]
-
-    if maturity_min and maturity_max:
-        maturity_min_dt = pd.to_datetime(maturity_min)
-        maturity_max_dt = pd.to_datetime(maturity_max)
-        filtered_df = filtered_df[
-            (filtered_df["Maturity"] >= maturity_min_dt) &
-            ((filtered_df["Maturity"] <= maturity_max_dt) | (filtered_df["Maturity"] > pd.to_datetime("2100-12-31")))
-        ]
+        spec["in"]["IssuerName"] = [issuer_selected]
+    if exclude_144a:
+        spec["flags"]["Is_144A"] = False
+    if show_scraps:
+        spec["flags"]["Is_Scrap"] = True
+    if filter_composite and tol is not None:
+        spec["composite_tol"] = tol
+    return spec
 
-    if maturity_max < datetime.date(2100, 12, 31):
-        filtered_df = filtered_df[filtered_df["Maturity"] <= pd.to_datetime(maturity_max)]
 
-    if exclude_144a:
-        filtered_df = filtered_df[~filtered_df["Bond ID"].astype(str).str.contains("144A", regex=False)]
+def show(df):
+    st.button("⬅️ Retour à l'accueil", on_click=lambda: st.session_state.update(page="accueil"))
+    st.markdown("<h2 style='text-align:center; color:orange;'>Filtrer les Axes Crédit</h2>", unsafe_allow_html=True)
 
-    if show_scraps:
-        filtered_df = filtered_df[~filtered_df["AXE_Offer_QTY"].astype(str).str.endswith("0")]
+    # Frame canonique partagé : ni copie ni conversion
+    engine = _filter_engine(df)
+    spec = filter_spec(df)
 
-    if filter_composite and tol is not None:
-        filtered_df = filtered_df[
-            (filtered_df["AXE_Offer_Price"] >= filtered_df["Composite_Bid_Price"] - tol) &
-            (filtered_df["AXE_Offer_Price"] <= filtered_df["Composite_Offer_Price"] + tol)
-        ]
+    with span("filter_axes.filter") as s:
+        filtered_df = engine.apply(df, spec)
+        s.rows = len(filtered_df)
 
     st.markdown(f"### Résultats filtrés ({len(filtered_df)} lignes)")
     colonnes_affichees = [
@@ -144,98 +163,62 @@ def show(df):
         "AXE_Offer_BMK_SPD", "AXE_Offer_Z-SPD", "AXE_Offer_I-SPD", "AXE_Offer_ASW",
         "FitchRating", "Moody's_rating", "Rating_Category"
     ]
-    st.dataframe(filtered_df[colonnes_affichees], use_container_width=True)
-
-    buffer = BytesIO()
-    filtered_df[colonnes_affichees].to_excel(buffer, index=False)
-    buffer.seek(0)
-    st.download_button("📅 Exporter en Excel", data=buffer.getvalue(), file_name="axes_filtres.xlsx")
+    with span("filter_axes.table", rows=len(filtered_df)):
+        st.dataframe(filtered_df[colonnes_affichees], use_container_width=True)
+
+    # Export à la demande : rien n'est sérialisé tant que l'utilisateur ne le demande pas
+    export_format = st.radio("Format d'export", list(EXPORT_FORMATS), horizontal=True,
+                             format_func=lambda fmt: EXPORT_FORMATS[fmt]["label"])
+    export_request = (spec_key(spec), export_format)
+    if st.button("📅 Préparer l'export"):
+        st.session_state.export_request = export_request
+
+    if st.session_state.get("export_request") == export_request:
+        snapshot = current_snapshot()
+        data = _export_filtered(
+            snapshot.key if snapshot is not None else None,
+            st.session_state.get("best_policy", DEFAULT_POLICY),
+            export_request[0], export_format, filtered_df[colonnes_affichees]
+        )
+        st.download_button(f"Télécharger ({EXPORT_FORMATS[export_format]['label']})", data=data,
+                           file_name=f"axes_filtres.{export_format}", mime=EXPORT_FORMATS[export_format]["mime"])
 
 
     # CLUSTERING
     st.markdown("### Clustering des résultats filtrés")
-    filtered_df["Années avant maturité"] = (pd.to_datetime(filtered_df["Maturity"]) - pd.Timestamp.now()).dt.days / 365
     with st.expander("Paramétrage du graphique"):
         x_axis = st.selectbox("Axe X", ["Années avant maturité", "AXE_Offer_YLD", "AXE_Offer_Price"])
         y_axis = st.selectbox("Axe Y", ["AXE_Offer_BMK_SPD", "AXE_Offer_Z-SPD", "AXE_Offer_YLD", "AXE_Offer_Price"])
         color_by = st.selectbox("Couleur", ["Sector", "Currency", "Sub_Sector", "Rating_Category"])
 
-    fig = px.scatter(
-        filtered_df.dropna(subset=[x_axis, y_axis]),
-        x=x_axis, y=y_axis, color=color_by,
-        hover_data=["ISIN", "IssuerName", "AXE_Offer_YLD", "AXE_Offer_Price"],
-        height=600
-    )
-    fig.update_traces(marker=dict(size=9, opacity=0.85, line=dict(width=0.5, color="white")))
-    fig.update_layout(template="plotly_dark")
-    st.plotly_chart(fig, use_container_width=True)
+    with span("filter_axes.scatter_figure") as s:
+        # Projection sur les colonnes du graphique avant dropna (pas de copie des ~75 colonnes)
+        plot_columns = list(dict.fromkeys([x_axis, y_axis, color_by, "ISIN", "IssuerName", "AXE_Offer_YLD", "AXE_Offer_Price"]))
+        scatter_df = filtered_df[plot_columns].dropna(subset=[x_axis, y_axis])
+        fig, shown = scatter(
+            scatter_df,
+            x=x_axis, y=y_axis, color=color_by,
+            hover_data=["ISIN", "IssuerName", "AXE_Offer_YLD", "AXE_Offer_Price"],
+            height=600
+        )
+        fig.update_traces(marker=dict(size=9, opacity=0.85, line=dict(width=0.5, color="white")))
+        fig.update_layout(template="plotly_dark")
+        s.rows = shown
+    # Sérialisation Plotly + envoi au navigateur
+    with span("filter_axes.scatter_chart", rows=shown):
+        st.plotly_chart(fig, use_container_width=True)
+    if sampling_note(shown, len(scatter_df)):
+        st.caption(sampling_note(shown, len(scatter_df)))
 
     st.markdown("<p style='text-align:center; font-size:0.9em; color:gray;'>Vous pouvez zoomer sur le graphique et double-cliquer pour réinitialiser la vue.</p>", unsafe_allow_html=True)
 
     # RECHERCHE ISIN
     st.markdown("### Rechercher un ISIN ou un Émetteur")
-    options = filtered_df[["IssuerName", "ISIN"]].dropna().astype(str)
-    options["Label"] = options["IssuerName"] + " – " + options["ISIN"]
-    combo_dict = dict(zip(options["Label"], options["ISIN"]))
-    combo_list = [""] + sorted(combo_dict.keys())
-
-    selected = st.selectbox("Commencez à taper le nom ou l'ISIN :", combo_list)
-
-    if selected:
-        selected_isin = combo_dict[selected]
-        df_full = st.session_state.get("df_full", df)
-        subset = df_full[df_full["ISIN"] == selected_isin]
-
-        if not subset.empty:
-            bond = subset.iloc[0]
-
-            st.markdown("#### Infos du titre")
-            infos = {
-                "Bond ID": bond.get("Bond ID"),
-                "Émetteur": bond.get("IssuerName"),
-                "ISIN": bond.get("ISIN"),
-                "Maturité": bond.get("Maturity"),
-                "Devise": bond.get("Currency"),
-                "Coupon": bond.get("Coupon"),
-                "CouponType": bond.get("CouponType"),
-                "Secteur": bond.get("Sector"),
-                "Notation Moody's": bond.get("Moody's_rating")
-            }
-            st.table(pd.DataFrame.from_dict(infos, orient='index', columns=["Valeur"]))
-
-        st.markdown("#### Dealers axés sur ce titre")
-        dealer_col = "Dealer" if "Dealer" in subset.columns else "Best_Dealer"
-        dealers_data = subset[[dealer_col, "AXE_Offer_Price", "AXE_Offer_YLD", "AXE_Offer_QTY",
-            "Composite_Bid_Price", "Composite_Offer_Price", "Axe_Mid_Spread",
-            "AXE_Offer_BMK_SPD", "AXE_Offer_Z-SPD", "AXE_Offer_I-SPD", "AXE_Offer_ASW"]].copy()
-        dealers_data.rename(columns={dealer_col: "Dealer"}, inplace=True)
-        st.dataframe(dealers_data, use_container_width=True)
-
-        bid = bond.get("Composite_Bid_Price")
-        offer = bond.get("Composite_Offer_Price")
-        mid = bond.get("Mid_Price")
-
-        fig2 = go.Figure()
-        fig2.add_shape(type="line", x0=bid, x1=offer, y0=0, y1=0, line=dict(color="#FFA500", width=3))
-        for val, label in zip([bid, mid, offer], ["Bid", "Mid", "Offer"]):
-            fig2.add_shape(type="line", x0=val, x1=val, y0=-0.2, y1=0.2, line=dict(color="orange", width=2))
-            fig2.add_annotation(x=val, y=-0.3, text=label, showarrow=False, font=dict(color="orange"), yanchor="top")
-
-        for _, row in subset.iterrows():
-            fig2.add_trace(go.Scatter(
-                x=[row["AXE_Offer_Price"]],
-                y=[0],
-                mode="markers+text",
-                text=row[dealer_col],
-                textposition="top center",
-                marker=dict(size=15)
-            ))
-
-        fig2.update_layout(height=250, template="plotly_dark", showlegend=False,
-                           xaxis_title="Prix", xaxis=dict(showgrid=False), yaxis=dict(visible=False))
-        st.plotly_chart(fig2, use_container_width=True)
-
-
-
-
-
+    # Libellés de l'index du snapshot, restreints aux ISINs filtrés
+    snapshot = current_snapshot()
+    with span("filter_axes.search"):
+        search_index = snapshot.search_index if snapshot is not None else SearchIndex(df)
+        selected_isin = select_isin(search_index, isins=filtered_df["ISIN"].dropna().unique())
+
+    if selected_isin:
+        bond_detail.show(selected_isin, df)
@@ -0,0 +1,43 @@
+import os
+import streamlit as st
+from utils.perf import PROFILERS
+
+# Panneau "perf" de la barre latérale : temps par étape du dernier rendu et profilage
+# d'un seul rendu à la demande. Affiché avec ?perf=1 dans l'URL ou AXES_PERF_PANEL=1.
+
+PANEL_ENABLED = os.environ.get("AXES_PERF_PANEL", "") not in ("", "0")
+
+
+def enabled():
+    if PANEL_ENABLED or st.query_params.get("perf") == "1":
+        st.session_state.perf_panel = True
+    return st.session_state.get("perf_panel", False)
+
+
+def profile_request():
+    # Profileur demandé pour ce rendu (une seule fois), sinon None
+    return st.session_state.pop("perf_profile", None)
+
+
+def show(run):
+    if not enabled():
+        return
+    if run.profile is not None:
+        st.session_state.perf_profile_result = run.profile
+
+    with st.sidebar:
+        st.markdown("### ⏱️ Performance")
+        st.caption(f"Page {run.page} : {run.total_ms:.0f} ms (hors panneau) – rendu {run.id}")
+        st.dataframe(run.table(), use_container_width=True, hide_index=True)
+        st.caption("Δ mémoire : mémoire résidente du process, partagée par toutes les sessions.")
+
+        kind = st.selectbox("Profileur", PROFILERS, key="perf_profiler")
+        if st.button("Profiler le prochain rendu"):
+            st.session_state.perf_profile = kind
+            st.rerun()
+
+        profile = st.session_state.get("perf_profile_result")
+        if profile is not None:
+            with st.expander(f"Dernier profil ({profile['kind']})"):
+                st.code(profile["text"], language=None)
+            st.download_button("Télécharger le profil", data=profile["data"], file_name=profile["file_name"])
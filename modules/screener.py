@@ -0,0 +1,87 @@
+import streamlit as st
+import pandas as pd
+from utils.filter_engine import FilterEngine
+from utils.relative_value import relative_value, RV_METRICS, PEER_KEYS, MIN_PEERS
+from utils.best_execution import DEFAULT_POLICY
+from utils.session import current_snapshot
+from utils.perf import span
+from modules import bond_detail
+from modules.filter_axes import filter_spec
+
+METRIC_LABELS = {"AXE_Offer_BMK_SPD": "BMK spread", "AXE_Offer_Z-SPD": "Z-spread"}
+SORT_COLUMNS = {"Z-score": "z", "Écart aux pairs (bp)": "resid"}
+SCREEN_COLUMNS = [
+    "IssuerName", "ISIN", "Sector", "Rating_Category", "MaturityBucket", "Currency", "Maturity",
+    "AXE_Offer_Price", "AXE_Offer_YLD", "AXE_Offer_QTY", "Best_Dealer"
+]
+
+
+def _screener_frames(df):
+    # Moteur de filtres et valeur relative partagés par le snapshot (une fois par politique)
+    snapshot = current_snapshot()
+    if snapshot is None:
+        return FilterEngine(df), relative_value(df)
+    policy = st.session_state.get("best_policy", DEFAULT_POLICY)
+    return snapshot.filter_engine(policy), snapshot.relative_value(policy)
+
+
+def show(df):
+    st.button("⬅️ Retour à l'accueil", on_click=lambda: st.session_state.update(page="accueil"))
+    st.markdown("<h2 style='text-align:center; color:orange;'>Valeur relative</h2>", unsafe_allow_html=True)
+    st.markdown(
+        f"Écart de chaque axe à la médiane de ses pairs ({' / '.join(PEER_KEYS)}), "
+        f"z-score robuste et rang dans le panier (1 = le plus large). Paniers de moins de {MIN_PEERS} axes : pas de z-score."
+    )
+
+    with span("screener.prepare", rows=len(df)):
+        engine, rv = _screener_frames(df)
+
+    with st.expander("Filtres"):
+        spec = filter_spec(df)
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        metric = st.selectbox("Spread", RV_METRICS, format_func=METRIC_LABELS.get)
+    with col2:
+        sort_by = st.selectbox("Trier par", list(SORT_COLUMNS))
+    with col3:
+        cheap_first = st.radio("Ordre", ["Les moins chers", "Les plus chers"], horizontal=True) == "Les moins chers"
+    with col4:
+        top_n = st.number_input("Nombre de lignes", min_value=10, max_value=5000, value=100, step=10)
+
+    with span("screener.screen") as s:
+        positions = engine.positions(spec)
+        scores = rv.iloc[positions]
+        sort_col = f"{metric}__{SORT_COLUMNS[sort_by]}"
+        ranked = scores[sort_col].dropna()
+        # Sélection partielle des N premiers plutôt qu'un tri complet
+        top = ranked.nlargest(top_n) if cheap_first else ranked.nsmallest(top_n)
+        screen = df.loc[top.index, [col for col in SCREEN_COLUMNS if col in df.columns]]
+        screen = screen.assign(**{
+            METRIC_LABELS[metric]: df.loc[top.index, metric],
+            "Médiane des pairs": scores.loc[top.index, f"{metric}__peer_median"],
+            "Écart (bp)": scores.loc[top.index, f"{metric}__resid"],
+            "Z-score": scores.loc[top.index, f"{metric}__z"],
+            "Rang": scores.loc[top.index, f"{metric}__rank"],
+            "Pairs": scores.loc[top.index, f"{metric}__peers"],
+        })
+        s.rows = len(positions)
+
+    st.markdown(f"### {len(screen)} axes sur {len(ranked)} notés ({len(positions)} après filtres)")
+    with span("screener.table", rows=len(screen)):
+        st.dataframe(
+            screen, use_container_width=True, hide_index=True,
+            column_config={
+                "Maturity": st.column_config.DateColumn("Maturity", format="YYYY-MM-DD"),
+                "Médiane des pairs": st.column_config.NumberColumn(format="%.1f"),
+                "Écart (bp)": st.column_config.NumberColumn(format="%.1f"),
+                "Z-score": st.column_config.NumberColumn(format="%.2f"),
+            }
+        )
+
+    # Détail d'un titre de la sélection
+    st.markdown("### Détail d'un ISIN")
+    isins = [""] + pd.unique(screen["ISIN"].astype(str)).tolist()
+    selected_isin = st.selectbox("Sélectionner un ISIN", isins, index=0)
+    if selected_isin:
+        bond_detail.show(selected_isin, df)
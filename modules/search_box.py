@@ -0,0 +1,17 @@
+import streamlit as st
+
+# Recherche d'un titre commune aux pages : liste déroulante des libellés "Émetteur – ISIN"
+# de l'index du snapshot, restreinte par un champ de recherche (préfixe, sous-chaîne, approchée).
+
+
+def select_isin(index, label="Commencez à taper le nom ou l'ISIN :", isins=None):
+    # isins : limite les choix à un sous-ensemble (ex. résultat filtré) ; renvoie l'ISIN choisi ou None
+    query = st.text_input("Recherche (émetteur, ticker, ISIN, Bond ID)", key=f"query_{label}")
+    options = index.labels if isins is None else index.labels_for(isins)
+    if query:
+        options = index.search(query, isins=isins)
+        if not options:
+            st.caption("Aucun titre ne correspond à la recherche.")
+
+    selected = st.selectbox(label, [""] + options)
+    return index.isin(selected) if selected else None
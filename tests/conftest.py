@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests lancés depuis n'importe quel dossier : racine du dépôt dans le path (pas de package installé)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
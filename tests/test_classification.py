@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+from utils.classification import classify_sector, classify_rating_category, rating_score, NOTCH_LADDER
+from utils.pipeline import classify_rating_cat
+
+# Versions vectorisées comparées aux résultats des apply() ligne à ligne historiques
+# d'accueil.show(), relevés une fois et figés ici (tables attendues littérales)
+
+# (sous-secteur du classeur, Sector attendu) : "IG ..." -> IG FIN / IG CORPO, sinon premier mot
+SECTOR_CASES = [
+    ("IG - CoCo", "IG FIN"),
+    ("IG - Lower T2", "IG FIN"),
+    ("IG - Lower Tier 2 Ins", "IG FIN"),
+    ("IG - SnBnk/Fin", "IG FIN"),
+    ("IG - Upper T2/T1", "IG FIN"),
+    ("IG - Ind", "IG CORPO"),
+    ("IG - Util", "IG CORPO"),
+    ("HY - HY", "HY"),
+    ("HY-Telecom", "HY"),
+    ("CEEMEA - Fin", "CEEMEA"),
+    ("Asia - Corp", "Asia"),
+    ("COVRD - FR", "COVRD"),
+    ("LatAm - Sovereign", "LatAm"),
+    ("SAS - Supra", "SAS"),
+    ("IG - CoCo", "IG FIN"),
+]
+
+# (Fitch, Moody's, Rating_Category attendue) : Fitch si renseignée (même "" ou "WR"), sinon Moody's
+RATING_CASES = [
+    ("AAA", "Aa1", "Investment Grade"),
+    ("bbb+", "Baa1", "Crossover"),
+    (" BB- ", np.nan, "Crossover"),
+    (np.nan, "Baa2", "Not Rated"),
+    ("nan", "Ba2", "Not Rated"),
+    (np.nan, "Caa1", "Not Rated"),
+    (np.nan, "A2", "Investment Grade"),
+    (np.nan, "B3", "High Yield"),
+    (np.nan, "C", "Junk"),
+    ("CCC", np.nan, "Junk"),
+    ("WR", "A1", "Not Rated"),
+    ("", "Baa3", "Not Rated"),
+    (np.nan, np.nan, "Not Rated"),
+    ("B", np.nan, "High Yield"),
+    ("NR", "Ca", "Not Rated"),
+    ("A-", "Baa1", "Investment Grade"),
+]
+
+
+def test_classify_sector_matches_legacy():
+    sub_sector = pd.Series([case[0] for case in SECTOR_CASES])
+    result = classify_sector(sub_sector)
+    assert result.tolist() == [case[1] for case in SECTOR_CASES]
+
+
+def test_classify_sector_keeps_missing():
+    result = classify_sector(pd.Series(["IG - Ind", np.nan, "HY - HY"], dtype=object))
+    assert result.iloc[0] == "IG CORPO" and pd.isna(result.iloc[1]) and result.iloc[2] == "HY"
+
+
+def test_classify_rating_category_matches_legacy():
+    fitch = pd.Series([case[0] for case in RATING_CASES], dtype=object)
+    moodys = pd.Series([case[1] for case in RATING_CASES], dtype=object)
+    expected = [case[2] for case in RATING_CASES]
+    assert classify_rating_category(fitch, moodys).tolist() == expected
+    # Version scalaire conservée dans le pipeline : même règle
+    assert [classify_rating_cat(f, m) for f, m, _ in RATING_CASES] == expected
+
+
+def test_moodys_only_ratings_keep_legacy_category():
+    # Comportement historique conservé : la notation est comparée en majuscules, donc les
+    # notations Moody's seules en Baa / Ba / Caa (comme Aa et Ca) ne sont pas reconnues -> Not Rated ;
+    # seules A1-A3, B1-B3 et C restent classées
+    moodys = pd.Series(["Baa1", "Baa3", "Ba1", "Ba3", "Caa2", "Aa2", "A3", "B1", "Ca", "C"])
+    fitch = pd.Series([np.nan] * len(moodys), dtype=object)
+    result = classify_rating_category(fitch, moodys)
+    assert result.tolist() == [
+        "Not Rated", "Not Rated", "Not Rated", "Not Rated", "Not Rated", "Not Rated",
+        "Investment Grade", "High Yield", "Not Rated", "Junk",
+    ]
+
+
+def test_rating_category_without_columns():
+    index = pd.RangeIndex(3)
+    result = classify_rating_category(None, pd.Series(["A1", np.nan, "B2"], index=index), index=index)
+    assert result.tolist() == ["Investment Grade", "Not Rated", "High Yield"]
+
+
+def test_rating_score_notch_ladder():
+    # Échelle commune : 1 = AAA / Aaa ... 21 = C, 22 = D (Fitch seulement)
+    fitch = pd.Series([f for f, _ in NOTCH_LADDER])
+    assert rating_score(fitch, None).tolist() == list(range(1, 23))
+    moodys = pd.Series([m for _, m in NOTCH_LADDER if m])
+    assert rating_score(None, moodys).tolist() == list(range(1, 22))
+    # Même notch pour les deux agences à chaque échelon
+    for fitch_rating, moodys_rating in NOTCH_LADDER[:-1]:
+        assert (rating_score(pd.Series([fitch_rating]), None).iloc[0]
+                == rating_score(None, pd.Series([moodys_rating])).iloc[0])
+
+
+def test_rating_score_fallback_and_markers():
+    fitch = pd.Series(["BBB+", np.nan, "RD", "WR", np.nan, "BBB+ *-", np.nan, np.nan])
+    moodys = pd.Series(["Ba1", "Baa1", np.nan, "A2u", "(P)Baa1", np.nan, "NR", np.nan])
+    result = rating_score(fitch, moodys)
+    # Fitch prioritaire si reconnue, sinon Moody's ; marqueurs (P), *-, u ignorés
+    assert result.tolist()[:6] == [8, 8, 22, 6, 8, 8]
+    assert result.iloc[6:].isna().all()
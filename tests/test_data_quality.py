@@ -0,0 +1,69 @@
+import datetime
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+from utils.data_loader import AXES_SHEETS, read_axes_workbook
+from utils.data_quality import QUALITY_RULES, validate_axes, quarantine_table
+from utils.snapshot_store import validate_frame
+
+HEADER = ["ISIN", "IssuerName", "Dealer", "Maturity", "IA_Offer_Price", "IA_Offer_YLD", "IA_Offer_QTY",
+          "Stream_Offer_Price", "TW_Bid_Price", "TW_Offer_Price"]
+ROWS = [
+    ["XS0000000001", "ALPHA", "BNPP", datetime.datetime(2030, 1, 15), 101.0, 0.035, 1000, 100.5, 100.0, 101.5],
+    ["XS0000000001", "ALPHA", "BNPP", datetime.datetime(2030, 1, 15), 101.0, 0.035, 1000, 100.5, 100.0, 101.5],
+    # Prix et rendement inversés (prix loin du prix Stream)
+    ["XS0000000002", "BETA", "JPM", datetime.datetime(2028, 6, 1), 4.2, 0.99, 500, 99.0, 98.0, 99.5],
+    # Sans prix : écartée dès la lecture
+    ["XS0000000003", "GAMMA", "GS", datetime.datetime(2029, 3, 1), None, 0.04, 200, 98.0, 97.0, 98.5],
+    # Quantité nulle, composite bid > offer, maturité échue
+    ["XS0000000004", "DELTA", "MS", datetime.datetime(2020, 1, 1), 99.0, 0.05, 0, 99.2, 100.0, 99.0],
+]
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    wb = Workbook()
+    wb.remove(wb.active)
+    for i, sheet in enumerate(AXES_SHEETS):
+        ws = wb.create_sheet(sheet)
+        ws.append(HEADER)
+        for row in ROWS if i == 0 else ROWS[3:4]:
+            ws.append(row)
+        # Lignes vides en fin de feuille : ni lues ni comptées
+        ws.append([None] * len(HEADER))
+    path = tmp_path / "Axes_20250619.xlsx"
+    wb.save(path)
+    return str(path)
+
+
+def test_rows_without_price_are_counted(workbook):
+    df_raw = read_axes_workbook(workbook, use_cache=False)
+    assert len(df_raw) == 4
+    assert df_raw.attrs["skipped_rows"] == 2
+
+    quality = validate_frame(df_raw, datetime.date(2025, 6, 19))
+    assert quality["rows"] == 6
+    counts = quality["counts"]
+    assert counts["prix_absent"] == 2
+    assert counts["inversion_prix_rendement"] == 1
+    assert counts["doublon_isin_dealer"] == 2
+    assert counts["quantite_invalide"] == 1
+    assert counts["composite_bid_sup_offer"] == 1
+    assert counts["maturite_echue"] == 1
+    # Les lignes sans prix ne sont pas en quarantaine (jamais chargées)
+    assert quality["quarantine"]["ISIN"].tolist() == ["XS0000000001", "XS0000000001", "XS0000000002", "XS0000000004"]
+
+
+def test_quarantine_lists_triggered_rules():
+    df = pd.DataFrame({
+        "ISIN": ["A", "B", "C"], "Dealer": ["X", "X", "X"], "Maturity": ["2030-01-01", None, "2031-01-01"],
+        "IA_Offer_Price": [100.0, np.nan, 100.0], "IA_Offer_YLD": [0.03, 0.03, 0.03], "IA_Offer_QTY": [10, 10, 10],
+        "Stream_Offer_Price": [100.0, 100.0, 100.0], "TW_Bid_Price": [99.0, 99.0, 99.0], "TW_Offer_Price": [101.0, 101.0, 101.0],
+    })
+    bits, counts = validate_axes(df, as_of="2025-06-19")
+    assert list(counts) == list(QUALITY_RULES)
+    assert bits[0] == 0
+    table = quarantine_table(df, bits)
+    assert table["Ligne"].tolist() == [1]
+    assert table["Règles"].iloc[0] == "prix_absent, maturite_absente"
@@ -0,0 +1,41 @@
+import io
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+from utils.export import export_bytes
+
+
+@pytest.fixture
+def axes():
+    return pd.DataFrame({
+        # Colonnes texte en dtype object (comportement pandas 2), dont une vide sur la 1re tranche
+        "ISIN": pd.Series(["XS0000000001", "FR0000000002", None, "DE0000000003", "XS0000000004"], dtype=object),
+        "Ticker": pd.Series([None, None, None, "ABC", "DEF"], dtype=object),
+        "Sector": pd.Categorical(["IG CORPO", "HY", "IG FIN", "HY", None]),
+        "AXE_Offer_YLD": [3.5, np.nan, 4.25, 6.0, 2.0],
+        "Maturity": pd.to_datetime(["2030-01-15", None, "2027-06-30", "2045-12-01", "2029-03-01"]),
+    })
+
+
+@pytest.mark.parametrize("chunk_rows", [2, 50_000])
+def test_parquet_export_object_strings(axes, chunk_rows):
+    data = export_bytes(axes, "parquet", chunk_rows=chunk_rows)
+    table = pq.read_table(io.BytesIO(data))
+    assert table.num_rows == len(axes)
+    assert table.column("ISIN").to_pylist() == axes["ISIN"].tolist()
+    assert table.column("Ticker").to_pylist() == axes["Ticker"].tolist()
+    out = table.to_pandas()
+    assert out["Sector"].astype(object).where(out["Sector"].notna(), None).tolist() == ["IG CORPO", "HY", "IG FIN", "HY", None]
+    np.testing.assert_array_equal(out["AXE_Offer_YLD"].to_numpy(), axes["AXE_Offer_YLD"].to_numpy())
+
+
+def test_parquet_export_empty(axes):
+    table = pq.read_table(io.BytesIO(export_bytes(axes.iloc[:0], "parquet")))
+    assert table.num_rows == 0
+    assert table.column_names == list(axes.columns)
+
+
+def test_csv_export_chunked(axes):
+    data = export_bytes(axes, "csv", chunk_rows=2).decode("utf-8")
+    assert data == axes.to_csv(index=False)
@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.filter_engine import FilterEngine
+
+# Moteur (masques factorisés et mémorisés) comparé aux filtres booléens chaînés historiques
+
+
+@pytest.fixture(scope="module")
+def axes():
+    rng = np.random.default_rng(0)
+    n = 3000
+
+    def with_nan(values, share=0.05):
+        values = pd.Series(values)
+        return values.mask(rng.random(n) < share)
+
+    maturity = pd.Series(pd.to_datetime("2025-06-19") + pd.to_timedelta(rng.integers(0, 40 * 365, n), unit="D"))
+    # Perpétuelles (an 3000+) et maturités manquantes
+    maturity[rng.random(n) < 0.02] = pd.Timestamp("3025-01-01")
+    df = pd.DataFrame({
+        "Sector": pd.Categorical(with_nan(rng.choice(["IG CORPO", "IG FIN", "HY", "EM", "Asia"], n))),
+        "Currency": pd.Categorical(rng.choice(["EUR", "USD", "GBP"], n)),
+        "CouponType": pd.Categorical(with_nan(rng.choice(["FIXED", "FLOATING", "ZERO"], n))),
+        "Rating_Category": pd.Categorical(rng.choice(["Investment Grade", "Crossover", "High Yield", "Junk", "Not Rated"], n)),
+        "IssuerName": pd.Categorical(rng.choice([f"ISSUER {i}" for i in range(40)], n)),
+        "AXE_Offer_YLD": with_nan(rng.normal(4, 2, n).round(2)).astype("float32"),
+        "AXE_Offer_QTY": with_nan(rng.choice([0, 5, 100, 250, 1000, 2000, 10000], n)),
+        "Nb_Dealers_AXE": rng.integers(1, 12, n).astype("int8"),
+        "Axe_Mid_Spread": with_nan(rng.normal(0.5, 0.8, n).round(2)).astype("float32"),
+        "AXE_Offer_BMK_SPD": with_nan(rng.normal(150, 120, n).round()).astype("float32"),
+        "Maturity": with_nan(maturity, 0.03).astype("datetime64[s]"),
+        "Is_144A": rng.random(n) < 0.1,
+        "Is_Scrap": rng.random(n) < 0.1,
+        "AXE_Offer_Price": with_nan(rng.normal(100, 5, n).round(3)),
+    })
+    mid = df["AXE_Offer_Price"] + rng.normal(0, 0.5, n)
+    df["Composite_Bid_Price"] = with_nan(mid - 0.25)
+    df["Composite_Offer_Price"] = with_nan(mid + 0.25)
+    return df
+
+
+def random_spec(df, rng):
+    spec = {}
+    spec["in"] = {
+        col: rng.choice(df[col].dropna().unique(), rng.integers(1, 4), replace=False).tolist()
+        for col in ["Sector", "Currency", "CouponType", "Rating_Category", "IssuerName"] if rng.random() < 0.3
+    }
+    spec["range"] = {}
+    for col in ["AXE_Offer_YLD", "AXE_Offer_QTY", "Nb_Dealers_AXE", "Axe_Mid_Spread", "AXE_Offer_BMK_SPD"]:
+        if rng.random() < 0.3:
+            lo, hi = np.sort(rng.choice(df[col].dropna().to_numpy(dtype=float), 2))
+            spec["range"][col] = (None if rng.random() < 0.2 else float(lo), None if rng.random() < 0.2 else float(hi))
+    if rng.random() < 0.3:
+        lo, hi = np.sort(rng.choice(df["Maturity"].dropna().to_numpy(), 2))
+        spec["date_range"] = {"Maturity": (pd.Timestamp(lo).date(), None if rng.random() < 0.3 else pd.Timestamp(hi).date())}
+    spec["flags"] = {col: bool(rng.random() < 0.5) for col in ["Is_144A", "Is_Scrap"] if rng.random() < 0.3}
+    if rng.random() < 0.3:
+        spec["composite_tol"] = float(rng.choice([0.0, 0.05, 0.5]))
+    return spec
+
+
+def reference(df, spec):
+    # Filtres successifs sur le DataFrame, comme la page avant le moteur
+    out = df
+    for col, values in spec.get("in", {}).items():
+        out = out[out[col].isin(values)]
+    for kind in ["range", "date_range"]:
+        for col, (lo, hi) in spec.get(kind, {}).items():
+            lo = pd.Timestamp(lo) if kind == "date_range" and lo is not None else lo
+            hi = pd.Timestamp(hi) if kind == "date_range" and hi is not None else hi
+            out = out[out[col].notna()]
+            if lo is not None:
+                out = out[out[col] >= lo]
+            if hi is not None:
+                out = out[out[col] <= hi]
+    for col, value in spec.get("flags", {}).items():
+        out = out[out[col] == value]
+    tol = spec.get("composite_tol")
+    if tol is not None:
+        out = out[(out["AXE_Offer_Price"] >= out["Composite_Bid_Price"] - tol) &
+                  (out["AXE_Offer_Price"] <= out["Composite_Offer_Price"] + tol)]
+    return out
+
+
+def test_random_specs_match_chained_filters(axes):
+    engine = FilterEngine(axes)
+    rng = np.random.default_rng(1)
+    specs = [random_spec(axes, rng) for _ in range(300)]
+    # Deux passes : masques calculés, puis relus dans les caches
+    for _ in range(2):
+        for spec in specs:
+            expected = reference(axes, spec)
+            assert engine.apply(axes, spec).index.equals(expected.index), spec
+
+
+def test_clear_recomputes(axes):
+    engine = FilterEngine(axes, cache_size=4)
+    spec = {"in": {"Currency": ["EUR"]}, "range": {"AXE_Offer_YLD": (3.0, 6.0)}}
+    first = engine.positions(spec)
+    engine.clear()
+    np.testing.assert_array_equal(engine.positions(spec), first)
+    np.testing.assert_array_equal(first, np.flatnonzero(axes.index.isin(reference(axes, spec).index)))
+
+
+def test_empty_spec_keeps_all_rows(axes):
+    assert len(FilterEngine(axes).apply(axes, {})) == len(axes)
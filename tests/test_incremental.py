@@ -0,0 +1,71 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from utils.data_loader import read_axes_workbook, axes_file_date
+from utils.pipeline import build_axes_frames
+from utils.incremental import row_hashes, incremental_axes_frames
+
+# Rafraîchissement incrémental comparé à une reconstruction complète du classeur modifié
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "Axes_20250619.xlsx")
+
+
+def assert_same_frame(result, expected):
+    # equals (rapide) + catégories dans le même ordre ; assert_frame_equal (lent) pour le détail d'un écart
+    same = result.equals(expected) and list(result.columns) == list(expected.columns) and all(
+        not isinstance(dtype, pd.CategoricalDtype) or result[col].cat.categories.equals(expected[col].cat.categories)
+        for col, dtype in expected.dtypes.items()
+    ) and (result.dtypes == expected.dtypes).all()
+    if not same:
+        pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.fixture(scope="module")
+def previous():
+    if not os.path.exists(SAMPLE):
+        pytest.skip("classeur d'exemple absent")
+    raw = read_axes_workbook(SAMPLE, use_cache=False)
+    as_of = axes_file_date(SAMPLE)
+    df_full, df = build_axes_frames(raw, as_of=as_of)
+    return raw, row_hashes(raw), df_full, df, as_of
+
+
+def _redelivered(raw, seed):
+    # Prix modifiés, lignes retirées, lignes en double, nouveau dealer sur des ISINs existants
+    rng = np.random.default_rng(seed)
+    raw = raw.copy()
+    edited = rng.choice(len(raw), 300, replace=False)
+    raw.loc[edited, "IA_Offer_Price"] = raw.loc[edited, "IA_Offer_Price"] * rng.uniform(0.98, 1.02, len(edited))
+    dropped = rng.choice(len(raw), 80, replace=False)
+    duplicated = raw.iloc[rng.choice(len(raw), 20, replace=False)]
+    new_dealer = raw.iloc[rng.choice(len(raw), 15, replace=False)].assign(Dealer="NEWDEALER")
+    # Nouveau dealer au rendement minimal : rarement retenu comme meilleur
+    worse = raw.iloc[rng.choice(len(raw), 5, replace=False)].assign(Dealer="WORSEDEALER", IA_Offer_YLD=0.0001)
+    # Ligne sans ISIN
+    no_isin = raw.iloc[:1].assign(ISIN=None, Dealer="NOISIN")
+    return pd.concat([raw.drop(index=dropped), duplicated, new_dealer, worse, no_isin], ignore_index=True)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_incremental_matches_full_rebuild(previous, seed):
+    raw, hashes, previous_full, previous_df, as_of = previous
+    raw2 = _redelivered(raw, seed)
+    expected_full, expected_df = build_axes_frames(raw2, as_of=as_of)
+
+    df_full, df, reprocessed = incremental_axes_frames(raw2, row_hashes(raw2), previous_full, previous_df, hashes, as_of=as_of)
+    assert 0 < reprocessed < len(raw2)
+    assert_same_frame(df_full, expected_full)
+    assert_same_frame(df, expected_df)
+    # Catégories = valeurs présentes (pas de dealer des seules lignes non retenues)
+    assert set(df["Best_Dealer"].cat.categories) == set(df["Best_Dealer"].dropna())
+    assert "WORSEDEALER" in df_full["Dealer"].cat.categories
+
+
+def test_unchanged_workbook_reuses_everything(previous):
+    raw, hashes, previous_full, previous_df, as_of = previous
+    df_full, df, reprocessed = incremental_axes_frames(raw, hashes, previous_full, previous_df, hashes, as_of=as_of)
+    # Seules les lignes en double (même hash) repassent par le nettoyage
+    assert reprocessed == pd.Index(hashes).duplicated().sum()
+    assert_same_frame(df_full, previous_full)
+    assert_same_frame(df, previous_df)
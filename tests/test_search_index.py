@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.search_index import SearchIndex
+
+
+@pytest.fixture
+def bonds():
+    return pd.DataFrame({
+        "IssuerName": pd.Categorical(["BANK OF NOWHERE", "NANTES METROPOLE", "ACME CORP", "ACME CORP", "BANK OF SOMEWHERE"]),
+        "Ticker": pd.Categorical(["BNOW", np.nan, "ACME", "ACME", np.nan]),
+        "ISIN": ["XS0000000001", "FR0000000002", "US0000000003", "US0000000004", "XS0000000005"],
+        "Bond ID": [np.nan, "NANTES 1 01/30", "ACME 5 06/28 144A", np.nan, np.nan],
+    })
+
+
+def test_missing_fields_are_not_indexed_as_nan(bonds):
+    index = SearchIndex(bonds)
+    # "nan" ne trouve que NANTES (préfixe émetteur / Bond ID), pas les tickers ou Bond ID manquants
+    assert index.search("nan") == ["NANTES METROPOLE – FR0000000002"]
+    assert index.search("acme 5") == ["ACME CORP – US0000000003"]
+
+
+def test_search_restricted_before_limit(bonds):
+    index = SearchIndex(bonds)
+    allowed = ["XS0000000005"]
+    # Sans restriction, la limite ne garderait que le premier "bank"
+    assert index.search("bank", limit=1) == ["BANK OF NOWHERE – XS0000000001"]
+    assert index.search("bank", limit=1, isins=allowed) == ["BANK OF SOMEWHERE – XS0000000005"]
+    assert index.search("", isins=allowed) == ["BANK OF SOMEWHERE – XS0000000005"]
+    assert index.labels_for(allowed) == ["BANK OF SOMEWHERE – XS0000000005"]
+
+
+def test_fuzzy_match_on_issuer(bonds):
+    assert SearchIndex(bonds).search("acmr") == ["ACME CORP – US0000000003", "ACME CORP – US0000000004"]
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+# Sélection du meilleur dealer par ISIN, pour toutes les politiques en une passe de tri chacune.
+# Pour ajouter une politique : une entrée (libellé, score, sens) dans BEST_POLICIES.
+
+BEST_POLICIES = {
+    "yield": {"label": "Meilleur rendement", "score": "AXE_Offer_YLD", "ascending": False},
+    "price": {"label": "Meilleur prix", "score": "AXE_Offer_Price", "ascending": True},
+    "size": {"label": "Plus grosse taille", "score": "AXE_Offer_QTY", "ascending": False},
+    "mid": {"label": "Plus proche du mid", "score": lambda df: df["Axe_Mid_Spread"].abs(), "ascending": True},
+}
+
+DEFAULT_POLICY = "yield"
+
+# Colonnes propres au dealer retenu, recopiées pour chaque politique ("<col>__<politique>")
+POLICY_COLUMNS = [
+    "Dealer", "AXE_Offer_Price", "AXE_Offer_YLD", "AXE_Offer_QTY", "Axe_Mid_Spread",
+    "AXE_Offer_BMK_SPD", "AXE_Offer_Z-SPD", "AXE_Offer_I-SPD", "AXE_Offer_ASW", "Is_Scrap"
+]
+
+
+def policy_column(col, policy):
+    return f"{col}__{policy}"
+
+
+def runner_up_column(policy):
+    return f"Runner_Up_Dealer__{policy}"
+
+
+def _policy_score(df, policy):
+    score = policy["score"]
+    values = score(df) if callable(score) else df[score]
+    values = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float, copy=True)
+    if not policy["ascending"]:
+        values = -values
+    # Sans valeur : toujours classé en dernier
+    values[np.isnan(values)] = np.inf
+    return values
+
+
+def rank_dealers(codes, score):
+    # Tri (ISIN, score, position d'origine) : le premier de chaque groupe est le meilleur,
+    # les ex aequo gardent l'ordre du fichier (comme idxmax)
+    positions = np.arange(len(codes))
+    order = np.lexsort((positions, score, codes))
+    order = order[codes[order] >= 0]
+    sorted_codes = codes[order]
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+    ends = np.r_[starts[1:], len(order)]
+
+    best = order[starts]
+    runner_up = np.full(len(starts), -1)
+    has_second = starts + 1 < ends
+    runner_up[has_second] = order[starts[has_second] + 1]
+    return best, runner_up
+
+
+def best_execution(df, policies=None):
+    # -> (ISINs triés, nb de dealers par ISIN, {politique: (positions best, positions 2e)})
+    policies = BEST_POLICIES if policies is None else policies
+    codes, isins = pd.factorize(df["ISIN"], sort=True)
+    valid = codes >= 0
+    has_dealer = df["Dealer"].notna().to_numpy()
+    nb_dealers = np.bincount(codes[valid], weights=has_dealer[valid], minlength=len(isins)).astype("int64")
+
+    picks = {name: rank_dealers(codes, _policy_score(df, policy)) for name, policy in policies.items()}
+    return isins, nb_dealers, picks
+
+
+def _take(values, positions):
+    out = pd.Series(values).to_numpy()[np.maximum(positions, 0)]
+    if (positions < 0).any():
+        out = out.astype(object)
+        out[positions < 0] = np.nan
+    return out
+
+
+def select_best(df, policy=DEFAULT_POLICY, policies=None):
+    # Une ligne par ISIN (celle du dealer retenu par `policy`) + colonnes de toutes les politiques
+    policies = BEST_POLICIES if policies is None else policies
+    _, nb_dealers, picks = best_execution(df, policies)
+
+    best = df.iloc[picks[policy][0]].copy()
+    best["Nb_Dealers_AXE"] = nb_dealers
+
+    for name, (first, second) in picks.items():
+        for col in POLICY_COLUMNS:
+            if col in df.columns:
+                best[policy_column(col, name)] = _take(df[col], first)
+        best[runner_up_column(name)] = _take(df["Dealer"], second)
+    return best
+
+
+def apply_best_policy(df, policy):
+    # Bascule les colonnes "meilleur dealer" sur une autre politique, sans repasser par df_full
+    policy = policy if policy in BEST_POLICIES else DEFAULT_POLICY
+    swapped = {"Runner_Up_Dealer": df[runner_up_column(policy)]}
+    if policy != DEFAULT_POLICY:
+        for col in POLICY_COLUMNS:
+            if policy_column(col, policy) in df.columns:
+                swapped["Best_Dealer" if col == "Dealer" else col] = df[policy_column(col, policy)]
+    return df.assign(**swapped)
@@ -0,0 +1,124 @@
+import re
+import numpy as np
+import pandas as pd
+
+# Classification secteur / notation, calculée une seule fois par valeur distincte
+
+IG_RATINGS = frozenset({
+    "AAA", "AA+", "AA", "AA-", "A+", "A", "A-", "Aaa", "Aa1", "Aa2", "Aa3",
+    "A1", "A2", "A3"
+})
+
+CROSSOVER_RATINGS = frozenset({
+    "BBB+", "BBB", "BBB-", "Baa1", "Baa2", "Baa3", "BB+", "BB", "BB-"
+})
+
+HY_RATINGS = frozenset({
+    "B+", "B", "B-", "B1", "B2", "B3"
+})
+
+JUNK_RATINGS = frozenset({
+    "CCC+", "CCC", "CCC-", "CC", "C", "Ca", "Caa1", "Caa2", "Caa3"
+})
+
+RATING_CATEGORIES = ["Investment Grade", "Crossover", "High Yield", "Junk", "Not Rated"]
+
+RATING_CATEGORY_LOOKUP = {
+    **{r: "Investment Grade" for r in IG_RATINGS},
+    **{r: "Crossover" for r in CROSSOVER_RATINGS},
+    **{r: "High Yield" for r in HY_RATINGS},
+    **{r: "Junk" for r in JUNK_RATINGS},
+}
+
+# Échelle de notches commune Fitch / Moody's : 1 = AAA/Aaa ... 22 = défaut
+NOTCH_LADDER = [
+    ("AAA", "Aaa"), ("AA+", "Aa1"), ("AA", "Aa2"), ("AA-", "Aa3"),
+    ("A+", "A1"), ("A", "A2"), ("A-", "A3"),
+    ("BBB+", "Baa1"), ("BBB", "Baa2"), ("BBB-", "Baa3"),
+    ("BB+", "Ba1"), ("BB", "Ba2"), ("BB-", "Ba3"),
+    ("B+", "B1"), ("B", "B2"), ("B-", "B3"),
+    ("CCC+", "Caa1"), ("CCC", "Caa2"), ("CCC-", "Caa3"),
+    ("CC", "Ca"), ("C", "C"), ("D", None),
+]
+
+FITCH_NOTCHES = {fitch: i for i, (fitch, _) in enumerate(NOTCH_LADDER, start=1)}
+FITCH_NOTCHES["RD"] = FITCH_NOTCHES["D"]
+MOODYS_NOTCHES = {moodys: i for i, (_, moodys) in enumerate(NOTCH_LADDER, start=1) if moodys}
+
+FIN_SUB_SECTORS = ["CoCo", "Lower Tier 2", "Lower T2", "SnBnk/Fin", "Upper T2/T1"]
+_FIN_PATTERN = "|".join(re.escape(x) for x in FIN_SUB_SECTORS)
+
+
+def _map_unique(values, func):
+    # Applique func sur les valeurs distinctes puis redistribue via les codes de factorisation
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    mapped = np.asarray(func(pd.Series(uniques, dtype=object)), dtype=object)
+    out = np.append(mapped, np.nan)
+    return out[codes]
+
+
+def classify_sector(sub_sector):
+    # "IG ..." -> IG FIN / IG CORPO, sinon premier mot du sous-secteur
+    def _classify(u):
+        base = u.str.extract(r'^([^ -]+)')[0]
+        is_ig = u.str.startswith("IG")
+        is_fin = u.str.contains(_FIN_PATTERN, regex=True)
+        return base.where(~is_ig, np.where(is_fin, "IG FIN", "IG CORPO"))
+
+    return pd.Series(_map_unique(sub_sector, _classify), index=sub_sector.index).infer_objects()
+
+
+def _missing(series, index):
+    return series if series is not None else pd.Series(np.nan, index=index, dtype=object)
+
+
+def _chosen_rating(fitch, moodys):
+    # Fitch si renseignée, sinon Moody's (même règle que classify_rating_cat)
+    fitch_ok = fitch.notna() & (fitch.astype(str).str.strip().str.lower() != "nan")
+    return fitch.where(fitch_ok, moodys)
+
+
+def classify_rating_category(fitch, moodys, index=None):
+    index = index if index is not None else (fitch if fitch is not None else moodys).index
+    fitch = _missing(fitch, index)
+    moodys = _missing(moodys, index)
+    chosen = _chosen_rating(fitch, moodys)
+
+    def _classify(u):
+        # Comme classify_rating_cat : la notation est comparée en majuscules
+        key = u.astype(str).str.upper().str.strip()
+        return key.map(RATING_CATEGORY_LOOKUP).fillna("Not Rated")
+
+    out = _map_unique(chosen, _classify)
+    out[pd.isna(out)] = "Not Rated"
+    return pd.Series(out, index=index).infer_objects()
+
+
+def _clean_rating(u):
+    # Retire les marqueurs de surveillance / provisoire : "(P)Baa1", "BBB+ *-", "A2u"...
+    return (u.astype(str).str.strip()
+            .str.replace(r"^\(P\)", "", regex=True)
+            .str.replace(r"\s*\*[+-]?$", "", regex=True)
+            .str.replace(r"(?<=[1-3a])u$", "", regex=True)
+            .str.strip())
+
+
+def rating_score(fitch, moodys, index=None):
+    # Notch numérique (1 = AAA) : Fitch si reconnue, sinon Moody's, NaN si non noté
+    index = index if index is not None else (fitch if fitch is not None else moodys).index
+    fitch = _missing(fitch, index)
+    moodys = _missing(moodys, index)
+
+    fitch_score = _map_unique(fitch, lambda u: _clean_rating(u).map(FITCH_NOTCHES))
+    moodys_score = _map_unique(moodys, lambda u: _clean_rating(u).map(MOODYS_NOTCHES))
+    score = pd.Series(fitch_score, index=index, dtype=float)
+    return score.fillna(pd.Series(moodys_score, index=index, dtype=float))
+
+
+def classify_ratings(df):
+    # Rating_Category (catégorie historique) + Rating_Score (échelle de notches)
+    fitch = df["FitchRating"] if "FitchRating" in df.columns else None
+    moodys = df["Moody's_rating"] if "Moody's_rating" in df.columns else None
+    category = classify_rating_category(fitch, moodys, index=df.index)
+    score = rating_score(fitch, moodys, index=df.index)
+    return category, score
@@ -1,6 +1,65 @@
 import os
+import multiprocessing
 import pandas as pd
+import openpyxl
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
+from utils.snapshot_cache import read_sheet_cached, snapshot_path
+
+AXES_SHEETS = ["Axes Offers USD", "Axes Offers EUR"]
+
+# Colonnes brutes réellement utilisées par le dashboard (les autres ne sont jamais matérialisées)
+AXES_COLUMNS = [
+    "Bond ID", "Sector", "ISIN", "IssuerName", "Ticker", "Coupon", "Maturity", "CouponType", "Currency",
+    "IA_Offer_Price", "IA_Offer_YLD", "IA_Offer_QTY", "Dealer", "Stream_Offer_Price",
+    "TW_Offer_Price", "TW_Bid_Price", "Moody's_rating", "FitchRating",
+    "IA_Offer_BMK_SPD", "IA_Offer_I-SPD", "IA_Offer_Z-SPD", "IA_Offer_ASW"
+]
+
+# Une ligne sans prix d'axe est écartée dès la lecture (comptée dans attrs["skipped_rows"])
+AXES_REQUIRED_COLUMN = "IA_Offer_Price"
+# Tag des snapshots de feuille en lecture projetée (changé quand ce qu'ils contiennent change)
+PROJECTED_TAG = "proj3"
+
+AXE_RENAME = {
+    "IA_Offer_Price": "AXE_Offer_Price",
+    "IA_Offer_YLD": "AXE_Offer_YLD",
+    "IA_Offer_QTY": "AXE_Offer_QTY",
+    "IA_Offer_BMK_SPD": "AXE_Offer_BMK_SPD",
+    "IA_Offer_I-SPD": "AXE_Offer_I-SPD",
+    "IA_Offer_Z-SPD": "AXE_Offer_Z-SPD",
+    "IA_Offer_ASW": "AXE_Offer_ASW"
+}
+
+DROPPED_COLUMNS = [
+    "IA_Offer_BMK_SPD_zscore", "IA_Offer_BMK_SPD_percentile",
+    "CompositeRating", "TW_Offer_YLD", "TW_Bid_YLD"
+]
+
+
+
+def _env_workers(name, default=1):
+    # Valeur entière de la variable (0 = un processus par cœur) ; absente ou invalide : défaut
+    try:
+        workers = int(os.environ.get(name, default))
+    except ValueError:
+        return default
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+
+# Nombre de processus pour le parsing Excel. Lecture série par défaut : l'appli (serveur
+# Streamlit multi-thread, surveillant de data/) ne doit pas forker ; ingest.py passe
+# CLI_INGEST_WORKERS explicitement.
+INGEST_WORKERS = _env_workers("AXES_INGEST_WORKERS")
+CLI_INGEST_WORKERS = os.cpu_count() or 1
+
+# Mêmes valeurs manquantes que pd.read_excel par défaut
+NA_STRINGS = {
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"
+}
+
 
 def load_latest_excel():
     today = datetime.today().strftime("%Y%m%d")
@@ -12,4 +71,125 @@ def load_latest_excel():
         df.columns = df.columns.str.strip()
         return df
     else:
-        return None
\ No newline at end of file
+        return None
+
+
+def list_axes_files(data_dir="data"):
+    if not os.path.isdir(data_dir):
+        return []
+    return sorted(f for f in os.listdir(data_dir) if f.startswith("Axes_") and f.endswith(".xlsx"))
+
+
+def latest_axes_file(data_dir="data"):
+    axes_files = list_axes_files(data_dir)
+    if not axes_files:
+        return None
+    return os.path.join(data_dir, axes_files[-1])
+
+
+def _clean_cell(value):
+    if isinstance(value, str):
+        return None if value in NA_STRINGS else value
+    # Comme pd.read_excel : un flottant entier est relu comme int
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def stream_axes_sheet(path, sheet_name, usecols=AXES_COLUMNS, required=AXES_REQUIRED_COLUMN):
+    # Lecture openpyxl en mode read-only, ligne à ligne : seules les colonnes demandées
+    # sont conservées et les lignes sans valeur dans `required` ne sont jamais allouées
+    # (leur nombre est gardé dans attrs["skipped_rows"], pour le rapport qualité)
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb[sheet_name].iter_rows(values_only=True)
+        header = [str(h).strip() if h is not None else "" for h in next(rows, ())]
+        wanted = header if usecols is None else [c for c in usecols if c in header]
+        positions = [header.index(c) for c in wanted]
+        required_pos = header.index(required) if required in header else None
+
+        data = [[] for _ in wanted]
+        skipped = 0
+        for row in rows:
+            if required_pos is not None and (
+                required_pos >= len(row) or _clean_cell(row[required_pos]) is None
+            ):
+                # Ligne entièrement vide (mise en forme en fin de feuille) : pas une ligne écartée
+                skipped += any(_clean_cell(value) is not None for value in row)
+                continue
+            width = len(row)
+            for values, pos in zip(data, positions):
+                values.append(_clean_cell(row[pos]) if pos < width else None)
+    finally:
+        wb.close()
+
+    df = pd.DataFrame(dict(zip(wanted, data)), columns=wanted)
+    df.attrs["skipped_rows"] = skipped
+    return df
+
+
+def axes_file_date(path):
+    # Axes_YYYYMMDD.xlsx -> date du fichier
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return datetime.strptime(stem.split("_", 1)[1], "%Y%m%d").date()
+
+
+def _read_excel_sheet(path, sheet_name):
+    return pd.read_excel(path, sheet_name=sheet_name)
+
+
+def _read_sheet(path, sheet_name, use_cache=True, projected=True):
+    reader = stream_axes_sheet if projected else _read_excel_sheet
+    if use_cache:
+        tag = PROJECTED_TAG if projected else ""
+        return read_sheet_cached(path, sheet_name, reader=reader, tag=tag)
+    return reader(path, sheet_name)
+
+
+def read_axes_sheets(paths, use_cache=True, projected=True, max_workers=None):
+    # Une tâche par (classeur, feuille), dans l'ordre : la concaténation reste déterministe
+    tasks = [(path, sheet) for path in paths for sheet in AXES_SHEETS]
+    workers = INGEST_WORKERS if max_workers is None else max_workers
+
+    # Les feuilles déjà en cache se lisent en quelques ms : inutile de les envoyer au pool
+    tag = PROJECTED_TAG if projected else ""
+    pending = [t for t in tasks if not (use_cache and os.path.exists(snapshot_path(*t, tag=tag)))]
+
+    frames = {}
+    # fork uniquement : en spawn/forkserver, Streamlit déclare app.py comme __main__ et chaque
+    # worker ré-exécuterait toute la page. Sans fork (Windows), on reste en lecture série.
+    if workers > 1 and len(pending) > 1 and "fork" in multiprocessing.get_all_start_methods():
+        try:
+            ctx = multiprocessing.get_context("fork")
+            with ProcessPoolExecutor(max_workers=min(workers, len(pending)), mp_context=ctx) as pool:
+                futures = {t: pool.submit(_read_sheet, *t, use_cache, projected) for t in pending}
+                frames = {t: future.result() for t, future in futures.items()}
+        except (OSError, BrokenProcessPool, NotImplementedError):
+            # Pool indisponible (sandbox, limites système...) : repli en lecture série
+            frames = {}
+
+    return [frames[t] if t in frames else _read_sheet(*t, use_cache, projected) for t in tasks]
+
+
+def read_axes_workbooks(paths, use_cache=True, projected=True, max_workers=None, with_date=False):
+    frames = read_axes_sheets(paths, use_cache=use_cache, projected=projected, max_workers=max_workers)
+    if with_date:
+        dates = [axes_file_date(path) for path in paths for _ in AXES_SHEETS]
+        frames = [frame.assign(Date=pd.Timestamp(d)) for frame, d in zip(frames, dates)]
+    df = pd.concat(frames, ignore_index=True)
+    df.columns = df.columns.str.strip()
+    # concat ne garde pas des attrs différents d'une feuille à l'autre : total recalculé
+    df.attrs["skipped_rows"] = sum(frame.attrs.get("skipped_rows", 0) for frame in frames)
+    return df
+
+
+def read_axes_workbook(path, use_cache=True, projected=True, max_workers=None):
+    # Feuilles USD + EUR concaténées, via le snapshot colonnaire si disponible.
+    # projected=True : lecture en flux limitée à AXES_COLUMNS, lignes sans prix filtrées
+    return read_axes_workbooks([path], use_cache=use_cache, projected=projected, max_workers=max_workers)
+
+
+def normalize_axes_columns(df):
+    # Renommage IA_ -> AXE_ et suppression des colonnes inutilisées
+    df = df.rename(columns=AXE_RENAME)
+    return df.drop(columns=DROPPED_COLUMNS, errors="ignore")
@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+from utils.data_loader import normalize_axes_columns
+
+# Contrôle qualité des axes bruts, en une passe vectorisée avant nettoyage : chaque règle
+# renvoie un masque booléen, les masques sont combinés en un champ de bits par ligne.
+# Résultat : nombre de lignes par règle et table de quarantaine (lignes concernées, valeurs
+# brutes, règles déclenchées), écrits avec le snapshot. Les règles "corrigé" / "masqué" /
+# "écarté" décrivent ce que fait clean_axes (mêmes masques) ; "signalé" ne modifie rien.
+# Pour ajouter une règle : une entrée (libellé, action, contrôle) dans QUALITY_RULES.
+# Les lignes sans prix écartées dès la lecture projetée (attrs["skipped_rows"]) sont comptées
+# dans READ_FILTER_RULE mais absentes de la quarantaine (jamais chargées).
+
+INVERSION_THRESHOLD = 10
+PRICE_RANGE = (0, 500)
+DUPLICATE_KEYS = ["ISIN", "Dealer"]
+READ_FILTER_RULE = "prix_absent"
+QUARANTINE_COLUMNS = [
+    "ISIN", "IssuerName", "Dealer", "Maturity", "AXE_Offer_Price", "AXE_Offer_YLD", "Stream_Offer_Price",
+    "TW_Bid_Price", "TW_Offer_Price", "AXE_Offer_QTY"
+]
+
+
+def yield_price_inversion(price, stream, yld):
+    # Rendement et prix saisis l'un à la place de l'autre : prix loin du prix Stream
+    with np.errstate(invalid="ignore"):
+        return (np.abs(price - stream) > INVERSION_THRESHOLD) & ~np.isnan(price) & ~np.isnan(yld)
+
+
+def implausible_yield(price, yld):
+    # Rendement (en %) incohérent avec le prix, une fois les inversions corrigées
+    with np.errstate(invalid="ignore"):
+        return (
+            ((price >= 95) & (price <= 105) & ((yld < -5) | (yld > 15))) |
+            ((price < 50) & (yld > 60)) |
+            ((price > 150) & (yld < -20))
+        )
+
+
+def swap_inverted(price, stream, yld):
+    # -> (prix, rendement brut, masque) après échange des valeurs inversées
+    inverted = yield_price_inversion(price, stream, yld)
+    return np.where(inverted, yld * 100, price), np.where(inverted, price / 100, yld), inverted
+
+
+class _Columns:
+    # Colonnes converties une seule fois pour toutes les règles (tableaux NumPy, pas de copie du frame)
+    def __init__(self, df, as_of):
+        self.df = df
+        self.as_of = pd.Timestamp(as_of) if as_of is not None else pd.Timestamp.now().normalize()
+        self._cache = {}
+
+    def __getitem__(self, col):
+        if col not in self._cache:
+            if col in self.df.columns:
+                values = pd.to_numeric(self.df[col], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+            else:
+                values = np.full(len(self.df), np.nan)
+            self._cache[col] = values
+        return self._cache[col]
+
+    def cleaned_price_yield(self):
+        if "cleaned" not in self._cache:
+            price, yld, _ = swap_inverted(self["AXE_Offer_Price"], self["Stream_Offer_Price"], self["AXE_Offer_YLD"])
+            self._cache["cleaned"] = price, np.abs(yld) * 100
+        return self._cache["cleaned"]
+
+    def maturity(self):
+        if "maturity" not in self._cache:
+            self._cache["maturity"] = pd.to_datetime(self.df["Maturity"], errors="coerce")
+        return self._cache["maturity"]
+
+
+def _price_out_of_range(price):
+    return ~np.isnan(price) & ~((price > PRICE_RANGE[0]) & (price <= PRICE_RANGE[1]))
+
+
+def _duplicates(c):
+    if not all(col in c.df.columns for col in DUPLICATE_KEYS):
+        return np.zeros(len(c.df), dtype=bool)
+    return c.df.duplicated(subset=DUPLICATE_KEYS, keep=False).to_numpy()
+
+
+QUALITY_RULES = {
+    "prix_absent": {
+        "label": "Prix de l'axe absent", "action": "écarté",
+        "check": lambda c: np.isnan(c["AXE_Offer_Price"]),
+    },
+    "inversion_prix_rendement": {
+        "label": f"Prix et rendement inversés (écart au prix Stream > {INVERSION_THRESHOLD} points)", "action": "corrigé",
+        "check": lambda c: yield_price_inversion(c["AXE_Offer_Price"], c["Stream_Offer_Price"], c["AXE_Offer_YLD"]),
+    },
+    "rendement_aberrant": {
+        "label": "Rendement incohérent avec le prix", "action": "masqué",
+        "check": lambda c: implausible_yield(*c.cleaned_price_yield()),
+    },
+    "prix_hors_bornes": {
+        "label": f"Prix hors de ]{PRICE_RANGE[0]}, {PRICE_RANGE[1]}]", "action": "signalé",
+        "check": lambda c: _price_out_of_range(c.cleaned_price_yield()[0]),
+    },
+    "quantite_invalide": {
+        "label": "Quantité absente ou négative / nulle", "action": "signalé",
+        "check": lambda c: ~(c["AXE_Offer_QTY"] > 0),
+    },
+    "doublon_isin_dealer": {
+        "label": "Plusieurs axes pour le même (ISIN, Dealer)", "action": "signalé",
+        "check": _duplicates,
+    },
+    "composite_bid_sup_offer": {
+        "label": "Composite Bid supérieur au composite Offer", "action": "signalé",
+        "check": lambda c: c["TW_Bid_Price"] > c["TW_Offer_Price"],
+    },
+    "maturite_echue": {
+        "label": "Maturité antérieure à la date du fichier", "action": "signalé",
+        "check": lambda c: (c.maturity() < c.as_of).to_numpy(dtype=bool, na_value=False),
+    },
+    "maturite_absente": {
+        "label": "Maturité absente ou illisible (classée PERP)", "action": "signalé",
+        "check": lambda c: c.maturity().isna().to_numpy(),
+    },
+}
+
+
+def skipped_rows(df_raw):
+    # Lignes écartées à la lecture, avant tout contrôle
+    return int(df_raw.attrs.get("skipped_rows", 0))
+
+
+def raw_row_count(df_raw):
+    return len(df_raw) + skipped_rows(df_raw)
+
+
+def validate_axes(df_raw, as_of=None, rules=QUALITY_RULES):
+    # -> (bits par ligne : bit i = i-ème règle déclenchée, nombre de lignes par règle,
+    # lignes écartées à la lecture comprises)
+    c = _Columns(normalize_axes_columns(df_raw), as_of)
+    bits = np.zeros(len(df_raw), dtype=np.uint32)
+    counts = {}
+    for i, (name, rule) in enumerate(rules.items()):
+        with np.errstate(invalid="ignore"):
+            mask = np.asarray(rule["check"](c), dtype=bool)
+        bits |= mask.astype(np.uint32) << np.uint32(i)
+        counts[name] = int(mask.sum())
+    if READ_FILTER_RULE in counts:
+        counts[READ_FILTER_RULE] += skipped_rows(df_raw)
+    return bits, counts
+
+
+def quality_counts(counts, n_rows, rules=QUALITY_RULES):
+    # Tableau par règle (lignes concernées, part du fichier)
+    return pd.DataFrame({
+        "Règle": [rules[name]["label"] for name in counts],
+        "Action": [rules[name]["action"] for name in counts],
+        "Lignes": list(counts.values()),
+        "% des lignes": [round(100 * n / n_rows, 2) if n_rows else 0.0 for n in counts.values()],
+    })
+
+
+def quarantine_table(df_raw, bits, rules=QUALITY_RULES):
+    # Lignes brutes ayant déclenché au moins une règle, avec la liste des règles
+    rows = np.flatnonzero(bits)
+    df = normalize_axes_columns(df_raw)
+    table = df[[col for col in QUARANTINE_COLUMNS if col in df.columns]].iloc[rows].reset_index(drop=True)
+    # Libellés par combinaison de règles distincte (peu nombreuses), puis diffusés aux lignes
+    combos, inverse = np.unique(bits[rows], return_inverse=True)
+    names = list(rules)
+    labels = np.array([
+        ", ".join(names[i] for i in range(len(names)) if combo >> i & 1) for combo in combos.tolist()
+    ], dtype=object)
+    table.insert(0, "Règles", labels[inverse] if len(rows) else np.array([], dtype=object))
+    table.insert(0, "Ligne", rows)
+    return table
@@ -0,0 +1,76 @@
+import os
+import threading
+from utils.data_loader import list_axes_files
+
+# Surveillance du dossier data/ par scrutation (pas de dépendance inotify / watchdog) :
+# un classeur nouveau ou re-livré est ingéré en tâche de fond dans le registre partagé,
+# une fois sa taille et sa date stables sur deux passages (fichier entièrement copié).
+# Sont rafraîchis le classeur le plus récent et les classeurs déjà chargés par une session.
+
+WATCH_INTERVAL = float(os.environ.get("AXES_WATCH_INTERVAL", 30))
+
+
+class DataWatcher:
+    def __init__(self, registry, data_dir="data", interval=WATCH_INTERVAL):
+        self.registry = registry
+        self.data_dir = data_dir
+        self.interval = interval
+        self.last_error = None
+        self._seen = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _stats(self):
+        stats = {}
+        if not os.path.isdir(self.data_dir):
+            return stats
+        for name in list_axes_files(self.data_dir):
+            path = os.path.join(self.data_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            stats[path] = (st.st_size, st.st_mtime_ns)
+        return stats
+
+    def scan(self):
+        # Un passage -> chemins (re)chargés
+        stats = self._stats()
+        stable = [path for path, stat in stats.items() if self._seen.get(path) == stat]
+        self._seen = stats
+
+        loaded = self.registry.loaded_paths()
+        newest = list(stats)[-1:]
+        refreshed = []
+        for path in stable:
+            if path not in newest and os.path.abspath(path) not in loaded:
+                continue
+            current = loaded.get(os.path.abspath(path))
+            if current is not None and current[1] == stats[path][1]:
+                continue
+            self.registry.get(path)
+            refreshed.append(path)
+        return refreshed
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.scan()
+                self.last_error = None
+            except Exception as exc:
+                # Classeur illisible (copie en cours, format inattendu) : nouvel essai au passage suivant
+                self.last_error = exc
+
+    def start(self):
+        if self.interval <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return self
+        self._seen = self._stats()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="axes-data-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
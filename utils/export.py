@@ -0,0 +1,74 @@
+from io import BytesIO
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import Workbook
+
+# Export des axes filtrés, écrit par tranches de lignes : la mémoire de travail ne dépend
+# pas de la taille du résultat (hors fichier produit).
+
+EXPORT_FORMATS = {
+    "xlsx": {"label": "Excel", "mime": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"},
+    "csv": {"label": "CSV", "mime": "text/csv"},
+    "parquet": {"label": "Parquet", "mime": "application/vnd.apache.parquet"},
+}
+
+CHUNK_ROWS = 50_000
+
+
+def iter_chunks(df, chunk_rows=CHUNK_ROWS):
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def _python_rows(chunk):
+    # NaN / NaT -> cellule vide, catégoriels -> valeurs
+    values = chunk.astype(object).where(chunk.notna(), None)
+    return values.itertuples(index=False, name=None)
+
+
+def write_xlsx(df, fileobj, chunk_rows=CHUNK_ROWS, sheet_name="Axes"):
+    # Classeur openpyxl en écriture seule : les lignes sont écrites au fil de l'eau
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_name)
+    ws.append([str(col) for col in df.columns])
+    for chunk in iter_chunks(df, chunk_rows):
+        for row in _python_rows(chunk):
+            ws.append(row)
+    wb.save(fileobj)
+
+
+def write_csv(df, fileobj, chunk_rows=CHUNK_ROWS):
+    for i, chunk in enumerate(iter_chunks(df, chunk_rows)):
+        fileobj.write(chunk.to_csv(index=False, header=(i == 0)).encode("utf-8"))
+    if len(df) == 0:
+        fileobj.write(df.to_csv(index=False).encode("utf-8"))
+
+
+def _parquet_schema(df, chunk_rows=CHUNK_ROWS):
+    # Schéma de tout l'export : un frame vide donne le type null aux colonnes object (texte en
+    # pandas 2), leur type est alors déduit des premières valeurs renseignées
+    schema = pa.Schema.from_pandas(df.iloc[:0], preserve_index=False)
+    for i, field in enumerate(schema):
+        if pa.types.is_null(field.type):
+            values = df[field.name].dropna().iloc[:chunk_rows]
+            if len(values):
+                inferred = pa.Schema.from_pandas(values.to_frame(), preserve_index=False).field(0).type
+                schema = schema.set(i, field.with_type(inferred))
+    return schema
+
+
+def write_parquet(df, fileobj, chunk_rows=CHUNK_ROWS):
+    # Un row group par tranche ; catégoriels conservés en dictionnaire
+    schema = _parquet_schema(df, chunk_rows)
+    with pq.ParquetWriter(fileobj, schema) as writer:
+        for chunk in iter_chunks(df, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+WRITERS = {"xlsx": write_xlsx, "csv": write_csv, "parquet": write_parquet}
+
+
+def export_bytes(df, fmt="xlsx", chunk_rows=CHUNK_ROWS):
+    buffer = BytesIO()
+    WRITERS[fmt](df, buffer, chunk_rows=chunk_rows)
+    return buffer.getvalue()
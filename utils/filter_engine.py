@@ -0,0 +1,163 @@
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+# Moteur de filtres pour les axes : structures précalculées une fois par snapshot,
+# un masque final unique par spec, résultats mémorisés par hash de la spec.
+#
+# Spec (toutes les clés sont optionnelles) :
+#   {"in": {col: [valeurs]}, "range": {col: (min, max)}, "date_range": {col: (min, max)},
+#    "flags": {col: bool}, "composite_tol": float}
+# Bornes incluses ; None = non bornée. Les NaN ne passent jamais un filtre "in" / "range".
+
+FILTER_CATEGORICALS = ["Sector", "Currency", "CouponType", "Rating_Category", "IssuerName"]
+FILTER_RANGES = ["AXE_Offer_YLD", "AXE_Offer_QTY", "Nb_Dealers_AXE", "Axe_Mid_Spread", "AXE_Offer_BMK_SPD"]
+FILTER_DATES = ["Maturity"]
+FILTER_FLAGS = ["Is_144A", "Is_Scrap"]
+
+
+def add_filter_flags(df):
+    # Drapeaux calculés à l'ingestion : titre 144A, "scrap" (quantité ne finissant pas par 0)
+    df["Is_144A"] = df["Bond ID"].astype(str).str.contains("144A", regex=False).to_numpy(dtype=bool)
+    qty = pd.to_numeric(df["AXE_Offer_QTY"], errors="coerce")
+    df["Is_Scrap"] = (qty.notna() & (qty % 10 != 0)).to_numpy(dtype=bool)
+    return df
+
+
+def spec_key(spec):
+    # Hash canonique : l'ordre des valeurs sélectionnées n'a pas d'importance
+    def _norm(value):
+        if isinstance(value, dict):
+            return {str(k): _norm(v) for k, v in value.items()}
+        if isinstance(value, (list, set, frozenset)):
+            return sorted((_norm(v) for v in value), key=str)
+        if isinstance(value, tuple):
+            return [_norm(v) for v in value]
+        return value
+
+    raw = json.dumps(_norm(spec), sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class _SortedColumn:
+    # Index trié : une plage [min, max] devient deux searchsorted
+    def __init__(self, values, valid=None):
+        values = np.asarray(values)
+        if valid is None:
+            valid = ~np.isnan(values)
+        self.order = np.flatnonzero(valid)[np.argsort(values[valid], kind="stable")]
+        self.sorted = values[self.order]
+
+    def positions(self, lo, hi):
+        a = 0 if lo is None else np.searchsorted(self.sorted, lo, side="left")
+        b = len(self.sorted) if hi is None else np.searchsorted(self.sorted, hi, side="right")
+        return self.order[a:max(a, b)]
+
+
+class FilterEngine:
+    def __init__(self, df, categoricals=FILTER_CATEGORICALS, ranges=FILTER_RANGES,
+                 dates=FILTER_DATES, flags=FILTER_FLAGS, cache_size=64):
+        self.n_rows = len(df)
+        self.cache_size = cache_size
+
+        self._codes = {}
+        self._lookup = {}
+        for col in categoricals:
+            if col in df.columns:
+                codes, uniques = pd.factorize(df[col])
+                self._codes[col] = codes
+                self._lookup[col] = {v: i for i, v in enumerate(uniques)}
+
+        self._sorted = {col: _SortedColumn(pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float))
+                        for col in ranges if col in df.columns}
+        for col in dates:
+            if col in df.columns:
+                # datetime64 dans l'unité de la colonne (maturités > 2262 possibles) ; NaT exclu
+                ts = pd.to_datetime(df[col], errors="coerce")
+                self._sorted[col] = _SortedColumn(ts.to_numpy(), valid=ts.notna().to_numpy())
+
+        self._flags = {col: df[col].to_numpy(dtype=bool) for col in flags if col in df.columns}
+
+        # Prix et fourchette composite, pour la tolérance Bid/Offer
+        composite = ["AXE_Offer_Price", "Composite_Bid_Price", "Composite_Offer_Price"]
+        if all(col in df.columns for col in composite):
+            self._price, self._bid, self._offer = (
+                pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float) for col in composite
+            )
+        else:
+            self._price = None
+
+        self._masks = {}
+        self._results = OrderedDict()
+        # Partagé entre sessions (registre de snapshots) : caches protégés par un verrou
+        self._lock = threading.Lock()
+
+    def clear(self):
+        # Vide les masques et résultats mémorisés (mesures à froid)
+        with self._lock:
+            self._masks.clear()
+            self._results.clear()
+
+    def _mask_from_positions(self, positions):
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[positions] = True
+        return mask
+
+    def _column_mask(self, kind, col, arg):
+        key = (kind, col, spec_key(arg))
+        mask = self._masks.get(key)
+        if mask is not None:
+            return mask
+
+        if kind == "in":
+            table = np.zeros(len(self._lookup[col]) + 1, dtype=bool)
+            for value in arg:
+                i = self._lookup[col].get(value)
+                if i is not None:
+                    table[i] = True
+            # code -1 (NaN) -> dernière case, toujours False
+            mask = table[self._codes[col]]
+        elif kind == "range":
+            mask = self._mask_from_positions(self._sorted[col].positions(*arg))
+        elif kind == "date_range":
+            lo, hi = (None if d is None else np.datetime64(pd.Timestamp(d)) for d in arg)
+            mask = self._mask_from_positions(self._sorted[col].positions(lo, hi))
+        else:
+            mask = self._flags[col] == bool(arg)
+
+        if len(self._masks) >= 4 * self.cache_size:
+            self._masks.clear()
+        self._masks[key] = mask
+        return mask
+
+    def mask(self, spec):
+        mask = np.ones(self.n_rows, dtype=bool)
+        for kind in ["in", "range", "date_range", "flags"]:
+            for col, arg in (spec.get(kind) or {}).items():
+                mask &= self._column_mask(kind, col, arg)
+
+        tol = spec.get("composite_tol")
+        if tol is not None and self._price is not None:
+            with np.errstate(invalid="ignore"):
+                mask &= (self._price >= self._bid - tol) & (self._price <= self._offer + tol)
+        return mask
+
+    def positions(self, spec):
+        key = spec_key(spec)
+        with self._lock:
+            positions = self._results.get(key)
+            if positions is None:
+                positions = np.flatnonzero(self.mask(spec))
+                self._results[key] = positions
+                if len(self._results) > self.cache_size:
+                    self._results.popitem(last=False)
+            else:
+                self._results.move_to_end(key)
+        return positions
+
+    def apply(self, df, spec):
+        # Un seul gather sur le DataFrame d'origine
+        return df.iloc[self.positions(spec)]
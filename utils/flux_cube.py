@@ -0,0 +1,96 @@
+import threading
+import numpy as np
+import pandas as pd
+
+# Cube d'agrégation de la page Flux, construit une fois par snapshot (et politique de best dealer) :
+# une cellule par combinaison observée des dimensions, avec nombre d'axes, quantité totale et
+# nombre de quantités renseignées (moyenne = total / renseignées). Heatmaps et barres sont des
+# agrégations du cube (bincount sur les cellules, pas sur les lignes), mémorisées par dimensions.
+
+MOODYS_ORDER = [
+    "Aaa", "Aa1", "Aa2", "Aa3", "A1", "A2", "A3",
+    "Baa1", "Baa2", "Baa3", "Ba1", "Ba2", "Ba3",
+    "B1", "B2", "B3", "Caa1", "Caa2", "Caa3", "Ca", "C", "WR"
+]
+RATING_ORDER = ["Investment Grade", "Crossover", "High Yield", "Junk", "Not Rated"]
+
+CUBE_DIMENSIONS = ["Rating_Category", "Sector", "Sub_Sector", "Moody's_rating", "MaturityBucket", "Currency", "Dealer"]
+# Dimensions affichées dans l'ordre de l'échelle (les autres : ordre des catégories du snapshot)
+ORDERED_DIMENSIONS = {"Moody's_rating": MOODYS_ORDER, "Rating_Category": RATING_ORDER}
+MEASURES = {"count": "Nombre d'axes", "qty_sum": "AXE_Offer_QTY", "qty_mean": "AXE_Offer_QTY moyen"}
+QTY_COLUMN = "AXE_Offer_QTY"
+
+
+def _dimension(df, col):
+    # Meilleurs axes : le dealer est Best_Dealer ; df_full : Dealer
+    source = "Best_Dealer" if col == "Dealer" and "Dealer" not in df.columns else col
+    if col in ORDERED_DIMENSIONS:
+        # Notations hors échelle (NR, (P)...) écartées comme valeurs manquantes
+        return pd.Categorical(df[source], categories=ORDERED_DIMENSIONS[col], ordered=True)
+    values = df[source]
+    return values.array if isinstance(values.dtype, pd.CategoricalDtype) else pd.Categorical(values)
+
+
+class FluxCube:
+    def __init__(self, df):
+        dims = {col: _dimension(df, col) for col in CUBE_DIMENSIONS}
+        qty = df[QTY_COLUMN].to_numpy(dtype="float64", na_value=np.nan)
+        frame = pd.DataFrame({**dims, "qty": qty}, copy=False)
+        cells = frame.groupby(CUBE_DIMENSIONS, observed=True, dropna=False, sort=False)["qty"].agg(
+            ["size", "sum", "count"]
+        )
+        self.cells = cells.set_axis(["count", "qty_sum", "qty_count"], axis=1).reset_index()
+        self.categories = {col: dims[col].categories for col in CUBE_DIMENSIONS}
+        self.rows = len(df)
+        self._codes = {col: self.cells[col].cat.codes.to_numpy() for col in CUBE_DIMENSIONS}
+        self._measures = {name: self.cells[name].to_numpy(dtype="float64") for name in ["count", "qty_sum", "qty_count"]}
+        # Agrégats déjà calculés, partagés par les sessions
+        self._lock = threading.Lock()
+        self._rollups = {}
+
+    def _sums(self, by):
+        # Mesures par combinaison des codes de `by` (bincount sur les cellules) -> (forme, mesures)
+        by = tuple(by)
+        with self._lock:
+            if by in self._rollups:
+                return self._rollups[by]
+        shape = tuple(len(self.categories[col]) for col in by)
+        codes = [self._codes[col] for col in by]
+        keep = np.logical_and.reduce([c >= 0 for c in codes])
+        flat = np.ravel_multi_index([c[keep] for c in codes], shape)
+        size = int(np.prod(shape))
+        sums = {
+            name: np.bincount(flat, weights=values[keep], minlength=size)
+            for name, values in self._measures.items()
+        }
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sums["qty_mean"] = np.where(sums["qty_count"] > 0, sums["qty_sum"] / sums["qty_count"], np.nan)
+        with self._lock:
+            self._rollups[by] = shape, sums
+        return shape, sums
+
+    def rollup(self, by):
+        # Mesures agrégées par une ou plusieurs dimensions (valeurs manquantes exclues) :
+        # combinaisons observées seulement, dans l'ordre des catégories
+        by = [by] if isinstance(by, str) else list(by)
+        shape, sums = self._sums(by)
+        observed = np.flatnonzero(sums["count"] > 0)
+        levels = [
+            pd.CategoricalIndex(pd.Categorical.from_codes(codes, dtype=self.cells[col].dtype), name=col)
+            for col, codes in zip(by, np.unravel_index(observed, shape))
+        ]
+        index = levels[0] if len(levels) == 1 else pd.MultiIndex.from_arrays(levels)
+        out = pd.DataFrame({name: values[observed] for name, values in sums.items()}, index=index)
+        out["count"] = out["count"].astype("int64")
+        return out
+
+    def pivot(self, index, columns, measure="qty_sum"):
+        # Tableau index x columns d'une mesure, toutes les catégories des deux dimensions
+        # (cellules sans axe : NaN)
+        shape, sums = self._sums([index, columns])
+        values = np.where(sums["count"] > 0, sums[measure], np.nan).reshape(shape)
+        return pd.DataFrame(
+            values,
+            index=pd.CategoricalIndex(self.categories[index], dtype=self.cells[index].dtype, name=index),
+            columns=pd.CategoricalIndex(self.categories[columns], dtype=self.cells[columns].dtype, name=columns),
+        )
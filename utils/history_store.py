@@ -0,0 +1,233 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from utils.data_loader import AXES_SHEETS, list_axes_files, axes_file_date, read_axes_sheets
+from utils.pipeline import clean_axes, select_best_axes
+from utils.snapshot_cache import cache_key
+
+# Historique des axes : un dossier date=YYYY-MM-DD par fichier Axes_*.xlsx ingéré,
+# une ligne par (Date, ISIN, Dealer), triée selon cette clé.
+# Alimenté par ingest.py --history (hors du process Streamlit) ; les pages ne font que lire.
+# Nb_Dealers_AXE : même définition que les snapshots (axes de l'ISIN dans le classeur, doublons
+# compris) ; Nb_Dealers_Distinct : dealers distincts.
+HISTORY_DIR_NAME = "history"
+MANIFEST_NAME = "_manifest.json"
+LOCK_NAME = "_ingest.lock"
+# Verrou laissé par un processus interrompu : ignoré au-delà de ce délai (secondes)
+LOCK_STALE_AFTER = 3600
+# À incrémenter quand les lignes écrites changent : les jours déjà ingérés sont réécrits
+HISTORY_VERSION = 3
+
+HISTORY_KEY = ["Date", "ISIN", "Dealer"]
+HISTORY_METRICS = ["AXE_Offer_YLD", "AXE_Offer_BMK_SPD", "Nb_Dealers_AXE"]
+
+HISTORY_SCHEMA = pa.schema([
+    ("Date", pa.date32()),
+    ("ISIN", pa.string()),
+    ("Dealer", pa.string()),
+    ("IssuerName", pa.string()),
+    ("Ticker", pa.string()),
+    ("Bond ID", pa.string()),
+    ("Currency", pa.string()),
+    ("Sector", pa.string()),
+    ("Sub_Sector", pa.string()),
+    ("Rating_Category", pa.string()),
+    ("Maturity", pa.date32()),
+    ("AXE_Offer_Price", pa.float64()),
+    ("AXE_Offer_YLD", pa.float64()),
+    ("AXE_Offer_QTY", pa.float64()),
+    ("AXE_Offer_BMK_SPD", pa.float64()),
+    ("AXE_Offer_Z-SPD", pa.float64()),
+    ("AXE_Offer_I-SPD", pa.float64()),
+    ("AXE_Offer_ASW", pa.float64()),
+    ("Composite_Bid_Price", pa.float64()),
+    ("Composite_Offer_Price", pa.float64()),
+    ("Axe_Mid_Spread", pa.float64()),
+    ("Nb_Dealers_AXE", pa.int32()),
+    ("Nb_Dealers_Distinct", pa.int32()),
+    ("Best_Axe", pa.bool_()),
+])
+
+# Partitionnement hive sur la date : les requêtes par période n'ouvrent que les jours utiles
+PARTITIONING = ds.partitioning(pa.schema([("date", pa.string())]), flavor="hive")
+
+
+def default_history_dir(data_dir="data"):
+    return os.path.join(data_dir, HISTORY_DIR_NAME)
+
+
+def _read_manifest(history_dir):
+    path = os.path.join(history_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_manifest(history_dir, manifest):
+    path = os.path.join(history_dir, MANIFEST_NAME)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+_lock = threading.Lock()
+
+
+@contextmanager
+def _ingest_lock(history_dir):
+    # Un seul écrivain à la fois : verrou du process (sessions, surveillant) puis fichier verrou
+    # partagé avec ingest.py ; -> False si un autre processus ingère déjà
+    with _lock:
+        path = os.path.join(history_dir, LOCK_NAME)
+        try:
+            if time.time() - os.path.getmtime(path) > LOCK_STALE_AFTER:
+                os.remove(path)
+        except OSError:
+            pass
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            yield False
+            return
+        try:
+            os.write(fd, str(os.getpid()).encode())
+            os.close(fd)
+            yield True
+        finally:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _history_rows(df_raw, day):
+    df_full = clean_axes(df_raw, as_of=day)
+    best = select_best_axes(df_full)
+
+    df = df_full.copy()
+    df["Date"] = day
+    df["Best_Axe"] = df.index.isin(best.index)
+    df["Nb_Dealers_AXE"] = best.set_index("ISIN")["Nb_Dealers_AXE"].reindex(df["ISIN"]).to_numpy()
+    # Une ligne par (ISIN, Dealer) : axe retenu comme meilleur d'abord, puis meilleur rendement
+    df = df.sort_values(["Best_Axe", "AXE_Offer_YLD"], ascending=False, kind="stable", na_position="last")
+    df = df.drop_duplicates(subset=HISTORY_KEY[1:])
+    df["Nb_Dealers_Distinct"] = df.groupby("ISIN")["Dealer"].transform("count")
+    df["Maturity"] = pd.to_datetime(df["Maturity"], errors="coerce")
+
+    for field in HISTORY_SCHEMA:
+        if field.name not in df.columns:
+            df[field.name] = None
+    df = df.sort_values(HISTORY_KEY[1:], kind="stable")
+    return pa.Table.from_pandas(df[HISTORY_SCHEMA.names], schema=HISTORY_SCHEMA, preserve_index=False)
+
+
+def _write_partition(history_dir, day, table):
+    part_dir = os.path.join(history_dir, f"date={day.isoformat()}")
+    os.makedirs(part_dir, exist_ok=True)
+    target = os.path.join(part_dir, "part-0.parquet")
+    tmp = f"{target}.{os.getpid()}.tmp"
+    pq.write_table(table, tmp)
+    os.replace(tmp, target)
+
+
+def ingest_history(data_dir="data", history_dir=None, max_workers=None):
+    # Ingestion incrémentale : seuls les classeurs jamais vus (ou réécrits) sont parsés ;
+    # rien n'est fait si un autre processus ingère déjà (il écrira les mêmes jours)
+    history_dir = history_dir or default_history_dir(data_dir)
+    os.makedirs(history_dir, exist_ok=True)
+    with _ingest_lock(history_dir) as acquired:
+        if not acquired:
+            return []
+        return _ingest_new(data_dir, history_dir, max_workers)
+
+
+def _ingest_new(data_dir, history_dir, max_workers):
+    manifest = _read_manifest(history_dir)
+    todo = []
+    for name in list_axes_files(data_dir):
+        path = os.path.join(data_dir, name)
+        entry = manifest.get(name)
+        if entry is None or entry.get("key") != cache_key(path) or entry.get("version") != HISTORY_VERSION:
+            todo.append(path)
+    if not todo:
+        return []
+
+    # Parsing des nouveaux classeurs en parallèle, nettoyage jour par jour
+    frames = read_axes_sheets(todo, max_workers=max_workers)
+    n = len(AXES_SHEETS)
+    ingested = []
+    for i, path in enumerate(todo):
+        df_raw = pd.concat(frames[i * n:(i + 1) * n], ignore_index=True)
+        df_raw.columns = df_raw.columns.str.strip()
+        day = axes_file_date(path)
+        table = _history_rows(df_raw, day)
+        _write_partition(history_dir, day, table)
+
+        manifest[os.path.basename(path)] = {
+            "key": cache_key(path),
+            "date": day.isoformat(),
+            "rows": table.num_rows,
+            "version": HISTORY_VERSION,
+        }
+        _write_manifest(history_dir, manifest)
+        ingested.append(day)
+    return ingested
+
+
+def history_dates(history_dir=None):
+    history_dir = history_dir or default_history_dir()
+    manifest = _read_manifest(history_dir)
+    return sorted({pd.Timestamp(entry["date"]).date() for entry in manifest.values()})
+
+
+def load_history(history_dir=None, columns=None, isins=None, issuers=None, start=None, end=None, best_only=False):
+    history_dir = history_dir or default_history_dir()
+    if not os.path.isdir(history_dir) or not _read_manifest(history_dir):
+        return pd.DataFrame(columns=columns or HISTORY_SCHEMA.names)
+
+    dataset = ds.dataset(history_dir, format="parquet", partitioning=PARTITIONING,
+                         schema=HISTORY_SCHEMA.append(pa.field("date", pa.string())),
+                         exclude_invalid_files=True)
+
+    # Filtres poussés dans la lecture (partitions + statistiques des row groups)
+    filters = []
+    if start is not None:
+        filters.append(ds.field("date") >= pd.Timestamp(start).date().isoformat())
+    if end is not None:
+        filters.append(ds.field("date") <= pd.Timestamp(end).date().isoformat())
+    if isins is not None:
+        filters.append(ds.field("ISIN").isin(list(isins)))
+    if issuers is not None:
+        filters.append(ds.field("IssuerName").isin(list(issuers)))
+    if best_only:
+        filters.append(ds.field("Best_Axe"))
+
+    expr = None
+    for f in filters:
+        expr = f if expr is None else expr & f
+
+    if columns is not None:
+        columns = list(dict.fromkeys(HISTORY_KEY + list(columns)))
+    table = dataset.to_table(columns=columns or HISTORY_SCHEMA.names, filter=expr)
+    df = table.to_pandas()
+    df["Date"] = pd.to_datetime(df["Date"])
+    return df.sort_values(HISTORY_KEY, kind="stable").reset_index(drop=True)
+
+
+def isin_history(isin, history_dir=None, metrics=HISTORY_METRICS, best_only=True):
+    # Série temporelle d'un ISIN : par défaut le meilleur axe de chaque jour
+    return load_history(history_dir, columns=list(metrics) + ["Best_Axe"], isins=[isin], best_only=best_only)
+
+
+def issuer_history(issuer, history_dir=None, metrics=HISTORY_METRICS):
+    # Meilleurs axes de tous les ISINs d'un émetteur, jour par jour
+    return load_history(history_dir, columns=list(metrics) + ["IssuerName", "Maturity"],
+                        issuers=[issuer], best_only=True)
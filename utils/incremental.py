@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+from utils.pipeline import clean_axes, select_best_axes
+from utils.schema import compact_axes
+
+# Rafraîchissement incrémental d'un classeur re-livré : seules les lignes brutes
+# (ISIN, Dealer) dont le hash a changé repassent par le nettoyage, et seuls les ISINs
+# touchés repassent par la sélection du meilleur dealer ; le reste est repris du
+# snapshot précédent. Résultat identique à build_axes_frames sur le nouveau classeur.
+
+
+def row_hashes(df_raw):
+    # Hash de chaque ligne brute (toutes colonnes, y compris ISIN et Dealer)
+    return pd.util.hash_pandas_object(df_raw, index=False).to_numpy()
+
+
+def match_rows(hashes, previous_hashes):
+    # Position précédente de chaque ligne brute inchangée, -1 si nouvelle ou modifiée
+    # (une ligne en double n'est reprise qu'une fois)
+    known = pd.Series(np.arange(len(previous_hashes)), index=previous_hashes)
+    known = known[~known.index.duplicated()]
+    previous_pos = known.reindex(hashes).fillna(-1).to_numpy(dtype=np.int64, copy=True)
+    previous_pos[pd.Index(hashes).duplicated()] = -1
+    return previous_pos
+
+
+def _concat(parts):
+    # Concaténation sans repasser les catégoriels en chaînes : catégories réunies (triées,
+    # comme astype("category")), les valeurs disparues sont retirées par compact_axes ;
+    # les catégoriels ordonnés (MaturityBucket) ont des catégories fixes et sont laissés tels quels
+    parts = [part for part in parts if len(part)] or parts[:1]
+    categorical = [col for col, dtype in parts[0].dtypes.items()
+                   if isinstance(dtype, pd.CategoricalDtype) and not dtype.ordered]
+    aligned = {}
+    for col in categorical:
+        categories = pd.Index([])
+        for part in parts:
+            if isinstance(part[col].dtype, pd.CategoricalDtype):
+                categories = categories.union(part[col].cat.categories)
+        aligned[col] = categories
+    parts = [part.assign(**{col: part[col].astype(pd.CategoricalDtype(categories))
+                            for col, categories in aligned.items()}) for part in parts]
+    return pd.concat(parts)
+
+
+def _touched_isins(df_full, previous_full, previous_pos, old_to_new):
+    # ISINs dont une ligne est apparue, a changé ou a disparu, ou dont les dealers ont
+    # changé d'ordre dans le fichier (l'ordre départage les ex aequo)
+    old = previous_pos[df_full.index]
+    touched = set(df_full["ISIN"].to_numpy()[old < 0])
+    touched.update(previous_full["ISIN"].to_numpy()[old_to_new[previous_full.index] < 0])
+
+    codes = pd.factorize(df_full["ISIN"])[0]
+    reused = old >= 0
+    step = pd.Series(old[reused]).groupby(codes[reused]).diff().to_numpy()
+    touched.update(df_full["ISIN"].to_numpy()[reused][step < 0])
+    # ISIN manquant : NaN produits par pandas, distincts de np.nan, exclus par valeur
+    return [isin for isin in touched if pd.notna(isin)]
+
+
+def incremental_axes_frames(df_raw, hashes, previous_full, previous_df, previous_hashes, as_of=None):
+    # -> (df_full, df, nb de lignes brutes retraitées)
+    previous_pos = match_rows(hashes, previous_hashes)
+    new_rows = np.flatnonzero(previous_pos < 0)
+    old_to_new = np.full(len(previous_hashes), -1, dtype=np.int64)
+    old_to_new[previous_pos[previous_pos >= 0]] = np.flatnonzero(previous_pos >= 0)
+
+    # Lignes reprises : celles que le nettoyage précédent avait gardées (index = position brute)
+    moved = old_to_new[previous_full.index]
+    reused_full = previous_full[moved >= 0]
+    reused_full.index = moved[moved >= 0]
+
+    parts = [reused_full]
+    if len(new_rows):
+        parts.append(compact_axes(clean_axes(df_raw.iloc[new_rows], as_of=as_of)))
+    # Ordre du fichier conservé, comme dans un nettoyage complet
+    df_full = compact_axes(_concat(parts).sort_index())
+
+    # Meilleur dealer : recalcul sur les ISINs touchés, reprise (index renuméroté) ailleurs
+    touched = _touched_isins(df_full, previous_full, previous_pos, old_to_new)
+    kept_best = previous_df[~previous_df["ISIN"].isin(touched)]
+    kept_best.index = old_to_new[kept_best.index]
+
+    parts = [kept_best]
+    touched_full = df_full[df_full["ISIN"].isin(touched)]
+    if len(touched_full):
+        parts.append(compact_axes(select_best_axes(touched_full)))
+    df = compact_axes(_concat(parts).sort_values("ISIN", kind="stable"))
+    return df_full, df, len(new_rows)
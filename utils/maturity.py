@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+# Tenor et buckets de maturité, calculés une fois par snapshot à une date de référence fixe
+
+TENOR_COLUMN = "Années avant maturité"
+BUCKET_COLUMN = "MaturityBucket"
+
+# Bornes hautes (incluses) des buckets, en années ; au-delà de la dernière : PERP
+BUCKET_EDGES = [1, 2, 3, 4, 5, 7, 8, 10, 15, 20, 25, 30]
+PERP_BUCKET = "PERP"
+
+
+def bucket_labels(edges=BUCKET_EDGES):
+    bounds = [0] + list(edges)
+    return [f"{lo:g}-{hi:g}Y" for lo, hi in zip(bounds[:-1], bounds[1:])] + [PERP_BUCKET]
+
+
+ORDERED_BUCKETS = bucket_labels()
+
+
+def tenor_years(maturity, as_of=None):
+    # Nombre de jours entiers jusqu'à maturité / 365 (NaN si pas de maturité)
+    as_of = pd.Timestamp.now() if as_of is None else pd.Timestamp(as_of)
+    maturity = pd.to_datetime(maturity, errors="coerce")
+    return (maturity - as_of).dt.days / 365
+
+
+def maturity_buckets(years, edges=BUCKET_EDGES):
+    # delta <= edges[0] -> 1er bucket, ..., delta > edges[-1] ou NaN -> PERP
+    labels = bucket_labels(edges)
+    values = np.asarray(years, dtype=float)
+    codes = np.searchsorted(np.asarray(edges, dtype=float), values, side="left")
+    codes[np.isnan(values)] = len(edges)
+    return pd.Categorical.from_codes(codes, categories=labels, ordered=True)
+
+
+def add_maturity_columns(df, as_of=None, edges=BUCKET_EDGES):
+    # Ajoute "Années avant maturité" et "MaturityBucket" (catégoriel ordonné) en une passe
+    years = tenor_years(df["Maturity"], as_of)
+    df[TENOR_COLUMN] = years
+    df[BUCKET_COLUMN] = pd.Series(maturity_buckets(years, edges), index=df.index)
+    return df
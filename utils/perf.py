@@ -0,0 +1,169 @@
+import os
+import io
+import sys
+import json
+import time
+import uuid
+import pstats
+import marshal
+import logging
+import cProfile
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime
+import pandas as pd
+
+# Instrumentation légère : spans nommés (durée, lignes, variation de mémoire) regroupés par
+# rendu de page, journalisés en JSON (logger "axes.perf") et affichés dans le panneau perf.
+# Hors d'un rendu (surveillant de data/, ingest.py), les spans ne vont qu'au journal.
+# AXES_PERF_LOG=1 (stderr) ou AXES_PERF_LOG=<fichier> : une ligne JSON par span et par rendu.
+
+logger = logging.getLogger("axes.perf")
+
+_current_run = contextvars.ContextVar("axes_perf_run", default=None)
+
+try:
+    import pyinstrument
+except ImportError:
+    pyinstrument = None
+
+PROFILERS = ["cprofile"] + (["pyinstrument"] if pyinstrument is not None else [])
+PROFILE_TOP = 30
+
+
+def configure_logging(target=None):
+    # Handler JSON brut (une ligne = un objet) ; sans cible, le journal perf reste muet
+    target = target if target is not None else os.environ.get("AXES_PERF_LOG")
+    if not target or logger.handlers:
+        return logger
+    handler = logging.StreamHandler(sys.stderr) if target in ("1", "stderr") else logging.FileHandler(target, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+def _emit(record):
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps(record, default=str, ensure_ascii=False))
+
+
+def rss_bytes():
+    # Mémoire résidente du process (Linux) ; None ailleurs. Process partagé par toutes les
+    # sessions : la variation d'un span inclut ce que font les autres sessions au même moment
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class Span:
+    def __init__(self, name, depth, rows=None):
+        self.name = name
+        self.depth = depth
+        self.rows = rows
+        self.ms = None
+        self.mem_delta_mb = None
+        self.rss_mb = None
+
+    def as_dict(self):
+        return {"name": self.name, "depth": self.depth, "ms": self.ms, "rows": self.rows,
+                "mem_delta_mb": self.mem_delta_mb, "rss_mb": self.rss_mb}
+
+
+class PerfRun:
+    # Spans d'un rendu, dans l'ordre d'ouverture
+    def __init__(self, page):
+        self.id = uuid.uuid4().hex[:8]
+        self.page = page
+        self.started_at = datetime.now()
+        self.spans = []
+        self.total_ms = None
+        self.profile = None
+        self._depth = 0
+
+    def table(self):
+        rows = [span.as_dict() for span in self.spans]
+        df = pd.DataFrame(rows, columns=["name", "depth", "ms", "rows", "mem_delta_mb", "rss_mb"])
+        df["Étape"] = ["  " * depth + name for depth, name in zip(df["depth"], df["name"])]
+        df["% du rendu"] = (df["ms"] / self.total_ms * 100).round(1) if self.total_ms else None
+        return df.rename(columns={"rows": "Lignes", "mem_delta_mb": "Δ mémoire (Mo)"})[
+            ["Étape", "ms", "% du rendu", "Lignes", "Δ mémoire (Mo)"]
+        ]
+
+
+@contextmanager
+def span(name, rows=None):
+    # with span("filter_axes.filter") as s: ... ; s.rows = len(resultat)
+    run = _current_run.get()
+    current = Span(name, run._depth if run is not None else 0, rows)
+    if run is not None:
+        run.spans.append(current)
+        run._depth += 1
+    rss_before = rss_bytes()
+    start = time.perf_counter()
+    try:
+        yield current
+    finally:
+        current.ms = round((time.perf_counter() - start) * 1000, 2)
+        rss_after = rss_bytes()
+        if rss_after is not None:
+            current.rss_mb = round(rss_after / 2 ** 20, 1)
+            current.mem_delta_mb = round((rss_after - rss_before) / 2 ** 20, 1)
+        if run is not None:
+            run._depth -= 1
+        _emit({"event": "span", "run": run.id if run is not None else None,
+               "page": run.page if run is not None else None, **current.as_dict()})
+
+
+def _start_profiler(kind):
+    if kind == "pyinstrument" and pyinstrument is not None:
+        profiler = pyinstrument.Profiler()
+    else:
+        profiler = cProfile.Profile()
+    try:
+        if isinstance(profiler, cProfile.Profile):
+            profiler.enable()
+        else:
+            profiler.start()
+    except (ValueError, RuntimeError):
+        # Un autre profilage est déjà actif dans le process (autre session) : rendu non profilé
+        return None
+    return profiler
+
+
+def _stop_profiler(profiler):
+    # -> {"kind", "text" (résumé), "data" (fichier téléchargeable), "file_name"}
+    if isinstance(profiler, cProfile.Profile):
+        profiler.disable()
+        out = io.StringIO()
+        stats = pstats.Stats(profiler, stream=out)
+        stats.sort_stats("cumulative").print_stats(PROFILE_TOP)
+        # Même format que Stats.dump_stats : relisible par pstats / snakeviz
+        return {"kind": "cprofile", "text": out.getvalue(), "data": marshal.dumps(stats.stats), "file_name": "rerun.prof"}
+    profiler.stop()
+    return {"kind": "pyinstrument", "text": profiler.output_text(unicode=True),
+            "data": profiler.output_html().encode(), "file_name": "rerun.html"}
+
+
+@contextmanager
+def perf_run(page, profile=None):
+    # Un rendu de page ; profile="cprofile" / "pyinstrument" pour profiler ce rendu seulement
+    run = PerfRun(page)
+    token = _current_run.set(run)
+    profiler = _start_profiler(profile) if profile else None
+    start = time.perf_counter()
+    try:
+        yield run
+    finally:
+        run.total_ms = round((time.perf_counter() - start) * 1000, 2)
+        if profiler is not None:
+            run.profile = _stop_profiler(profiler)
+        _current_run.reset(token)
+        _emit({"event": "rerun", "run": run.id, "page": page, "ms": run.total_ms,
+               "spans": len(run.spans), "profiled": profile})
+
+
+configure_logging()
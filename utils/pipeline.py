@@ -0,0 +1,101 @@
+import pandas as pd
+import numpy as np
+from utils.data_loader import normalize_axes_columns
+from utils.maturity import add_maturity_columns
+from utils.filter_engine import add_filter_flags
+from utils.schema import compact_axes
+from utils.data_quality import swap_inverted, implausible_yield
+from utils.best_execution import DEFAULT_POLICY, select_best
+from utils.classification import (
+    IG_RATINGS, CROSSOVER_RATINGS, HY_RATINGS, JUNK_RATINGS, classify_sector, classify_ratings
+)
+
+# Pipeline de nettoyage des axes, sans dépendance à Streamlit
+
+
+def classify_rating_cat(fitch, moodys):
+    # Version scalaire (une ligne) ; clean_axes utilise classify_ratings, vectorisée
+    rating = fitch if pd.notna(fitch) and str(fitch).strip().lower() != "nan" else moodys
+    if pd.isna(rating) or str(rating).strip() == "":
+        return "Not Rated"
+
+    rating = str(rating).upper().strip()
+
+    if rating in IG_RATINGS:
+        return "Investment Grade"
+    elif rating in CROSSOVER_RATINGS:
+        return "Crossover"
+    elif rating in HY_RATINGS:
+        return "High Yield"
+    elif rating in JUNK_RATINGS:
+        return "Junk"
+    else:
+        return "Not Rated"
+
+
+def clean_axes(df, as_of=None):
+    # Données brutes (feuilles concaténées) -> une ligne par (ISIN, Dealer) nettoyée
+    df = normalize_axes_columns(df)
+
+    df = df[df["AXE_Offer_Price"].notna()].copy()
+
+    # Corriger les inversions yield/price (mêmes règles que le contrôle qualité)
+    prix = pd.to_numeric(df["AXE_Offer_Price"], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    yld = pd.to_numeric(df["AXE_Offer_YLD"], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    if "Stream_Offer_Price" in df.columns:
+        stream = pd.to_numeric(df["Stream_Offer_Price"], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+        prix, yld, _ = swap_inverted(prix, stream, yld)
+
+    df.drop(columns=["Stream_Offer_Price"], errors="ignore", inplace=True)
+
+    df["AXE_Offer_Price"] = prix
+    df["AXE_Offer_YLD"] = np.abs(yld) * 100
+
+    # Nettoyage YLD aberrants
+    df["AXE_Offer_YLD"] = df["AXE_Offer_YLD"].where(~implausible_yield(prix, df["AXE_Offer_YLD"].to_numpy()))
+
+    df["AXE_Offer_QTY"] = pd.to_numeric(df["AXE_Offer_QTY"], errors="coerce")
+
+    # Calcul Mid et spread
+    df["Composite_Offer_Price"] = df["TW_Offer_Price"]
+    df["Composite_Bid_Price"] = df["TW_Bid_Price"]
+    df["Mid_Price"] = (df["Composite_Offer_Price"] + df["Composite_Bid_Price"]) / 2
+    df["Axe_Mid_Spread"] = df["AXE_Offer_Price"] - df["Mid_Price"]
+    df.drop(columns=["TW_Offer_Price", "TW_Bid_Price"], inplace=True, errors="ignore")
+
+    df["Maturity"] = pd.to_datetime(df["Maturity"], errors="coerce").dt.normalize()
+
+    # Tenor et bucket de maturité, figés à la date du snapshot
+    df = add_maturity_columns(df, as_of=as_of)
+
+    # Calcul secteur et sous-secteur (une fois par sous-secteur distinct)
+    df["Sub_Sector"] = df["Sector"]
+    df["Sector"] = classify_sector(df["Sub_Sector"])
+
+    # Rating Category + échelle de notches Fitch/Moody's
+    df["Rating_Category"], df["Rating_Score"] = classify_ratings(df)
+
+    # Drapeaux 144A / scrap pour les filtres
+    return add_filter_flags(df)
+
+
+def select_best_axes(df, policy=DEFAULT_POLICY):
+    # Une ligne par ISIN : le dealer retenu par la politique (par défaut le meilleur rendement),
+    # avec les dealers / 2e dealers de toutes les politiques en colonnes
+    df = select_best(df, policy=policy)
+    df.rename(columns={"Dealer": "Best_Dealer"}, inplace=True)
+
+    # Arrondis (y compris les copies par politique "<col>__<politique>")
+    for col in df.columns:
+        base = col.split("__")[0]
+        if base.startswith("AXE_Offer_") and "SPD" in base:
+            df[col] = np.ceil(pd.to_numeric(df[col], errors="coerce"))
+        elif base in ["AXE_Offer_Price", "AXE_Offer_YLD", "AXE_Offer_QTY", "Composite_Offer_Price", "Composite_Bid_Price", "Mid_Price", "Axe_Mid_Spread"]:
+            df[col] = pd.to_numeric(df[col], errors="coerce").round(2)
+    return df
+
+
+def build_axes_frames(df_raw, as_of=None):
+    # Schéma compact (catégoriels, float32 exacts, Maturity en datetime64) sur les deux frames
+    df_full = compact_axes(clean_axes(df_raw, as_of=as_of))
+    return df_full, compact_axes(select_best_axes(df_full))
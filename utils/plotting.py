@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Nuages de points volumineux : WebGL au-delà de WEBGL_THRESHOLD points, et au-delà de
+# MAX_POINTS un point représentatif (réel, avec son hover) par cellule de grille et par couleur.
+
+WEBGL_THRESHOLD = 1000
+MAX_POINTS = 10000
+GRID_BINS = 256
+POINTS_COLUMN = "Points représentés"
+
+
+def render_mode(n_points, threshold=WEBGL_THRESHOLD):
+    return "webgl" if n_points > threshold else "svg"
+
+
+def scatter_trace(n_points, threshold=WEBGL_THRESHOLD):
+    # Classe de trace go.* à utiliser pour n_points
+    return go.Scattergl if n_points > threshold else go.Scatter
+
+
+OUTLIER_QUANTILE = 0.001
+
+
+def _grid_codes(values, bins):
+    # Grille sur le cœur de la distribution ; les valeurs extrêmes -> -1 (gardées telles quelles)
+    values = np.asarray(values, dtype=float)
+    lo, hi = np.nanquantile(values, [OUTLIER_QUANTILE, 1 - OUTLIER_QUANTILE])
+    if not hi > lo:
+        return np.where(values == lo, 0, -1)
+    codes = np.minimum(((np.clip(values, lo, hi) - lo) / (hi - lo) * bins).astype(np.int64), bins - 1)
+    codes[(values < lo) | (values > hi)] = -1
+    return codes
+
+
+def downsample_points(df, x, y, color=None, max_points=MAX_POINTS, bins=GRID_BINS):
+    # Garde le premier point de chaque cellule (couleur, x, y) et tous les points extrêmes ;
+    # la grille est élargie (cellules plus grandes) jusqu'à passer sous max_points.
+    # Ajoute le nombre de points représentés.
+    if len(df) <= max_points:
+        return df
+
+    colors = pd.factorize(df[color])[0] + 1 if color is not None else np.zeros(len(df), dtype=np.int64)
+    while True:
+        gx, gy = _grid_codes(df[x], bins), _grid_codes(df[y], bins)
+        cells = (colors * bins + gx) * bins + gy
+        outliers = (gx < 0) | (gy < 0)
+        cells[outliers] = cells.max() + 1 + np.arange(outliers.sum())
+        _, first, counts = np.unique(cells, return_index=True, return_counts=True)
+        if len(first) <= max_points or bins <= 2:
+            break
+        bins = int(bins / 1.25)
+
+    order = np.argsort(first)
+    return df.iloc[first[order]].assign(**{POINTS_COLUMN: counts[order]})
+
+
+def scatter(df, x, y, color=None, hover_data=None, max_points=MAX_POINTS, **kwargs):
+    # px.scatter avec rendu WebGL / échantillonnage automatiques -> (figure, nb de points affichés)
+    plot_df = downsample_points(df, x, y, color, max_points=max_points)
+    hover_data = list(hover_data or [])
+    if POINTS_COLUMN in plot_df.columns:
+        hover_data.append(POINTS_COLUMN)
+    fig = px.scatter(plot_df, x=x, y=y, color=color, hover_data=hover_data,
+                     render_mode=render_mode(len(plot_df)), **kwargs)
+    return fig, len(plot_df)
+
+
+def sampling_note(shown, total):
+    if shown >= total:
+        return None
+    return f"{shown} points affichés sur {total} : un point représentatif par zone du graphique (voir « {POINTS_COLUMN} » au survol)."
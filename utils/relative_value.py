@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+from utils.spread_curves import group_median
+
+# Valeur relative de chaque ligne des meilleurs axes, pour tout l'univers en une passe :
+# écart du spread à la médiane de ses pairs (même secteur, catégorie de notation et tranche
+# de maturité), z-score robuste dans le panier (MAD normalisée) et rang dans le panier
+# (1 = le plus large, donc le moins cher). Opérations groupées NumPy, pas de boucle par émetteur.
+
+RV_METRICS = ["AXE_Offer_BMK_SPD", "AXE_Offer_Z-SPD"]
+PEER_KEYS = ["Sector", "Rating_Category", "MaturityBucket"]
+# Panier trop petit pour un z-score / un rang significatif
+MIN_PEERS = 5
+
+
+def peer_buckets(df, keys=PEER_KEYS):
+    # Identifiant de panier par ligne (-1 si une clé manque) -> (codes, nombre de paniers)
+    codes = []
+    for col in keys:
+        values = df[col]
+        col_codes = values.cat.codes.to_numpy() if isinstance(values.dtype, pd.CategoricalDtype) else pd.factorize(values)[0]
+        codes.append(col_codes.astype(np.int64))
+    valid = np.logical_and.reduce([c >= 0 for c in codes])
+    shape = tuple(int(c.max()) + 1 if len(c) else 1 for c in codes)
+    flat = np.full(len(df), -1, dtype=np.int64)
+    flat[valid] = np.ravel_multi_index([np.maximum(c[valid], 0) for c in codes], shape)
+    # Paniers renumérotés 0..n-1 (seulement ceux observés)
+    used, buckets = np.unique(flat[valid], return_inverse=True)
+    out = np.full(len(df), -1, dtype=np.int64)
+    out[valid] = buckets
+    return out, len(used)
+
+
+def _group_rank(codes, n_groups, values):
+    # Rang décroissant dans le groupe (1 = valeur la plus haute)
+    order = np.argsort(-values, kind="stable")
+    order = order[np.argsort(codes[order], kind="stable")]
+    counts = np.bincount(codes, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    ranks = np.empty(len(values), dtype=np.int64)
+    ranks[order] = np.arange(len(values)) - np.repeat(starts, counts) + 1
+    return ranks
+
+
+def relative_value(df, metrics=RV_METRICS, keys=PEER_KEYS):
+    # -> frame aligné sur df : panier, puis par mesure médiane des pairs, écart, z-score, rang
+    buckets, n_buckets = peer_buckets(df, keys)
+    out = {"Peer_Bucket": buckets}
+    for metric in metrics:
+        values = df[metric].to_numpy(dtype="float64", na_value=np.nan)
+        ok = (buckets >= 0) & np.isfinite(values)
+        codes, x = buckets[ok], values[ok]
+
+        peers = np.bincount(codes, minlength=n_buckets)
+        median = group_median(codes, n_buckets, x)
+        residual = x - median[codes]
+        scale = 1.4826 * group_median(codes, n_buckets, np.abs(residual))
+        enough = (peers >= MIN_PEERS)[codes]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            z = np.where(enough & (scale[codes] > 0), residual / scale[codes], np.nan)
+        rank = np.where(enough, _group_rank(codes, n_buckets, x), -1)
+
+        for name, column, fill in [("peers", peers[codes], 0), ("peer_median", median[codes], np.nan),
+                                   ("resid", residual, np.nan), ("z", z, np.nan), ("rank", rank, -1)]:
+            full = np.full(len(df), fill, dtype=column.dtype)
+            full[ok] = column
+            out[f"{metric}__{name}"] = full
+    rv = pd.DataFrame(out, index=df.index)
+    # Rang manquant (panier trop petit, spread absent) : entier nullable
+    for metric in metrics:
+        rv[f"{metric}__rank"] = rv[f"{metric}__rank"].astype("Int32").mask(rv[f"{metric}__rank"] < 0)
+    return rv
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+# Index des lignes par valeur de colonne, construit une fois par snapshot :
+# une recherche devient une tranche d'offsets (taille du groupe) au lieu d'un scan complet.
+
+INDEX_COLUMNS = ["ISIN", "IssuerName", "Sector", "Sub_Sector", "Rating_Category"]
+
+
+class GroupIndex:
+    def __init__(self, values):
+        codes, uniques = pd.factorize(values, sort=True)
+        valid = codes >= 0
+        # Positions triées par groupe ; l'ordre d'origine est conservé dans chaque groupe
+        self.order = np.flatnonzero(valid)[np.argsort(codes[valid], kind="stable")]
+        counts = np.bincount(codes[valid], minlength=len(uniques))
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+        self.keys = list(uniques)
+        self.lookup = {key: i for i, key in enumerate(self.keys)}
+
+    def positions(self, key):
+        i = self.lookup.get(key)
+        if i is None:
+            return self.order[:0]
+        return self.order[self.offsets[i]:self.offsets[i + 1]]
+
+    def sizes(self):
+        return pd.Series(np.diff(self.offsets), index=self.keys)
+
+
+class SnapshotIndex:
+    def __init__(self, df, columns=INDEX_COLUMNS):
+        self.n_rows = len(df)
+        self.groups = {col: GroupIndex(df[col]) for col in columns if col in df.columns}
+
+    def matches(self, df):
+        return df is not None and len(df) == self.n_rows
+
+    def positions(self, column, key):
+        return self.groups[column].positions(key)
+
+    def keys(self, column):
+        return self.groups[column].keys
+
+    def take(self, df, column, key):
+        # Équivalent de df[df[column] == key], en O(taille du groupe)
+        if column not in self.groups or not self.matches(df):
+            return df[df[column] == key]
+        return df.iloc[self.positions(column, key)]
+
+
+def build_snapshot_indexes(df_full, df):
+    # Un index pour les lignes par dealer, un pour les meilleurs axes (mêmes positions
+    # quelle que soit la politique de best dealer appliquée ensuite)
+    return SnapshotIndex(df_full), SnapshotIndex(df)
+
+
+def take_rows(df, index, column, key):
+    if index is None:
+        return df[df[column] == key]
+    return index.take(df, column, key)
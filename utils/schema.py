@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+
+# Schéma compact des frames d'axes, appliqué une fois à l'ingestion :
+# catégoriels pour les chaînes peu distinctes, float32 / petits entiers quand la conversion
+# est exacte (aucune valeur modifiée), float64 sinon, datetime64[s] pour Maturity, booléens
+# pour les drapeaux. Les copies par politique ("<col>__<politique>") suivent la règle de
+# leur colonne de base. Le frame canonique (schéma vérifié + colonnes dérivées présentes)
+# est partagé en lecture seule : les pages n'ont ni copie ni conversion à refaire.
+
+CATEGORY_COLUMNS = [
+    "Dealer", "Best_Dealer", "Runner_Up_Dealer", "IssuerName", "Ticker", "Sector", "Sub_Sector",
+    "Currency", "CouponType", "FitchRating", "Moody's_rating", "Rating_Category"
+]
+
+FLOAT32_COLUMNS = [
+    "AXE_Offer_YLD", "AXE_Offer_BMK_SPD", "AXE_Offer_Z-SPD", "AXE_Offer_I-SPD", "AXE_Offer_ASW",
+    "Axe_Mid_Spread", "Rating_Score", "Années avant maturité"
+]
+
+FLOAT_COLUMNS = ["AXE_Offer_Price", "Composite_Bid_Price", "Composite_Offer_Price", "Mid_Price"]
+
+INTEGER_COLUMNS = ["AXE_Offer_QTY", "Nb_Dealers_AXE"]
+
+DATETIME_COLUMNS = ["Maturity"]
+
+BOOL_COLUMNS = ["Is_144A", "Is_Scrap"]
+
+# Calculées une fois à l'ingestion (date du fichier), jamais par les pages
+DERIVED_COLUMNS = ["Années avant maturité", "MaturityBucket", "Mid_Price", "Axe_Mid_Spread", "Is_144A", "Is_Scrap"]
+
+
+def _base(col):
+    return col.split("__")[0]
+
+
+def _to_float32(series):
+    values = pd.to_numeric(series, errors="coerce").to_numpy(dtype=float)
+    compact = values.astype(np.float32)
+    if np.array_equal(compact.astype(float), values, equal_nan=True):
+        return pd.Series(compact, index=series.index)
+    return series if pd.api.types.is_float_dtype(series) else pd.Series(values, index=series.index)
+
+
+def _to_float(series):
+    if pd.api.types.is_float_dtype(series):
+        return series
+    return pd.to_numeric(series, errors="coerce").astype("float64")
+
+
+def _to_small_int(series):
+    if not pd.api.types.is_integer_dtype(series):
+        return _to_float(series)
+    return pd.to_numeric(series, downcast="integer")
+
+
+def drop_unused_categories(series):
+    # remove_unused_categories par comptage des codes (sans tri) ; même résultat que
+    # astype("category") sur les valeurs, quel que soit le chemin (complet ou incrémental)
+    codes = series.cat.codes.to_numpy()
+    used = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories)) > 0
+    if used.all():
+        return series
+    remap = np.cumsum(used) - 1
+    codes = np.where(codes >= 0, remap[codes], -1)
+    return pd.Series(pd.Categorical.from_codes(codes, series.cat.categories[used]), index=series.index, name=series.name)
+
+
+def _to_category(series):
+    # Catégories = valeurs présentes : un sous-ensemble de lignes (meilleurs axes) ne garde
+    # pas les dealers / émetteurs des seules autres lignes
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series if series.cat.ordered else drop_unused_categories(series)
+    return series.astype("category")
+
+
+def _to_datetime(series):
+    # Seconde : couvre les maturités lointaines (an 3000+) hors de portée des nanosecondes
+    if series.dtype == "datetime64[s]":
+        return series
+    return pd.to_datetime(series, errors="coerce").astype("datetime64[s]")
+
+
+def _to_bool(series):
+    if pd.api.types.is_bool_dtype(series):
+        return series
+    return series.fillna(False).astype(bool)
+
+
+def compact_axes(df):
+    # Nouveau DataFrame au schéma compact ; les colonnes absentes du schéma sont inchangées
+    rules = [
+        (CATEGORY_COLUMNS, _to_category),
+        (FLOAT32_COLUMNS, _to_float32),
+        (FLOAT_COLUMNS, _to_float),
+        (INTEGER_COLUMNS, _to_small_int),
+        (DATETIME_COLUMNS, _to_datetime),
+        (BOOL_COLUMNS, _to_bool),
+    ]
+    converted = {}
+    for col in df.columns:
+        for columns, convert in rules:
+            if _base(col) in columns:
+                converted[col] = convert(df[col])
+                break
+    return df.assign(**converted)
+
+
+_SCHEMA_CHECKS = [
+    (CATEGORY_COLUMNS, lambda dtype: isinstance(dtype, pd.CategoricalDtype), "catégoriel"),
+    (FLOAT32_COLUMNS + FLOAT_COLUMNS + INTEGER_COLUMNS,
+     lambda dtype: pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype), "numérique"),
+    (DATETIME_COLUMNS, lambda dtype: dtype == "datetime64[s]", "datetime64[s]"),
+    (BOOL_COLUMNS, pd.api.types.is_bool_dtype, "booléen"),
+]
+
+
+def schema_problems(df):
+    # Colonne -> écart au schéma canonique (type attendu, colonne dérivée absente)
+    problems = {col: "colonne dérivée absente" for col in DERIVED_COLUMNS if col not in df.columns}
+    for col in df.columns:
+        for columns, check, expected in _SCHEMA_CHECKS:
+            if _base(col) in columns:
+                if not check(df[col].dtype):
+                    problems[col] = f"{df[col].dtype} au lieu de {expected}"
+                break
+    return problems
+
+
+def canonical_axes(df):
+    # Frame conforme : renvoyé tel quel (aucune copie) ; sinon schéma réappliqué une fois
+    if not schema_problems(df):
+        return df
+    df = compact_axes(df)
+    problems = schema_problems(df)
+    if problems:
+        raise ValueError(f"Frame d'axes hors schéma : {problems}")
+    return df
+
+
+def memory_report(before, after):
+    # Mémoire par colonne (Mo), avant / après application du schéma
+    mb_before = before.memory_usage(index=False, deep=True) / 2 ** 20
+    mb_after = after.memory_usage(index=False, deep=True).reindex(mb_before.index) / 2 ** 20
+    report = pd.DataFrame({
+        "dtype avant": before.dtypes.astype(str),
+        "dtype après": after.dtypes.reindex(before.columns).astype(str),
+        "Mo avant": mb_before.round(3),
+        "Mo après": mb_after.round(3),
+    })
+    report.loc["Total"] = ["", "", round(mb_before.sum(), 3), round(mb_after.sum(), 3)]
+    return report
@@ -0,0 +1,79 @@
+import difflib
+import numpy as np
+import pandas as pd
+
+# Index de recherche émetteur / ISIN construit une fois par snapshot :
+# libellés "Émetteur – ISIN" triés, libellé -> ISIN, recherche préfixe / sous-chaîne / approchée
+# sur émetteur, ticker, ISIN et Bond ID.
+
+SEARCH_FIELDS = ["IssuerName", "Ticker", "ISIN", "Bond ID"]
+LABEL_SEPARATOR = " – "
+
+
+def _lower(values):
+    return np.asarray(pd.Series(values).astype(str).str.lower(), dtype=str)
+
+
+class SearchIndex:
+    def __init__(self, df):
+        rows = df[[col for col in SEARCH_FIELDS if col in df.columns]].dropna(subset=["IssuerName", "ISIN"])
+        # Ticker / Bond ID manquants : chaîne vide (astype(str) donnerait "nan", trouvé par la saisie "nan")
+        rows = rows.astype(str).where(rows.notna().to_numpy(), "").drop_duplicates(subset=["IssuerName", "ISIN"])
+        labels = (rows["IssuerName"] + LABEL_SEPARATOR + rows["ISIN"]).to_numpy(dtype=str)
+        order = np.argsort(labels, kind="stable")
+        rows = rows.iloc[order]
+
+        self.labels = labels[order].tolist()
+        self.isins = rows["ISIN"].to_numpy(dtype=str)
+        self.label_to_isin = dict(zip(self.labels, self.isins.tolist()))
+        self.issuers = sorted(rows["IssuerName"].unique())
+
+        self._fields = {col: _lower(rows[col]) for col in rows.columns}
+        others = [rows[col] for col in rows.columns if col != "IssuerName"]
+        self._haystack = _lower(rows["IssuerName"].str.cat(others, sep=" "))
+        self._names = {}
+        for col in ["IssuerName", "Ticker"]:
+            if col in self._fields:
+                for i, name in enumerate(self._fields[col]):
+                    if name:
+                        self._names.setdefault(name, []).append(i)
+
+    def isin(self, label):
+        return self.label_to_isin.get(label)
+
+    def _allowed(self, isins):
+        # Masque des libellés dont l'ISIN est dans `isins` (tous si None)
+        if isins is None:
+            return np.ones(len(self.labels), dtype=bool)
+        return pd.Index(self.isins).isin(pd.Index(isins).astype(str))
+
+    def labels_for(self, isins):
+        # Libellés (triés) restreints à un ensemble d'ISINs, ex. le résultat filtré
+        return [label for label, k in zip(self.labels, self._allowed(isins)) if k]
+
+    def search(self, query, limit=200, fuzzy_cutoff=0.75, isins=None):
+        # Préfixe d'un champ d'abord, puis sous-chaîne, puis (si rien) correspondance approchée ;
+        # isins : restriction appliquée avant la limite (aucun résultat autorisé n'est perdu)
+        allowed = self._allowed(isins)
+        q = str(query).strip().lower()
+        if not q:
+            return [self.labels[i] for i in np.flatnonzero(allowed)[:limit]]
+
+        prefix = np.zeros(len(self.labels), dtype=bool)
+        for values in self._fields.values():
+            prefix |= np.char.startswith(values, q)
+        prefix &= allowed
+        substring = (np.char.find(self._haystack, q) >= 0) & allowed
+        hits = np.concatenate([np.flatnonzero(prefix), np.flatnonzero(substring & ~prefix)])
+
+        if len(hits) == 0:
+            # Approchée : la saisie est comparée au début de même longueur de chaque nom / ticker
+            starts = {}
+            for name, positions in self._names.items():
+                positions = [i for i in positions if allowed[i]]
+                if positions:
+                    starts.setdefault(name[:len(q)], []).extend(positions)
+            close = difflib.get_close_matches(q, list(starts), n=10, cutoff=fuzzy_cutoff)
+            hits = np.array(sorted({i for start in close for i in starts[start]}), dtype=int)
+
+        return [self.labels[i] for i in hits[:limit]]
@@ -0,0 +1,70 @@
+import os
+import streamlit as st
+from utils.snapshot_registry import SnapshotRegistry
+from utils.data_watcher import DataWatcher, WATCH_INTERVAL
+
+# Lien entre les sessions Streamlit et le registre partagé : la session ne stocke que
+# le chemin du snapshot choisi, la version épinglée (et ses filtres), jamais les DataFrames.
+# Une version plus récente chargée par le surveillant de data/ est signalée, pas imposée.
+
+
+@st.cache_resource
+def shared_registry():
+    registry = SnapshotRegistry()
+    DataWatcher(registry).start()
+    return registry
+
+
+def current_snapshot():
+    path = st.session_state.get("snapshot_path")
+    if path is None or not os.path.exists(path):
+        return None
+    registry = shared_registry()
+    # Version épinglée par la session, tant qu'elle est en mémoire
+    snapshot = registry.by_key(st.session_state.get("snapshot_key"))
+    if snapshot is None or snapshot.key[0] != os.path.abspath(path):
+        snapshot = registry.get(path)
+        st.session_state.snapshot_key = snapshot.key
+    return snapshot
+
+
+def pending_update():
+    # Version plus récente du classeur affiché, ou classeur d'une date plus récente
+    # si la session suit le dernier snapshot
+    snapshot = current_snapshot()
+    if snapshot is None:
+        return None
+    registry = shared_registry()
+    newer = registry.current(snapshot.path)
+    if newer is not None and newer.key[1] > snapshot.key[1]:
+        return newer
+    latest = registry.latest()
+    if st.session_state.get("follow_latest", True) and latest is not None and latest.date > snapshot.date:
+        return latest
+    return None
+
+
+def accept_update(snapshot):
+    st.session_state.snapshot_path = snapshot.path
+    st.session_state.snapshot_key = snapshot.key
+
+
+def _update_banner():
+    snapshot = pending_update()
+    if snapshot is None:
+        return
+    col1, col2 = st.columns([5, 1])
+    with col1:
+        st.info(f"🔄 Nouvelles données disponibles : axes du {snapshot.date.strftime('%d/%m/%Y')} "
+                f"({len(snapshot.df)} lignes).")
+    with col2:
+        if st.button("Charger", key="accept_update"):
+            accept_update(snapshot)
+            st.rerun()
+
+
+# Bandeau réévalué périodiquement sans relancer la page (si st.fragment est disponible)
+if hasattr(st, "fragment") and WATCH_INTERVAL > 0:
+    update_banner = st.fragment(run_every=WATCH_INTERVAL)(_update_banner)
+else:
+    update_banner = _update_banner
@@ -0,0 +1,94 @@
+import os
+import hashlib
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+# Cache colonnaire (Arrow IPC non compressé, donc memory-mappable) des feuilles Axes_*.xlsx
+CACHE_DIR_NAME = ".cache"
+KEY_LENGTH = 16
+
+
+def default_cache_dir(path):
+    return os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR_NAME)
+
+
+def cache_key(path):
+    # Clé = chemin absolu + mtime + taille : toute réécriture du classeur invalide le snapshot
+    stat = os.stat(path)
+    raw = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:KEY_LENGTH]
+
+
+def _prefix(path, sheet_name, tag=""):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    sheet = sheet_name.replace(" ", "_")
+    return f"{stem}__{sheet}__{tag}__" if tag else f"{stem}__{sheet}__"
+
+
+def snapshot_path(path, sheet_name, cache_dir=None, tag=""):
+    cache_dir = cache_dir or default_cache_dir(path)
+    return os.path.join(cache_dir, f"{_prefix(path, sheet_name, tag)}{cache_key(path)}.arrow")
+
+
+def _to_arrow(df):
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Colonnes Excel de types mélangés (ex. "N/A" au milieu de nombres) : on passe en texte
+        df = df.copy()
+        for col in df.columns:
+            if df[col].dtype == object:
+                df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+        return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def _purge_stale(path, sheet_name, cache_dir, keep, tag=""):
+    prefix = _prefix(path, sheet_name, tag)
+    for name in os.listdir(cache_dir):
+        # Même préfixe + clé seule : ne touche pas aux snapshots d'un autre tag
+        stale = name.startswith(prefix) and len(name) == len(prefix) + KEY_LENGTH + len(".arrow")
+        if stale and os.path.join(cache_dir, name) != keep:
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except OSError:
+                pass
+
+
+def read_sheet_cached(path, sheet_name, reader=None, cache_dir=None, tag=""):
+    # tag distingue les snapshots produits par des lecteurs différents (ex. lecture projetée)
+    cache_dir = cache_dir or default_cache_dir(path)
+    target = snapshot_path(path, sheet_name, cache_dir, tag)
+
+    if os.path.exists(target):
+        # Lecture zero-copy : les buffers numériques pointent directement dans le fichier mappé
+        table = feather.read_table(target, memory_map=True)
+        return table.to_pandas(split_blocks=True)
+
+    if reader is None:
+        df = pd.read_excel(path, sheet_name=sheet_name)
+    else:
+        df = reader(path, sheet_name)
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = f"{target}.{os.getpid()}.tmp"
+        feather.write_feather(_to_arrow(df), tmp, compression="uncompressed")
+        os.replace(tmp, target)
+        _purge_stale(path, sheet_name, cache_dir, keep=target, tag=tag)
+    except OSError:
+        # Dossier en lecture seule : on sert simplement la lecture Excel
+        pass
+
+    return df
+
+
+def clear_cache(cache_dir):
+    if not os.path.isdir(cache_dir):
+        return 0
+    removed = 0
+    for name in os.listdir(cache_dir):
+        if name.endswith(".arrow"):
+            os.remove(os.path.join(cache_dir, name))
+            removed += 1
+    return removed
@@ -0,0 +1,228 @@
+import os
+import threading
+from datetime import datetime
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from utils.data_loader import axes_file_date
+from utils.snapshot_store import load_axes_frames, read_quality
+from utils.best_execution import BEST_POLICIES, DEFAULT_POLICY, apply_best_policy
+from utils.row_index import build_snapshot_indexes
+from utils.filter_engine import FilterEngine
+from utils.search_index import SearchIndex
+from utils.schema import canonical_axes
+from utils.flux_cube import FluxCube
+from utils.spread_curves import SpreadCurves
+from utils.relative_value import relative_value
+from utils.perf import span
+
+# Registre des snapshots partagé par tout le process : chaque classeur daté est chargé
+# une seule fois, les sessions ne gardent que le chemin (et la version) du snapshot choisi.
+# Les DataFrames sont canoniques (schéma vérifié) et partagés en lecture seule : les pages
+# n'en font ni copie ni conversion, seulement des projections de colonnes et des sélections.
+# Un classeur re-livré donne une nouvelle version, construite à partir de la précédente
+# (rafraîchissement incrémental) ; les sessions ouvertes gardent la leur jusqu'à bascule.
+
+MAX_SNAPSHOTS = int(os.environ.get("AXES_MAX_SNAPSHOTS", 3))
+
+
+def snapshot_key(path):
+    # Un nouveau fichier (ou un fichier réécrit) donne une nouvelle clé
+    return os.path.abspath(path), os.stat(path).st_mtime_ns
+
+
+def _frame_bytes(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def _index_bytes(index):
+    return sum(g.order.nbytes + g.offsets.nbytes for g in index.groups.values())
+
+
+class Snapshot:
+    def __init__(self, path, df_full, df, raw_hashes=None, key=None):
+        self.path = path
+        self.key = key or snapshot_key(path)
+        self.date = axes_file_date(path)
+        self.df_full = canonical_axes(df_full)
+        self.df = canonical_axes(df)
+        self.raw_hashes = raw_hashes
+        with span("snapshot.row_indexes", rows=len(df_full)):
+            self.df_full_index, self.df_index = build_snapshot_indexes(self.df_full, self.df)
+        self._lock = threading.Lock()
+        self._best = {}
+        self._engines = {}
+        self._cubes = {}
+        self._curves = {}
+        self._relative_value = {}
+        self._search_index = None
+        self._quality = None
+
+    def _best_frame(self, policy):
+        # Meilleurs axes selon la politique, calculés une fois pour toutes les sessions
+        # (frame partagé par les moteurs, cubes et index : jamais remis aux pages tel quel)
+        policy = policy if policy in BEST_POLICIES else DEFAULT_POLICY
+        with self._lock:
+            if policy not in self._best:
+                with span(f"snapshot.best[{policy}]", rows=len(self.df)):
+                    self._best[policy] = apply_best_policy(self.df, policy)
+            return self._best[policy]
+
+    def best(self, policy=DEFAULT_POLICY):
+        # Vue propre à l'appelant (copie superficielle, colonnes partagées en copy-on-write) :
+        # une colonne ajoutée ou remplacée par une page ne touche pas le frame partagé
+        return self._best_frame(policy).copy(deep=False)
+
+    def filter_engine(self, policy=DEFAULT_POLICY):
+        df = self._best_frame(policy)
+        with self._lock:
+            if policy not in self._engines:
+                with span(f"snapshot.filter_engine[{policy}]", rows=len(df)):
+                    self._engines[policy] = FilterEngine(df)
+            return self._engines[policy]
+
+    def flux_cube(self, policy=DEFAULT_POLICY):
+        df = self._best_frame(policy)
+        with self._lock:
+            if policy not in self._cubes:
+                with span(f"snapshot.flux_cube[{policy}]", rows=len(df)):
+                    self._cubes[policy] = FluxCube(df)
+            return self._cubes[policy]
+
+    def spread_curves(self, policy=DEFAULT_POLICY):
+        # Courbes spread / maturité de tous les groupes, ajustées une fois par politique
+        df = self._best_frame(policy)
+        with self._lock:
+            if policy not in self._curves:
+                with span(f"snapshot.spread_curves[{policy}]", rows=len(df)):
+                    self._curves[policy] = SpreadCurves(df)
+            return self._curves[policy]
+
+    def relative_value(self, policy=DEFAULT_POLICY):
+        # Écarts aux pairs / z-scores / rangs, alignés sur best(policy)
+        df = self._best_frame(policy)
+        with self._lock:
+            if policy not in self._relative_value:
+                with span(f"snapshot.relative_value[{policy}]", rows=len(df)):
+                    self._relative_value[policy] = relative_value(df)
+            return self._relative_value[policy]
+
+    @property
+    def search_index(self):
+        # Libellés émetteur / ISIN de df_full, construits à la première recherche
+        with self._lock:
+            if self._search_index is None:
+                with span("snapshot.search_index", rows=len(self.df_full)):
+                    self._search_index = SearchIndex(self.df_full)
+            return self._search_index
+
+    def quality(self):
+        # Rapport qualité écrit avec le snapshot sur disque (None : snapshot non écrit ou
+        # classeur réécrit depuis le chargement), lu au premier affichage
+        with self._lock:
+            if self._quality is None:
+                fresh = os.path.exists(self.path) and snapshot_key(self.path) == self.key
+                with span("snapshot.quality"):
+                    self._quality = (read_quality(self.path) if fresh else None) or False
+            return self._quality or None
+
+    def memory_usage(self):
+        # Octets : frames (deep) + index ; les vues par politique partagent les colonnes de df
+        return {
+            "df_full": _frame_bytes(self.df_full),
+            "df": _frame_bytes(self.df),
+            "index": _index_bytes(self.df_full_index) + _index_bytes(self.df_index),
+        }
+
+
+def load_snapshot(path, previous=None):
+    # Snapshot prébâti par ingest.py si à jour, sinon pipeline (incrémental depuis `previous`).
+    # Clé relevée avant lecture : un fichier réécrit pendant le chargement sera rechargé.
+    key = snapshot_key(path)
+    if previous is not None:
+        previous = (previous.df_full, previous.df, previous.raw_hashes)
+    df_full, df, raw_hashes = load_axes_frames(path, previous=previous)
+    return Snapshot(path, df_full, df, raw_hashes, key=key)
+
+
+class SnapshotRegistry:
+    def __init__(self, loader=load_snapshot, max_snapshots=MAX_SNAPSHOTS):
+        self.loader = loader
+        self.max_snapshots = max_snapshots
+        self._snapshots = OrderedDict()
+        self._current = {}
+        self._loading = {}
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        # Version actuelle du fichier, chargée si besoin (bloquant)
+        key = snapshot_key(path)
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None:
+                self._snapshots.move_to_end(key)
+                return snapshot
+            # Un verrou par clé : les sessions simultanées attendent le même chargement
+            key_lock = self._loading.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                snapshot = self._snapshots.get(key)
+                previous = self._snapshots.get(self._current.get(key[0]))
+            if snapshot is None:
+                snapshot = self.loader(path, previous)
+                with self._lock:
+                    self._snapshots[snapshot.key] = snapshot
+                    self._loading.pop(key, None)
+                    # Bascule atomique de la version courante du fichier
+                    current = self._current.get(key[0])
+                    if current is None or current[1] <= snapshot.key[1]:
+                        self._current[key[0]] = snapshot.key
+                    while len(self._snapshots) > self.max_snapshots:
+                        evicted, _ = self._snapshots.popitem(last=False)
+                        if self._current.get(evicted[0]) == evicted:
+                            del self._current[evicted[0]]
+        return snapshot
+
+    def by_key(self, key):
+        # Version précise (celle qu'une session a épinglée), None si évincée
+        with self._lock:
+            return self._snapshots.get(tuple(key)) if key is not None else None
+
+    def current(self, path):
+        # Dernière version chargée du fichier, sans attendre un chargement en cours
+        with self._lock:
+            return self._snapshots.get(self._current.get(os.path.abspath(path)))
+
+    def latest(self):
+        # Snapshot chargé le plus récent (date du classeur, puis version)
+        with self._lock:
+            snapshots = [self._snapshots[key] for key in self._current.values()]
+        return max(snapshots, key=lambda snapshot: (snapshot.date, snapshot.key[1]), default=None)
+
+    def loaded_paths(self):
+        with self._lock:
+            return {path: key for path, key in self._current.items()}
+
+    def clear(self):
+        with self._lock:
+            self._snapshots.clear()
+            self._current.clear()
+
+    def memory_report(self):
+        with self._lock:
+            snapshots = list(self._snapshots.values())
+        rows = []
+        for snapshot in snapshots:
+            usage = snapshot.memory_usage()
+            rows.append({
+                "Snapshot": snapshot.date,
+                "Fichier": os.path.basename(snapshot.path),
+                "Version": datetime.fromtimestamp(snapshot.key[1] / 1e9).strftime("%d/%m %H:%M:%S"),
+                "Lignes (dealers)": len(snapshot.df_full),
+                "Lignes (ISIN)": len(snapshot.df),
+                "Politiques chargées": len(snapshot._best),
+                **{f"{name} (Mo)": np.round(size / 2 ** 20, 1) for name, size in usage.items()},
+                "Total (Mo)": np.round(sum(usage.values()) / 2 ** 20, 1),
+            })
+        return pd.DataFrame(rows)
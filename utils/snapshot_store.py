@@ -0,0 +1,192 @@
+import os
+import json
+from datetime import datetime
+import pyarrow as pa
+import pyarrow.feather as feather
+from utils.data_loader import list_axes_files, read_axes_workbook, axes_file_date
+from utils.pipeline import build_axes_frames
+from utils.incremental import row_hashes, incremental_axes_frames
+from utils.snapshot_cache import cache_key, _to_arrow
+from utils.data_quality import validate_axes, quality_counts, quarantine_table, raw_row_count
+from utils.perf import span
+
+# Snapshots nettoyés prêts à servir : data/snapshots/<Axes_YYYYMMDD>/{full,best}.arrow
+# (Arrow IPC non compressé, schéma compact conservé) + hashes des lignes brutes + rapport qualité
+# (comptes par règle dans le manifest, lignes en quarantaine dans quality.arrow) + manifest.json.
+# Un snapshot est valide tant que le classeur source et PIPELINE_VERSION sont inchangés ;
+# périmé (classeur re-livré), il sert de base au rafraîchissement incrémental.
+
+SNAPSHOTS_DIR_NAME = "snapshots"
+MANIFEST_NAME = "manifest.json"
+FRAME_FILES = {"df_full": "full.arrow", "df": "best.arrow"}
+HASHES_FILE = "raw_hashes.arrow"
+QUALITY_FILE = "quality.arrow"
+
+# À incrémenter quand le nettoyage ou le schéma change : invalide les snapshots écrits
+PIPELINE_VERSION = 4
+
+
+def default_snapshots_dir(data_dir="data"):
+    return os.path.join(data_dir, SNAPSHOTS_DIR_NAME)
+
+
+def snapshot_dir(path, snapshots_dir=None):
+    snapshots_dir = snapshots_dir or default_snapshots_dir(os.path.dirname(os.path.abspath(path)))
+    return os.path.join(snapshots_dir, os.path.splitext(os.path.basename(path))[0])
+
+
+def _read_manifest(target):
+    try:
+        with open(os.path.join(target, MANIFEST_NAME), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_fresh(path, snapshots_dir=None):
+    manifest = _read_manifest(snapshot_dir(path, snapshots_dir))
+    return (manifest is not None
+            and manifest.get("source_key") == cache_key(path)
+            and manifest.get("pipeline_version") == PIPELINE_VERSION)
+
+
+def _write_table(table, dest):
+    tmp = f"{dest}.{os.getpid()}.tmp"
+    feather.write_feather(table, tmp, compression="uncompressed")
+    os.replace(tmp, dest)
+
+
+def write_snapshot(path, df_full, df, snapshots_dir=None, raw_hashes=None, quality=None):
+    target = snapshot_dir(path, snapshots_dir)
+    os.makedirs(target, exist_ok=True)
+    # Manifest retiré d'abord : un snapshot en cours de réécriture n'est jamais lu
+    try:
+        os.remove(os.path.join(target, MANIFEST_NAME))
+    except OSError:
+        pass
+    for name, frame in [("df_full", df_full), ("df", df)]:
+        _write_table(pa.Table.from_pandas(frame), os.path.join(target, FRAME_FILES[name]))
+    if raw_hashes is not None:
+        _write_table(pa.table({"hash": raw_hashes}), os.path.join(target, HASHES_FILE))
+    if quality is not None:
+        _write_table(_to_arrow(quality["quarantine"]), os.path.join(target, QUALITY_FILE))
+
+    # Manifest écrit en dernier : un snapshot incomplet n'est jamais considéré valide
+    manifest = {
+        "source": os.path.basename(path),
+        "source_key": cache_key(path),
+        "pipeline_version": PIPELINE_VERSION,
+        "date": axes_file_date(path).isoformat(),
+        "rows_full": len(df_full),
+        "rows_best": len(df),
+        "raw_hashes": raw_hashes is not None,
+        "quality": {"rows": quality["rows"], "counts": quality["counts"]} if quality is not None else None,
+        "built_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    tmp = os.path.join(target, f"{MANIFEST_NAME}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(target, MANIFEST_NAME))
+    return target
+
+
+def read_snapshot(path, snapshots_dir=None, stale=False):
+    # -> (df_full, df, hashes des lignes brutes ou None) si le snapshot est à jour, sinon None ;
+    # stale=True accepte un snapshot d'une version précédente du classeur (même PIPELINE_VERSION)
+    target = snapshot_dir(path, snapshots_dir)
+    manifest = _read_manifest(target)
+    if manifest is None or manifest.get("pipeline_version") != PIPELINE_VERSION:
+        return None
+    if not stale and manifest.get("source_key") != cache_key(path):
+        return None
+    try:
+        df_full, df = (
+            feather.read_table(os.path.join(target, FRAME_FILES[name]), memory_map=True).to_pandas()
+            for name in ["df_full", "df"]
+        )
+        raw_hashes = None
+        if manifest.get("raw_hashes"):
+            raw_hashes = feather.read_table(os.path.join(target, HASHES_FILE)).column("hash").to_numpy()
+    except (OSError, KeyError, pa.ArrowInvalid):
+        return None
+    return df_full, df, raw_hashes
+
+
+def read_quality(path, snapshots_dir=None):
+    # -> (comptes par règle, lignes en quarantaine) du snapshot à jour, sinon None
+    target = snapshot_dir(path, snapshots_dir)
+    manifest = _read_manifest(target)
+    if (manifest is None or manifest.get("pipeline_version") != PIPELINE_VERSION
+            or manifest.get("source_key") != cache_key(path) or not manifest.get("quality")):
+        return None
+    try:
+        quarantine = feather.read_table(os.path.join(target, QUALITY_FILE)).to_pandas()
+    except (OSError, pa.ArrowInvalid):
+        return None
+    quality = manifest["quality"]
+    return quality_counts(quality["counts"], quality["rows"]), quarantine
+
+
+def validate_frame(df_raw, as_of):
+    # Contrôle qualité des lignes brutes -> rapport écrit avec le snapshot
+    bits, counts = validate_axes(df_raw, as_of)
+    return {"rows": raw_row_count(df_raw), "counts": counts, "quarantine": quarantine_table(df_raw, bits)}
+
+
+def build_frames(path, previous=None, max_workers=None):
+    # Pipeline sur le classeur -> (df_full, df, hashes, rapport qualité) ; incrémental si
+    # `previous` (df_full, df, hashes d'une version précédente du même classeur) est fourni
+    with span("ingest.excel_parse") as s:
+        df_raw = read_axes_workbook(path, max_workers=max_workers)
+        s.rows = len(df_raw)
+    with span("ingest.row_hashes", rows=len(df_raw)):
+        raw_hashes = row_hashes(df_raw)
+    as_of = axes_file_date(path)
+    with span("ingest.validate", rows=len(df_raw)):
+        quality = validate_frame(df_raw, as_of)
+    if previous is not None and previous[2] is not None:
+        with span("ingest.incremental") as s:
+            df_full, df, s.rows = incremental_axes_frames(df_raw, raw_hashes, *previous, as_of=as_of)
+    else:
+        with span("ingest.pipeline") as s:
+            df_full, df = build_axes_frames(df_raw, as_of=as_of)
+            s.rows = len(df_full)
+    return df_full, df, raw_hashes, quality
+
+
+def load_axes_frames(path, snapshots_dir=None, write=True, previous=None):
+    # Snapshot prêt si disponible, sinon pipeline (incrémental depuis `previous` ou depuis
+    # le snapshot périmé sur disque) et écriture du snapshot pour la suite
+    with span("ingest.read_snapshot") as s:
+        frames = read_snapshot(path, snapshots_dir)
+        s.rows = len(frames[0]) if frames is not None else 0
+    if frames is not None:
+        return frames
+    if previous is None:
+        previous = read_snapshot(path, snapshots_dir, stale=True)
+    frames = build_frames(path, previous)
+    if write:
+        try:
+            with span("ingest.write_snapshot", rows=len(frames[0])):
+                write_snapshot(path, *frames[:2], snapshots_dir, raw_hashes=frames[2], quality=frames[3])
+        except OSError:
+            pass
+    return frames[:3]
+
+
+def prebuild_snapshots(data_dir="data", snapshots_dir=None, latest_only=True, force=False, max_workers=None):
+    # Construit les snapshots manquants ou périmés -> liste des classeurs traités
+    # (force : reconstruction complète, sans reprise du snapshot précédent)
+    names = list_axes_files(data_dir)
+    if latest_only:
+        names = names[-1:]
+    built = []
+    for name in names:
+        path = os.path.join(data_dir, name)
+        if not force and is_fresh(path, snapshots_dir):
+            continue
+        previous = None if force else read_snapshot(path, snapshots_dir, stale=True)
+        df_full, df, raw_hashes, quality = build_frames(path, previous, max_workers=max_workers)
+        write_snapshot(path, df_full, df, snapshots_dir, raw_hashes=raw_hashes, quality=quality)
+        built.append(path)
+    return built
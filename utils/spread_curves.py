@@ -0,0 +1,207 @@
+import numpy as np
+import pandas as pd
+
+# Courbes spread / maturité ajustées par groupe (Sector, Sub_Sector, Rating_Category) sur les
+# meilleurs axes, pour tous les groupes à la fois : Nelson-Siegel à tau fixé (moindres carrés
+# linéaires), équations normales 3x3 cumulées par groupe (bincount) et résolues en un seul
+# np.linalg.solve sur la pile des groupes. Le tau de chaque groupe est choisi sur une grille.
+# Points aberrants (spreads à ±999, maturités de 999 ans) écartés par des seuils robustes
+# (médiane / MAD) avant et après un premier ajustement.
+
+CURVE_GROUPS = ["Sector", "Sub_Sector", "Rating_Category"]
+CURVE_METRICS = ["AXE_Offer_BMK_SPD", "AXE_Offer_Z-SPD", "AXE_Offer_YLD"]
+TENOR_COLUMN = "Années avant maturité"
+
+NS_TAUS = np.array([0.5, 1.0, 2.0, 3.0, 5.0, 8.0])
+MIN_POINTS = 8
+MAX_TENOR = 50.0
+# Seuils en MAD normalisées (1.4826 * MAD ~ écart-type pour une loi normale)
+LEVEL_CUTOFF = 6.0
+RESIDUAL_CUTOFF = 3.0
+RIDGE = 1e-10
+
+
+def ns_basis(tenor, tau):
+    # Facteurs Nelson-Siegel (niveau, pente, courbure) -> (n, 3) ; tau scalaire ou par point
+    x = np.asarray(tenor, dtype="float64") / tau
+    with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+        decay = np.exp(-x)
+        slope = np.where(x > 1e-6, (1 - decay) / x, 1 - x / 2)
+    return np.stack([np.ones_like(x), slope, slope - decay], axis=-1)
+
+
+def _group_sum(codes, n_groups, weights):
+    return np.bincount(codes, weights=weights, minlength=n_groups)
+
+
+def group_median(codes, n_groups, values):
+    # Médiane par groupe (NaN pour un groupe vide) : tri des valeurs, puis tri stable par groupe
+    # (tri par base sur des codes entiers courts, bien plus rapide que np.lexsort)
+    order = np.argsort(values)
+    order = order[np.argsort(codes[order], kind="stable")]
+    counts = np.bincount(codes, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    sorted_values = values[order]
+    median = np.full(n_groups, np.nan)
+    filled = counts > 0
+    lo = sorted_values[starts[filled] + (counts[filled] - 1) // 2]
+    hi = sorted_values[starts[filled] + counts[filled] // 2]
+    median[filled] = (lo + hi) / 2
+    return median
+
+
+def _robust_keep(codes, n_groups, values, cutoff):
+    # |valeur - médiane du groupe| <= cutoff * MAD normalisée (MAD nulle : écart nul seulement)
+    center = group_median(codes, n_groups, values)
+    deviation = np.abs(values - center[codes])
+    scale = 1.4826 * group_median(codes, n_groups, deviation)
+    return deviation <= cutoff * scale[codes] + 1e-9
+
+
+def _normal_equations(codes, n_groups, basis, y):
+    # Par groupe : A[g] = sum x x', b[g] = sum x y
+    k = basis.shape[1]
+    A = np.empty((n_groups, k, k))
+    for i in range(k):
+        for j in range(i, k):
+            A[:, i, j] = A[:, j, i] = _group_sum(codes, n_groups, basis[:, i] * basis[:, j])
+    b = np.stack([_group_sum(codes, n_groups, basis[:, i] * y) for i in range(k)], axis=-1)
+    return A, b
+
+
+def _solve(A, b):
+    # Tous les groupes en un seul appel ; crête minime : groupes à un seul point ou à
+    # maturités identiques restent inversibles
+    k = A.shape[-1]
+    A = A + (RIDGE * (1 + A[:, 0, 0]))[:, None, None] * np.eye(k)
+    return np.linalg.solve(A, b[..., None])[..., 0]
+
+
+def _sse(A, b, yy, beta):
+    # Somme des carrés des résidus par groupe sans repasser sur les points :
+    # y'y - 2 beta'b + beta'A beta
+    return np.maximum(yy - 2 * np.einsum("gk,gk->g", beta, b) + np.einsum("gi,gij,gj->g", beta, A, beta), 0)
+
+
+class CurveFit:
+    # Courbes d'une dimension et d'une mesure : paramètres et qualité par groupe
+    def __init__(self, group_col, metric, categories, codes, tenor, y):
+        self.group_col = group_col
+        self.metric = metric
+        self.categories = pd.Index(categories)
+        n_groups = len(self.categories)
+        codes = codes.astype(np.int16 if n_groups < 2 ** 15 else np.int64)
+
+        valid = (codes >= 0) & np.isfinite(tenor) & np.isfinite(y) & (tenor > 0) & (tenor <= MAX_TENOR)
+        codes, tenor, y = codes[valid], tenor[valid], y[valid]
+        keep = _robust_keep(codes, n_groups, y, LEVEL_CUTOFF) if len(y) else np.zeros(0, dtype=bool)
+        codes, tenor, y = codes[keep], tenor[keep], y[keep]
+
+        # Tau de chaque groupe : meilleur ajustement sur la grille
+        yy = _group_sum(codes, n_groups, y ** 2)
+        betas, sses = [], []
+        for tau in NS_TAUS:
+            A, b = _normal_equations(codes, n_groups, ns_basis(tenor, tau), y)
+            betas.append(_solve(A, b))
+            sses.append(_sse(A, b, yy, betas[-1]))
+        best = np.argmin(np.stack(sses), axis=0)
+        self.tau = NS_TAUS[best]
+        basis = ns_basis(tenor, self.tau[codes])
+        beta = np.stack(betas)[best, np.arange(n_groups)]
+
+        # Second ajustement sans les résidus aberrants
+        residual = y - np.einsum("nk,nk->n", basis, beta[codes])
+        keep = _robust_keep(codes, n_groups, residual, RESIDUAL_CUTOFF) if len(y) else np.zeros(0, dtype=bool)
+        codes, tenor, y, basis = codes[keep], tenor[keep], y[keep], basis[keep]
+        A, b = _normal_equations(codes, n_groups, basis, y)
+        self.beta = _solve(A, b)
+        sse = _sse(A, b, _group_sum(codes, n_groups, y ** 2), self.beta)
+
+        self.n = np.bincount(codes, minlength=n_groups)
+        self.rmse = np.sqrt(sse / np.maximum(self.n, 1))
+        self.tenor_min = np.full(n_groups, np.nan)
+        self.tenor_max = np.full(n_groups, np.nan)
+        if len(codes):
+            np.fmin.at(self.tenor_min, codes, tenor)
+            np.fmax.at(self.tenor_max, codes, tenor)
+        self.fitted = self.n >= MIN_POINTS
+
+    def position(self, value):
+        # Indice du groupe s'il a une courbe, sinon None
+        try:
+            g = self.categories.get_loc(value)
+        except KeyError:
+            return None
+        return g if isinstance(g, (int, np.integer)) and self.fitted[g] else None
+
+    def evaluate(self, codes, tenor):
+        # Valeur de la courbe de chaque point (NaN : groupe sans courbe)
+        codes = np.asarray(codes)
+        tenor = np.asarray(tenor, dtype="float64")
+        ok = (codes >= 0) & self.fitted[np.maximum(codes, 0)]
+        g = np.where(ok, codes, 0)
+        out = np.einsum("nk,nk->n", ns_basis(tenor, self.tau[g]), self.beta[g])
+        return np.where(ok, out, np.nan)
+
+    def curve(self, value, tenor_min=None, tenor_max=None, points=60):
+        # Courbe du groupe sur sa plage de maturités (restreinte à [tenor_min, tenor_max]) ou None
+        g = self.position(value)
+        if g is None:
+            return None
+        lo = max(self.tenor_min[g], tenor_min) if tenor_min is not None else self.tenor_min[g]
+        hi = min(self.tenor_max[g], tenor_max) if tenor_max is not None else self.tenor_max[g]
+        if not hi > lo:
+            return None
+        tenor = np.linspace(lo, hi, points)
+        return pd.DataFrame({TENOR_COLUMN: tenor, self.metric: ns_basis(tenor, self.tau[g]) @ self.beta[g]})
+
+    def table(self):
+        # Paramètres et qualité des courbes ajustées
+        out = pd.DataFrame({
+            self.group_col: self.categories,
+            "Points": self.n,
+            "Tau": self.tau,
+            "Niveau": self.beta[:, 0],
+            "Pente": self.beta[:, 1],
+            "Courbure": self.beta[:, 2],
+            "RMSE": self.rmse,
+            "Maturité min": self.tenor_min,
+            "Maturité max": self.tenor_max,
+        })
+        return out[self.fitted].reset_index(drop=True)
+
+
+def _group_codes(df, col):
+    values = df[col]
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), values.cat.categories
+    codes, categories = pd.factorize(values, sort=True)
+    return codes, categories
+
+
+class SpreadCurves:
+    # Toutes les courbes (dimension x mesure) d'un frame de meilleurs axes
+    def __init__(self, df, groups=CURVE_GROUPS, metrics=CURVE_METRICS):
+        tenor = df[TENOR_COLUMN].to_numpy(dtype="float64", na_value=np.nan)
+        self.fits = {}
+        for group_col in groups:
+            codes, categories = _group_codes(df, group_col)
+            for metric in metrics:
+                y = df[metric].to_numpy(dtype="float64", na_value=np.nan)
+                self.fits[group_col, metric] = CurveFit(group_col, metric, categories, codes, tenor, y)
+        self.rows = len(df)
+
+    def fit(self, group_col, metric):
+        return self.fits.get((group_col, metric))
+
+    def curve(self, group_col, metric, value, tenor_min=None, tenor_max=None):
+        fit = self.fit(group_col, metric)
+        return fit.curve(value, tenor_min, tenor_max) if fit is not None else None
+
+    def residuals(self, df, group_col, metric):
+        # Écart de chaque ligne à la courbe de son groupe (> 0 : plus large que la courbe)
+        fit = self.fit(group_col, metric)
+        codes = pd.Categorical(df[group_col], categories=fit.categories).codes
+        tenor = df[TENOR_COLUMN].to_numpy(dtype="float64", na_value=np.nan)
+        fitted = fit.evaluate(codes, tenor)
+        return pd.Series(df[metric].to_numpy(dtype="float64", na_value=np.nan) - fitted, index=df.index)